@@ -0,0 +1,168 @@
+"""Benchmark collect_metrics parsing against the synthetic Day8 exposition."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Sequence
+
+import collect_metrics
+import synthetic_metrics_server
+from synthetic_metrics_server import SyntheticConfig
+
+DEFAULT_REPEATS: Final[int] = 5
+
+
+def _time(func: Callable[[], Any]) -> tuple[float, Any]:
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    # Separate from _time: tracemalloc hooks every allocation and would skew timings.
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _throughput(samples: int, seconds: float) -> float:
+    return round(samples / seconds, 1) if seconds > 0 else 0.0
+
+
+def bench_parse(config: SyntheticConfig, *, repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """Measure cold (empty series cache) and warm parse throughput and peak memory.
+
+    Timings and peak memory come from separate runs of the same parse.
+    """
+    payload = synthetic_metrics_server.render_exposition(config)
+    samples = synthetic_metrics_server.sample_count(config)
+    cache = collect_metrics._SERIES_KEY_CACHE
+
+    cold_seconds: list[float] = []
+    cold_peaks: list[int] = []
+    for _ in range(repeats):
+        cache.clear()
+        elapsed, _ = _time(lambda: collect_metrics.parse_prometheus_text(payload))
+        cold_seconds.append(elapsed)
+        cache.clear()
+        cold_peaks.append(_peak_memory(lambda: collect_metrics.parse_prometheus_text(payload)))
+
+    warm_seconds: list[float] = []
+    warm_peaks: list[int] = []
+    metrics: Dict[str, float] = {}
+    for _ in range(repeats):
+        elapsed, metrics = _time(lambda: collect_metrics.parse_prometheus_text(payload))
+        warm_seconds.append(elapsed)
+        warm_peaks.append(_peak_memory(lambda: collect_metrics.parse_prometheus_text(payload)))
+
+    best_cold = min(cold_seconds)
+    best_warm = min(warm_seconds)
+    return {
+        "samples": samples,
+        "payload_bytes": len(payload.encode("utf-8")),
+        "series_out": len(metrics),
+        "cold": {
+            "best_seconds": round(best_cold, 6),
+            "samples_per_second": _throughput(samples, best_cold),
+            "peak_memory_bytes": max(cold_peaks),
+        },
+        "warm": {
+            "best_seconds": round(best_warm, 6),
+            "samples_per_second": _throughput(samples, best_warm),
+            "peak_memory_bytes": max(warm_peaks),
+        },
+        "series_cache": cache.stats(),
+    }
+
+
+def bench_scrape(config: SyntheticConfig, *, repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """Measure end-to-end loopback scrapes against the synthetic server."""
+    server = synthetic_metrics_server.build_server(config, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}/metrics"
+    samples = synthetic_metrics_server.sample_count(config)
+    try:
+        durations = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            collect_metrics.collect_prometheus_metrics(url)
+            durations.append(time.perf_counter() - started)
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    best = min(durations)
+    return {
+        "url": url,
+        "best_seconds": round(best, 6),
+        "mean_seconds": round(sum(durations) / len(durations), 6),
+        "samples_per_second": _throughput(samples, best),
+    }
+
+
+def run_benchmark(
+    config: SyntheticConfig, *, repeats: int = DEFAULT_REPEATS, scrape: bool = True
+) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "config": {
+            "series": config.series,
+            "histograms": config.histograms,
+            "summaries": config.summaries,
+            "noise": config.noise,
+            "replicas": config.replicas,
+            "repeats": repeats,
+        },
+        "parse": bench_parse(config, repeats=repeats),
+    }
+    if scrape:
+        report["scrape"] = bench_scrape(config, repeats=repeats)
+    return report
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark Day8 metrics collection")
+    parser.add_argument("--series", type=int, default=2000, help="day8_ counter/gauge series")
+    parser.add_argument("--histograms", type=int, default=50, help="day8_ histograms")
+    parser.add_argument("--summaries", type=int, default=20, help="day8_ summaries")
+    parser.add_argument("--noise", type=int, default=500, help="Non-day8 noise series")
+    parser.add_argument("--replicas", type=int, default=5, help="Replicas per series")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per measurement")
+    parser.add_argument("--no-scrape", action="store_true", help="Skip the loopback HTTP scrape")
+    parser.add_argument("--output", type=Path, help="Optional path to write the JSON report")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.repeats < 1:
+        print("--repeats must be positive", file=sys.stderr)
+        return 1
+    config = SyntheticConfig(
+        series=args.series,
+        histograms=args.histograms,
+        summaries=args.summaries,
+        noise=args.noise,
+        replicas=args.replicas,
+    )
+    report = run_benchmark(config, repeats=args.repeats, scrape=not args.no_scrape)
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
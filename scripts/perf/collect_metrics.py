@@ -4,15 +4,22 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import os
 import re
 import sys
+import tempfile
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping, Sequence, Tuple
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Mapping, Sequence, TextIO, Tuple
 import urllib.error
 import urllib.request
 
 DEFAULT_PROM_URL = "http://localhost:8000/metrics"
 DEFAULT_METRIC_PREFIX = "day8_"
+DEFAULT_SERIES_CACHE_SIZE = 65536
+DEFAULT_RATE_WINDOW_SECONDS = 60.0
+DEFAULT_QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
 REQUIRED_METRIC_SUFFIXES: list[str] = [
     "app_boot_timestamp",
     "jobs_processed_total",
@@ -151,13 +158,20 @@ def collect_prometheus_metrics(
             file=sys.stderr,
         )
         return {}
+    return parse_prometheus_text(payload, metric_prefix)
+
+
+def parse_prometheus_text(
+    payload: str, metric_prefix: str = DEFAULT_METRIC_PREFIX
+) -> Dict[str, float]:
+    """Parse Prometheus exposition text into aggregated series filtered by prefix."""
     results: Dict[str, float] = {}
     for line in payload.splitlines():
         parsed_line = _split_prometheus_sample(line)
         if parsed_line is None:
             continue
         metric_name, value_text, _timestamp_text = parsed_line
-        normalized_metric = _normalize_prometheus_metric_name(
+        normalized_metric = _SERIES_KEY_CACHE.normalize(
             metric_name, preserve_label_for_bucket=True
         )
         if not normalized_metric.startswith(metric_prefix):
@@ -173,25 +187,44 @@ def collect_prometheus_metrics(
                 file=sys.stderr,
             )
             continue
-        previous_value = results.get(normalized_metric)
-        metric_base = normalized_metric.split("{", 1)[0]
-        if previous_value is None:
-            results[normalized_metric] = numeric_value
-            continue
-
-        if "_quantile_" in metric_base:
-            results[normalized_metric] = max(previous_value, numeric_value)
-        elif metric_base.endswith(_TIMESTAMP_SUFFIXES):
-            results[normalized_metric] = max(previous_value, numeric_value)
-        elif metric_base.endswith(_ADDITIVE_SUFFIXES) or metric_base.endswith(
-            _BUCKET_SUFFIXES
-        ):
-            results[normalized_metric] = previous_value + numeric_value
-        else:
-            results[normalized_metric] = numeric_value
+        _aggregate_sample(results, normalized_metric, numeric_value)
     return results
 
 
+def _aggregate_sample(results: Dict[str, float], key: str, value: float) -> None:
+    """Fold one sample into ``results`` using the per-series aggregation rules.
+
+    Counters, sums, counts and histogram buckets add up across replicas,
+    timestamps keep the latest value and gauges keep the last sample. Summary
+    quantiles cannot be merged exactly, so the highest replica value is kept as
+    a conservative upper bound; use histogram percentiles for real tails.
+    """
+    previous_value = results.get(key)
+    metric_base = key.split("{", 1)[0]
+    if previous_value is None:
+        results[key] = value
+        return
+
+    if "_quantile_" in metric_base:
+        results[key] = max(previous_value, value)
+    elif metric_base.endswith(_TIMESTAMP_SUFFIXES):
+        results[key] = max(previous_value, value)
+    elif metric_base.endswith(_ADDITIVE_SUFFIXES) or metric_base.endswith(_BUCKET_SUFFIXES):
+        results[key] = previous_value + value
+    else:
+        results[key] = value
+
+
+def _merge_target_metrics(targets: Sequence[Mapping[str, float]]) -> Dict[str, float]:
+    if len(targets) == 1:
+        return dict(targets[0])
+    merged: Dict[str, float] = {}
+    for target in targets:
+        for key, value in target.items():
+            _aggregate_sample(merged, key, value)
+    return merged
+
+
 def _normalize_prometheus_metric_name(
     metric: str, *, preserve_label_for_bucket: bool = False
 ) -> str:
@@ -251,44 +284,231 @@ def _normalize_prometheus_metric_name(
     return f"{normalized_base}{{{formatted_labels}}}"
 
 
-def collect_chainlit_metrics(path: Path, metric_prefix: str = DEFAULT_METRIC_PREFIX) -> Dict[str, float]:
-    """Aggregate metrics from Chainlit JSONL logs."""
-    if not path.exists():
+class _SeriesKeyCache:
+    """LRU cache from raw sample metric text to its normalized series key.
+
+    Series identities rarely change between scrapes, so repeat lookups skip the
+    label parsing, environment filtering and sorting done by
+    ``_normalize_prometheus_metric_name``.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SERIES_CACHE_SIZE) -> None:
+        self.max_size = max(max_size, 0)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, bool], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def normalize(self, metric: str, *, preserve_label_for_bucket: bool = False) -> str:
+        key = (metric, preserve_label_for_bucket)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        normalized = _normalize_prometheus_metric_name(
+            metric, preserve_label_for_bucket=preserve_label_for_bucket
+        )
+        if self.max_size:
+            self._entries[key] = normalized
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return normalized
+
+    def resize(self, max_size: int) -> None:
+        self.max_size = max(max_size, 0)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_SERIES_KEY_CACHE = _SeriesKeyCache()
+
+
+def _parse_chainlit_line(raw_line: str) -> Any:
+    try:
+        return json.loads(raw_line)
+    except json.JSONDecodeError:
+        pass
+    start = raw_line.find("{")
+    end = raw_line.rfind("}")
+    if start == -1 or end == -1 or start >= end:
+        return None
+    try:
+        fallback_record = json.loads(raw_line[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    if isinstance(fallback_record, Mapping) and not any(
+        key in fallback_record for key in ("metric", "name", "metrics")
+    ):
+        return {"metrics": fallback_record}
+    return fallback_record
+
+
+def _apply_chainlit_record(
+    record: Any, metric_prefix: str, results: Dict[str, float]
+) -> None:
+    for metric, value in _iter_metric_entries(record):
+        if not metric.startswith(metric_prefix):
+            continue
+        try:
+            numeric = float(value)
+        except (TypeError, ValueError):
+            continue
+        if not math.isfinite(numeric):
+            print(
+                "Skipping non-finite value for Chainlit metric"
+                f" {metric}: {value}",
+                file=sys.stderr,
+            )
+            continue
+        results[metric] = numeric
+
+
+def _consume_chainlit_log(
+    handle: BinaryIO,
+    metric_prefix: str,
+    results: Dict[str, float],
+    *,
+    include_partial: bool,
+) -> int:
+    """Apply complete lines from ``handle`` and return the offset after the last one.
+
+    A trailing line without a newline is only applied when ``include_partial``
+    is set; otherwise it is left for the next read because the writer may
+    still be appending to it.
+    """
+    offset = handle.tell()
+    for raw_bytes in handle:
+        if not raw_bytes.endswith(b"\n") and not include_partial:
+            break
+        offset += len(raw_bytes)
+        raw_line = raw_bytes.decode("utf-8", errors="replace")
+        for line in raw_line.splitlines():
+            _apply_chainlit_record(_parse_chainlit_line(line), metric_prefix, results)
+    return offset
+
+
+def _load_chainlit_checkpoint(path: Path) -> Dict[str, Any]:
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
         return {}
-    results: Dict[str, float] = {}
-    for raw_line in path.read_text(encoding="utf-8").splitlines():
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _rotated_chainlit_log(path: Path, inode: Any, device: Any) -> Path | None:
+    """Return the rotated copy (``<name>.1``) of ``path`` if it is the checkpointed file."""
+    rotated = path.with_name(path.name + ".1")
+    try:
+        stat_result = rotated.stat()
+    except OSError:
+        return None
+    if stat_result.st_ino != inode or stat_result.st_dev != device:
+        return None
+    return rotated
+
+
+def _write_chainlit_checkpoint(checkpoint: Path, payload: Mapping[str, Any]) -> None:
+    checkpoint.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=checkpoint.name, suffix=".tmp", dir=checkpoint.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload, sort_keys=True))
+        os.replace(tmp_name, checkpoint)
+    except BaseException:
         try:
-            record = json.loads(raw_line)
-        except json.JSONDecodeError:
-            start = raw_line.find("{")
-            end = raw_line.rfind("}")
-            if start == -1 or end == -1 or start >= end:
-                continue
-            try:
-                fallback_record = json.loads(raw_line[start : end + 1])
-            except json.JSONDecodeError:
-                continue
-            if isinstance(fallback_record, Mapping) and not any(
-                key in fallback_record for key in ("metric", "name", "metrics")
-            ):
-                record = {"metrics": fallback_record}
-            else:
-                record = fallback_record
-        for metric, value in _iter_metric_entries(record):
-            if not metric.startswith(metric_prefix):
-                continue
-            try:
-                numeric = float(value)
-            except (TypeError, ValueError):
-                continue
-            if not math.isfinite(numeric):
-                print(
-                    "Skipping non-finite value for Chainlit metric"
-                    f" {metric}: {value}",
-                    file=sys.stderr,
-                )
-                continue
-            results[metric] = numeric
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def collect_chainlit_metrics(
+    path: Path,
+    metric_prefix: str = DEFAULT_METRIC_PREFIX,
+    *,
+    checkpoint: Path | None = None,
+) -> Dict[str, float]:
+    """Aggregate metrics from Chainlit JSONL logs.
+
+    With ``checkpoint`` the log path, byte offset, inode and aggregated metrics
+    are persisted between calls so only newly appended lines are parsed. A
+    checkpoint recorded for another path or metric prefix is discarded.
+
+    A changed inode is treated as a rotation: lines appended to the old file
+    after the checkpoint are drained from its rotated copy ``<name>.1`` when
+    that file still has the checkpointed inode, then the new file is read from
+    the start. If the rotated copy is gone (or the rotation scheme differs),
+    those lines are lost. A file shorter than the stored offset is treated as
+    a truncation and re-read from the start.
+    """
+    if not path.exists():
+        return {}
+    if checkpoint is None:
+        results: Dict[str, float] = {}
+        with path.open("rb") as handle:
+            _consume_chainlit_log(handle, metric_prefix, results, include_partial=True)
+        return results
+
+    state = _load_chainlit_checkpoint(checkpoint)
+    if state.get("path") != str(path) or state.get("metric_prefix") != metric_prefix:
+        state = {}
+    stat_result = path.stat()
+    stored_metrics = state.get("metrics")
+    if isinstance(stored_metrics, dict):
+        results = {
+            str(key): float(value)
+            for key, value in stored_metrics.items()
+            if isinstance(value, (int, float))
+        }
+    else:
+        results = {}
+    offset = state.get("offset")
+    if not isinstance(offset, int):
+        offset = 0
+    elif state.get("inode") != stat_result.st_ino or state.get("device") != stat_result.st_dev:
+        rotated = _rotated_chainlit_log(path, state.get("inode"), state.get("device"))
+        if rotated is not None:
+            with rotated.open("rb") as handle:
+                handle.seek(offset)
+                # The writer has moved on, so a trailing partial line is final.
+                _consume_chainlit_log(handle, metric_prefix, results, include_partial=True)
+        offset = 0
+    elif offset > stat_result.st_size:
+        offset = 0
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        offset = _consume_chainlit_log(handle, metric_prefix, results, include_partial=False)
+
+    _write_chainlit_checkpoint(
+        checkpoint,
+        {
+            "path": str(path),
+            "inode": stat_result.st_ino,
+            "device": stat_result.st_dev,
+            "offset": offset,
+            "metric_prefix": metric_prefix,
+            "metrics": results,
+        },
+    )
     return results
 
 
@@ -312,15 +532,289 @@ def _iter_metric_entries(record: Any) -> Iterable[Tuple[str, Any]]:
     return metric_entries
 
 
+def _split_series_key(key: str) -> tuple[str, list[tuple[str, str]]]:
+    label_start = key.find("{")
+    if label_start == -1:
+        return key, []
+    return key[:label_start], _LABEL_PATTERN.findall(key[label_start:])
+
+
+def _format_series_key(base: str, labels: Sequence[tuple[str, str]]) -> str:
+    if not labels:
+        return base
+    formatted_labels = ",".join(f'{key}="{value}"' for key, value in sorted(labels))
+    return f"{base}{{{formatted_labels}}}"
+
+
+def _is_counter_series(key: str) -> bool:
+    base = key.split("{", 1)[0]
+    if "_quantile_" in base:
+        return False
+    return base.endswith(_ADDITIVE_SUFFIXES) or base.endswith(_BUCKET_SUFFIXES)
+
+
+def _counter_increase(previous: float, current: float) -> float:
+    """Return the counter increase, treating a decrease as a counter reset."""
+    if current < previous:
+        return current
+    return current - previous
+
+
+def _group_histogram_buckets(
+    metrics: Mapping[str, float],
+) -> Dict[str, list[tuple[float, float]]]:
+    """Group ``*_bucket`` series by histogram, keyed without ``le`` and ``_bucket``."""
+    histograms: Dict[str, list[tuple[float, float]]] = {}
+    for key, value in metrics.items():
+        base, labels = _split_series_key(key)
+        if not base.endswith(_BUCKET_SUFFIXES):
+            continue
+        upper_bound: float | None = None
+        remaining_labels: list[tuple[str, str]] = []
+        for label_key, label_value in labels:
+            if label_key == "le" and upper_bound is None:
+                try:
+                    upper_bound = float(label_value)
+                except ValueError:
+                    break
+                continue
+            remaining_labels.append((label_key, label_value))
+        if upper_bound is None or math.isnan(upper_bound):
+            continue
+        histogram_key = _format_series_key(base[: -len("_bucket")], remaining_labels)
+        histograms.setdefault(histogram_key, []).append((upper_bound, value))
+    return histograms
+
+
+def _histogram_quantile(quantile: float, buckets: Sequence[tuple[float, float]]) -> float | None:
+    """Estimate a quantile from cumulative buckets using linear interpolation.
+
+    Mirrors Prometheus ``histogram_quantile``: observations are assumed to be
+    evenly spread inside each bucket, the lowest bucket starts at zero and a
+    rank landing in the ``+Inf`` bucket reports the highest finite bound.
+    """
+    if not buckets or not 0.0 <= quantile <= 1.0:
+        return None
+    ordered = sorted(buckets)
+    cumulative: list[tuple[float, float]] = []
+    running = 0.0
+    for upper_bound, count in ordered:
+        running = max(running, count)
+        cumulative.append((upper_bound, running))
+    total = cumulative[-1][1]
+    if total <= 0.0:
+        return None
+    rank = quantile * total
+    index = next(
+        position for position, (_, count) in enumerate(cumulative) if count >= rank
+    )
+    upper_bound, count = cumulative[index]
+    if math.isinf(upper_bound):
+        return cumulative[index - 1][0] if index > 0 else None
+    if index == 0:
+        if upper_bound <= 0.0:
+            return upper_bound
+        lower_bound, previous_count = 0.0, 0.0
+    else:
+        lower_bound, previous_count = cumulative[index - 1]
+    in_bucket = count - previous_count
+    if in_bucket <= 0.0:
+        return upper_bound
+    return lower_bound + (upper_bound - lower_bound) * (rank - previous_count) / in_bucket
+
+
+def _quantile_label(quantile: float) -> str:
+    return f"p{quantile * 100:g}"
+
+
+def _histogram_quantiles(
+    metrics: Mapping[str, float], quantiles: Sequence[float]
+) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for histogram_key, buckets in _group_histogram_buckets(metrics).items():
+        estimates: Dict[str, float] = {}
+        for quantile in quantiles:
+            estimate = _histogram_quantile(quantile, buckets)
+            if estimate is not None:
+                estimates[_quantile_label(quantile)] = estimate
+        if estimates:
+            results[histogram_key] = estimates
+    return results
+
+
+def _cumulative_count_at(bound: float, buckets: Sequence[tuple[float, float]]) -> float:
+    """Estimate the cumulative count at ``bound`` by interpolating inside a bucket."""
+    previous_bound = 0.0
+    previous_count = 0.0
+    for upper_bound, count in sorted(buckets):
+        if bound == upper_bound:
+            return count
+        if bound < upper_bound:
+            if math.isinf(upper_bound) or upper_bound <= previous_bound:
+                return previous_count
+            fraction = (bound - previous_bound) / (upper_bound - previous_bound)
+            return previous_count + (count - previous_count) * max(fraction, 0.0)
+        previous_bound = upper_bound
+        previous_count = count
+    return previous_count
+
+
+def _merge_histogram_buckets(
+    sources: Sequence[Sequence[tuple[float, float]]],
+) -> list[tuple[float, float]]:
+    """Merge cumulative histograms whose bucket layouts may differ.
+
+    Every bound from every source is kept; a source missing a bound contributes
+    its interpolated cumulative count at that bound, so identical layouts merge
+    exactly and mismatched layouts stay monotonic.
+    """
+    present = [buckets for buckets in sources if buckets]
+    if len(present) == 1:
+        return sorted(present[0])
+    bounds = sorted({upper_bound for buckets in present for upper_bound, _ in buckets})
+    return [
+        (bound, sum(_cumulative_count_at(bound, buckets) for buckets in present))
+        for bound in bounds
+    ]
+
+
+def summarize_histograms(
+    targets: Sequence[Mapping[str, float]],
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> Dict[str, Dict[str, float]]:
+    """Merge ``*_bucket`` series across targets and derive count and percentiles."""
+    grouped: Dict[str, list[list[tuple[float, float]]]] = {}
+    for target in targets:
+        for histogram_key, buckets in _group_histogram_buckets(target).items():
+            grouped.setdefault(histogram_key, []).append(buckets)
+    summaries: Dict[str, Dict[str, float]] = {}
+    for histogram_key, sources in sorted(grouped.items()):
+        merged = _merge_histogram_buckets(sources)
+        summary: Dict[str, float] = {"count": max((count for _, count in merged), default=0.0)}
+        for quantile in quantiles:
+            estimate = _histogram_quantile(quantile, merged)
+            if estimate is not None:
+                summary[_quantile_label(quantile)] = estimate
+        summaries[histogram_key] = summary
+    return summaries
+
+
+class RollingMetrics:
+    """Keep recent scrapes in memory and derive rates and quantiles from them.
+
+    Each call to :meth:`observe` records one scrape and returns a snapshot with
+    per-second counter rates since the previous scrape, rates and histogram
+    quantiles over the rolling window, and the failure ratio over the window.
+    Counter increases are taken per scrape target and then summed, so a
+    restart of one replica only resets that replica's series.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = DEFAULT_RATE_WINDOW_SECONDS,
+        *,
+        metric_prefix: str = DEFAULT_METRIC_PREFIX,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.metric_prefix = metric_prefix
+        self.quantiles = tuple(quantiles)
+        self.scrapes = 0
+        # (timestamp, metrics, counter increases since the previous scrape)
+        self._history: Deque[tuple[float, Dict[str, float], Dict[str, float]]] = deque()
+        self._previous_sources: list[Dict[str, float]] = []
+
+    def observe(
+        self,
+        timestamp: float,
+        metrics: Mapping[str, float],
+        *,
+        sources: Sequence[Mapping[str, float]] | None = None,
+    ) -> Dict[str, Any]:
+        """Record one scrape of ``metrics``.
+
+        ``sources`` are the per-target scrapes (in a stable order) that were
+        merged into ``metrics``; without them ``metrics`` is one target.
+        """
+        current = dict(metrics)
+        current_sources = [dict(source) for source in sources] if sources is not None else [current]
+        rates: Dict[str, float] = {}
+        increases: Dict[str, float] = {}
+        if self._history:
+            previous_timestamp = self._history[-1][0]
+            elapsed = timestamp - previous_timestamp
+            for index, source in enumerate(current_sources):
+                if index >= len(self._previous_sources):
+                    break
+                previous_metrics = self._previous_sources[index]
+                for key, value in source.items():
+                    if not _is_counter_series(key):
+                        continue
+                    previous_value = previous_metrics.get(key)
+                    if previous_value is None:
+                        continue
+                    increases[key] = increases.get(key, 0.0) + _counter_increase(previous_value, value)
+            if elapsed > 0:
+                rates = {key: increase / elapsed for key, increase in increases.items()}
+        self._previous_sources = current_sources
+        self._history.append((timestamp, current, increases))
+        self.scrapes += 1
+        # Keep the newest scrape at or before the window start as the baseline.
+        while len(self._history) > 2 and timestamp - self._history[1][0] >= self.window_seconds:
+            self._history.popleft()
+
+        return {
+            "timestamp": timestamp,
+            "scrape": self.scrapes,
+            "metrics": current,
+            "rates": rates,
+            "quantiles": _histogram_quantiles(current, self.quantiles),
+            "window": self._window_summary(timestamp),
+        }
+
+    def _window_summary(self, timestamp: float) -> Dict[str, Any]:
+        window_increases: Dict[str, float] = {}
+        for _, _, increases in list(self._history)[1:]:
+            for key, increase in increases.items():
+                window_increases[key] = window_increases.get(key, 0.0) + increase
+        span = timestamp - self._history[0][0]
+        window_rates = (
+            {key: increase / span for key, increase in window_increases.items()}
+            if span > 0
+            else {}
+        )
+        processed = window_increases.get(f"{self.metric_prefix}jobs_processed_total")
+        failed = window_increases.get(f"{self.metric_prefix}jobs_failed_total")
+        failure_ratio = failed / processed if processed and failed is not None else None
+        return {
+            "seconds": span,
+            "samples": len(self._history),
+            "rates": window_rates,
+            "quantiles": _histogram_quantiles(window_increases, self.quantiles),
+            "failure_ratio": failure_ratio,
+        }
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Collect Day8 metrics from Prometheus and Chainlit logs")
-    parser.add_argument("--prom-url", default=DEFAULT_PROM_URL, help="Prometheus metrics endpoint URL")
+    parser.add_argument(
+        "--prom-url",
+        action="append",
+        default=None,
+        help="Prometheus metrics endpoint URL (repeat to merge several targets)",
+    )
     parser.add_argument(
         "--chainlit-log",
         type=Path,
         default=None,
         help="Path to Chainlit JSONL log file",
     )
+    parser.add_argument(
+        "--chainlit-checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file for tailing the Chainlit log; only newly appended lines are read",
+    )
     parser.add_argument(
         "--metric-prefix",
         default=DEFAULT_METRIC_PREFIX,
@@ -334,9 +828,9 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--output-format",
-        choices=("json",),
+        choices=("json", "ndjson"),
         default="json",
-        help="Output format (currently only json)",
+        help="Output format: indented json, or one compact ndjson line appended to --output",
     )
     parser.add_argument(
         "--output",
@@ -344,6 +838,35 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional file path to write metrics output",
     )
+    parser.add_argument(
+        "--series-cache-size",
+        type=int,
+        default=DEFAULT_SERIES_CACHE_SIZE,
+        help="Maximum number of normalized series keys kept between scrapes (0 disables)",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Include series key cache size and hit rate in the JSON output",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Scrape every N seconds and emit JSONL snapshots instead of a single report",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop the --interval daemon after N seconds (default: run until interrupted)",
+    )
+    parser.add_argument(
+        "--rate-window",
+        type=float,
+        default=DEFAULT_RATE_WINDOW_SECONDS,
+        help="Rolling window in seconds for rates and quantiles in --interval mode",
+    )
     return parser
 
 
@@ -357,34 +880,118 @@ def _merge_metrics(*sources: Mapping[str, float]) -> Dict[str, float]:
     return merged
 
 
+def _collect_sources(
+    args: argparse.Namespace,
+) -> tuple[list[Dict[str, float]], Dict[str, float]]:
+    prom_targets = [
+        collect_prometheus_metrics(
+            url,
+            metric_prefix=args.metric_prefix,
+            timeout=args.prom_timeout,
+        )
+        for url in args.prom_url or [DEFAULT_PROM_URL]
+    ]
+    chainlit_metrics: Dict[str, float] = {}
+    if args.chainlit_log is not None and args.chainlit_checkpoint is not None:
+        chainlit_metrics = collect_chainlit_metrics(
+            args.chainlit_log,
+            metric_prefix=args.metric_prefix,
+            checkpoint=args.chainlit_checkpoint,
+        )
+    elif args.chainlit_log is not None:
+        chainlit_metrics = collect_chainlit_metrics(args.chainlit_log, metric_prefix=args.metric_prefix)
+    return prom_targets, chainlit_metrics
+
+
+def run_daemon(
+    args: argparse.Namespace,
+    *,
+    clock: Callable[[], float] | None = None,
+    wall_clock: Callable[[], float] | None = None,
+    sleep: Callable[[float], None] | None = None,
+) -> int:
+    """Scrape every ``args.interval`` seconds and emit one JSONL snapshot per scrape."""
+    clock = clock or time.monotonic
+    wall_clock = wall_clock or time.time
+    sleep = sleep or time.sleep
+    tracker = RollingMetrics(args.rate_window, metric_prefix=args.metric_prefix)
+    required_metric_names = _required_metric_names(args.metric_prefix)
+    output_handle: TextIO | None = None
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        output_handle = args.output.open("a", encoding="utf-8")
+    started = clock()
+    next_tick = started
+    try:
+        while True:
+            prom_targets, chainlit_metrics = _collect_sources(args)
+            prom_metrics = _merge_target_metrics(prom_targets)
+            merged = _merge_metrics(prom_metrics, chainlit_metrics)
+            # Prometheus wins on conflicts, so Chainlit only feeds the series it alone reports.
+            chainlit_only = {key: value for key, value in chainlit_metrics.items() if key not in prom_metrics}
+            snapshot = tracker.observe(wall_clock(), merged, sources=[*prom_targets, chainlit_only])
+            snapshot["missing"] = [name for name in required_metric_names if name not in merged]
+            snapshot["series_cache"] = _SERIES_KEY_CACHE.stats()
+            line = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+            print(line, flush=True)
+            if output_handle is not None:
+                output_handle.write(f"{line}\n")
+                output_handle.flush()
+            next_tick += args.interval
+            if args.duration is not None and next_tick - started > args.duration:
+                break
+            sleep(max(next_tick - clock(), 0.0))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if output_handle is not None:
+            output_handle.close()
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
+    _SERIES_KEY_CACHE.resize(args.series_cache_size)
 
-    prom_metrics = collect_prometheus_metrics(
-        args.prom_url,
-        metric_prefix=args.metric_prefix,
-        timeout=args.prom_timeout,
-    )
-    chainlit_metrics: Dict[str, float] = {}
-    if args.chainlit_log is not None:
-        chainlit_metrics = collect_chainlit_metrics(args.chainlit_log, metric_prefix=args.metric_prefix)
+    if args.interval is not None:
+        if args.interval <= 0:
+            parser.error("--interval must be positive")
+        return run_daemon(args)
+    if args.duration is not None:
+        parser.error("--duration requires --interval")
+
+    prom_targets, chainlit_metrics = _collect_sources(args)
+    prom_metrics = _merge_target_metrics(prom_targets)
 
     merged = _merge_metrics(prom_metrics, chainlit_metrics)
     required_metric_names = _required_metric_names(args.metric_prefix)
     missing = [name for name in required_metric_names if name not in merged]
 
-    output = {
+    output: Dict[str, Any] = {
         "prometheus": prom_metrics,
         "chainlit": chainlit_metrics,
         "metrics": merged,
     }
-    formatted = json.dumps(output, indent=2, sort_keys=True)
+    histograms = summarize_histograms([*prom_targets, chainlit_metrics])
+    if histograms:
+        output["histograms"] = histograms
+    if args.cache_stats:
+        output["series_cache"] = _SERIES_KEY_CACHE.stats()
+    if args.output_format == "ndjson":
+        output["timestamp"] = time.time()
+        formatted = json.dumps(output, sort_keys=True, separators=(",", ":"))
+    else:
+        formatted = json.dumps(output, indent=2, sort_keys=True)
     print(formatted)
 
     if args.output is not None:
         args.output.parent.mkdir(parents=True, exist_ok=True)
-        args.output.write_text(f"{formatted}\n", encoding="utf-8")
+        if args.output_format == "ndjson":
+            with args.output.open("a", encoding="utf-8") as handle:
+                handle.write(f"{formatted}\n")
+        else:
+            args.output.write_text(f"{formatted}\n", encoding="utf-8")
 
     if missing:
         print(f"Missing required metrics: {', '.join(missing)}", file=sys.stderr)
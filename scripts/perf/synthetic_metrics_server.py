@@ -0,0 +1,215 @@
+"""Synthetic Day8 metrics endpoint for benchmarking the collector and warmup helpers."""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Final, Sequence
+
+DEFAULT_HOST: Final[str] = "127.0.0.1"
+DEFAULT_PORT: Final[int] = 9108
+DEFAULT_BUCKETS: Final[tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SUMMARY_QUANTILES: Final[tuple[str, ...]] = ("0.5", "0.9", "0.99")
+BOOT_TIMESTAMP: Final[float] = 1_700_000_000.0
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    series: int = 50
+    histograms: int = 5
+    summaries: int = 5
+    noise: int = 50
+    replicas: int = 3
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 8
+
+
+def _env_labels(replica: int) -> str:
+    return (
+        f'instance="10.0.0.{replica + 1}:8000",job="day8",'
+        f'pod="day8-api-{replica}",namespace="day8",container="api"'
+    )
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def render_exposition(config: SyntheticConfig, scrape: int = 1) -> str:
+    """Render a deterministic exposition payload; counters grow with ``scrape``."""
+    rng = random.Random(config.seed)
+    lines: list[str] = []
+    required = (
+        ("day8_app_boot_timestamp", "gauge", lambda replica: BOOT_TIMESTAMP + replica),
+        ("day8_jobs_processed_total", "counter", lambda replica: 100.0 * scrape + replica),
+        ("day8_jobs_failed_total", "counter", lambda replica: float(scrape + replica % 2)),
+        ("day8_healthz_request_total", "counter", lambda replica: 10.0 * scrape),
+    )
+    for name, metric_type, value_for in required:
+        lines.append(f"# TYPE {name} {metric_type}")
+        for replica in range(config.replicas):
+            lines.append(f"{name}{{{_env_labels(replica)}}} {value_for(replica):g}")
+
+    for index in range(config.series):
+        is_counter = index % 2 == 0
+        name = f"day8_synthetic_{index}_total" if is_counter else f"day8_synthetic_{index}_inflight"
+        lines.append(f"# TYPE {name} {'counter' if is_counter else 'gauge'}")
+        base = rng.uniform(1.0, 1000.0)
+        for replica in range(config.replicas):
+            value = base * scrape if is_counter else rng.uniform(0.0, 50.0)
+            lines.append(
+                f'{name}{{route="/r{index % 10}",status="ok",{_env_labels(replica)}}} {value:.3f}'
+            )
+
+    for index in range(config.histograms):
+        name = f"day8_synthetic_latency_{index}_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        scale = rng.uniform(0.05, 2.0)
+        for replica in range(config.replicas):
+            labels = f'path="/api/{index}",{_env_labels(replica)}'
+            total = 200 * scrape
+            cumulative = 0
+            for bound in config.buckets:
+                # Exponential latency distribution with mean ``scale`` seconds.
+                share = 1.0 - math.exp(-bound / scale)
+                cumulative = max(cumulative, int(total * share))
+                lines.append(f'{name}_bucket{{le="{_format_bound(bound)}",{labels}}} {cumulative}')
+            lines.append(f'{name}_bucket{{le="+Inf",{labels}}} {total}')
+            lines.append(f"{name}_sum{{{labels}}} {total * scale:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {total}")
+
+    for index in range(config.summaries):
+        name = f"day8_synthetic_summary_{index}_seconds"
+        lines.append(f"# TYPE {name} summary")
+        for replica in range(config.replicas):
+            labels = f'path="/api/{index}",{_env_labels(replica)}'
+            for quantile in SUMMARY_QUANTILES:
+                value = float(quantile) * rng.uniform(0.1, 1.5)
+                lines.append(f'{name}{{quantile="{quantile}",{labels}}} {value:.4f}')
+            lines.append(f"{name}_sum{{{labels}}} {50.0 * scrape:.3f}")
+            lines.append(f"{name}_count{{{labels}}} {100 * scrape}")
+
+    for index in range(config.noise):
+        name = f"process_noise_{index}_total"
+        lines.append(f"# TYPE {name} counter")
+        for replica in range(config.replicas):
+            lines.append(f"{name}{{{_env_labels(replica)}}} {rng.uniform(0.0, 1e6):.1f}")
+
+    return "\n".join(lines) + "\n"
+
+
+def sample_count(config: SyntheticConfig) -> int:
+    """Return the number of samples (non-comment lines) in one rendered payload."""
+    per_replica = (
+        4
+        + config.series
+        + config.histograms * (len(config.buckets) + 3)
+        + config.summaries * (len(SUMMARY_QUANTILES) + 2)
+        + config.noise
+    )
+    return per_replica * config.replicas
+
+
+def build_server(
+    config: SyntheticConfig, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+) -> ThreadingHTTPServer:
+    """Create a server exposing ``/metrics``, ``/healthz`` and ``/warmup``."""
+    scrape_lock = threading.Lock()
+    scrape_counter = [0]
+    jitter = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _delay(self) -> None:
+            delay_ms = config.latency_ms
+            if config.jitter_ms:
+                with scrape_lock:
+                    delay_ms += jitter.uniform(0.0, config.jitter_ms)
+            if delay_ms > 0:
+                time.sleep(delay_ms / 1000.0)
+
+        def _reply(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _drain_body(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                self.rfile.read(length)
+
+        def do_GET(self) -> None:
+            self._drain_body()
+            self._delay()
+            if self.path.startswith("/metrics"):
+                with scrape_lock:
+                    scrape_counter[0] += 1
+                    scrape = scrape_counter[0]
+                body = render_exposition(config, scrape).encode("utf-8")
+                self._reply(200, body, "text/plain; version=0.0.4")
+            elif self.path.startswith(("/healthz", "/warmup")):
+                self._reply(200, b'{"status":"ok"}', "application/json")
+            else:
+                self._reply(404, b'{"status":"not_found"}', "application/json")
+
+        do_POST = do_GET
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve synthetic Day8 Prometheus metrics")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port (0 picks a free port)")
+    parser.add_argument("--series", type=int, default=SyntheticConfig.series, help="day8_ counter/gauge series")
+    parser.add_argument("--histograms", type=int, default=SyntheticConfig.histograms, help="day8_ histograms")
+    parser.add_argument("--summaries", type=int, default=SyntheticConfig.summaries, help="day8_ summaries")
+    parser.add_argument("--noise", type=int, default=SyntheticConfig.noise, help="Non-day8 noise series")
+    parser.add_argument("--replicas", type=int, default=SyntheticConfig.replicas, help="Replicas per series")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed latency injected per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per request")
+    parser.add_argument("--seed", type=int, default=SyntheticConfig.seed, help="Random seed for values")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> SyntheticConfig:
+    return SyntheticConfig(
+        series=args.series,
+        histograms=args.histograms,
+        summaries=args.summaries,
+        noise=args.noise,
+        replicas=args.replicas,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    server = build_server(config_from_args(args), args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving synthetic Day8 metrics on http://{host}:{port}/metrics", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,35 @@
 """Warmup helpers for Day8 API endpoints."""
 from __future__ import annotations
 
-from typing import Final
-from urllib import request
+import argparse
+import http.client
+import json
+import math
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Sequence
+from urllib import parse, request
 
 DEFAULT_TIMEOUT: Final[float] = 5.0
+DEFAULT_CONCURRENCY: Final[int] = 4
+DEFAULT_TOTAL_REQUESTS: Final[int] = 100
+DEFAULT_PHASES: Final[int] = 5
+DEFAULT_HEALTH_RETRIES: Final[int] = 5
+DEFAULT_HEALTH_BACKOFF: Final[float] = 0.5
+MAX_HEALTH_BACKOFF: Final[float] = 10.0
+REPORT_PERCENTILES: Final[tuple[float, ...]] = (0.5, 0.95, 0.99)
+DEFAULT_TOLERANCE: Final[float] = 0.1
+DEFAULT_ROLLING_WINDOW: Final[int] = 50
+DEFAULT_STABLE_CHECKS: Final[int] = 3
+DEFAULT_CHECK_EVERY: Final[int] = 10
+DEFAULT_MAX_REQUESTS: Final[int] = 2000
+DEFAULT_MAX_ERROR_RATE: Final[float] = 0.01
+EXIT_NOT_CONVERGED: Final[int] = 3
 
 
 def perform_health_check(url: str, timeout: float = DEFAULT_TIMEOUT) -> None:
@@ -40,3 +65,559 @@ def warmup(
     """Run the warmup flow: healthcheck first, then warmup request."""
     perform_health_check(healthcheck_url, timeout=timeout)
     send_warmup_request(warmup_url, payload=payload, timeout=timeout, method=method)
+
+
+def wait_for_health(
+    url: str,
+    *,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_HEALTH_RETRIES,
+    backoff: float = DEFAULT_HEALTH_BACKOFF,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """Poll the healthcheck with exponential backoff and return the attempt count.
+
+    The last error is re-raised once ``retries`` additional attempts have failed.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            perform_health_check(url, timeout=timeout)
+        except (OSError, http.client.HTTPException):
+            if attempt > retries:
+                raise
+            sleep(min(backoff * 2 ** (attempt - 1), MAX_HEALTH_BACKOFF))
+            continue
+        return attempt
+
+
+class KeepAliveConnectionPool:
+    """Thread-safe pool of persistent HTTP connections to a single origin."""
+
+    def __init__(self, url: str, *, timeout: float = DEFAULT_TIMEOUT, max_idle: int = DEFAULT_CONCURRENCY) -> None:
+        parts = parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported warmup URL: {url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path = f"{self.path}?{parts.query}"
+        self.connections_opened = 0
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=max(max_idle, 1))
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def request(self, method: str, body: bytes | None = None) -> tuple[int, bytes]:
+        """Send one request, retrying once on a fresh connection if a reused one went stale."""
+        headers = {"Connection": "keep-alive"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        try:
+            connection = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            connection = self._connect()
+            reused = False
+        while True:
+            try:
+                connection.request(method, self.path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if not reused:
+                    raise
+                connection = self._connect()
+                reused = False
+                continue
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            return response.status, data
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    index: int
+    started_at: float
+    latency_ms: float
+    ok: bool
+
+
+def _percentile(sorted_values: Sequence[float], quantile: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = quantile * (len(sorted_values) - 1)
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(sorted_values[lower])
+    weight = position - lower
+    return float(sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight)
+
+
+def summarize_latencies(samples: Sequence[RequestSample]) -> Dict[str, float]:
+    """Summarise successful request latencies with the report percentiles."""
+    latencies = sorted(sample.latency_ms for sample in samples if sample.ok)
+    summary: Dict[str, float] = {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if not sample.ok),
+    }
+    for quantile in REPORT_PERCENTILES:
+        summary[f"p{quantile * 100:g}_ms"] = _percentile(latencies, quantile)
+    summary["max_ms"] = latencies[-1] if latencies else 0.0
+    return summary
+
+
+def split_phases(samples: Sequence[RequestSample], phases: int) -> list[list[RequestSample]]:
+    """Split samples, in request order, into ``phases`` consecutive groups of equal size."""
+    ordered = sorted(samples, key=lambda sample: sample.index)
+    count = max(min(phases, len(ordered)), 1)
+    bounds = [round(len(ordered) * step / count) for step in range(count + 1)]
+    return [ordered[bounds[step] : bounds[step + 1]] for step in range(count)]
+
+
+def load_payload_corpus(path: Path) -> list[bytes]:
+    """Read one request body per non-empty line of ``path``."""
+    payloads = [
+        line.strip().encode("utf-8")
+        for line in path.read_text(encoding="utf-8").splitlines()
+        if line.strip()
+    ]
+    if not payloads:
+        raise ValueError(f"Payload corpus {path} is empty")
+    return payloads
+
+
+def run_load(
+    url: str,
+    *,
+    payloads: Sequence[bytes | None] = (None,),
+    method: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    total_requests: int | None = None,
+    duration: float | None = None,
+    pool: KeepAliveConnectionPool | None = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> list[RequestSample]:
+    """Send warmup requests from ``concurrency`` workers over keep-alive connections.
+
+    Payloads are used round-robin. The run stops after ``total_requests``
+    requests or ``duration`` seconds, whichever comes first.
+    """
+    if total_requests is None and duration is None:
+        total_requests = DEFAULT_TOTAL_REQUESTS
+    corpus = list(payloads) or [None]
+    owned_pool = pool is None
+    active_pool = pool or KeepAliveConnectionPool(url, timeout=timeout, max_idle=concurrency)
+    started = clock()
+    deadline = started + duration if duration is not None else None
+    counter_lock = threading.Lock()
+    next_index = 0
+    samples: list[RequestSample] = []
+
+    def claim() -> int | None:
+        nonlocal next_index
+        with counter_lock:
+            if total_requests is not None and next_index >= total_requests:
+                return None
+            if deadline is not None and clock() >= deadline:
+                return None
+            index = next_index
+            next_index += 1
+            return index
+
+    def worker() -> list[RequestSample]:
+        collected: list[RequestSample] = []
+        while (index := claim()) is not None:
+            body = corpus[index % len(corpus)]
+            resolved_method = method or ("POST" if body is not None else "GET")
+            request_started = clock()
+            try:
+                status, _ = active_pool.request(resolved_method, body)
+                ok = status < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+            latency_ms = (clock() - request_started) * 1000.0
+            collected.append(RequestSample(index, request_started - started, latency_ms, ok))
+        return collected
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            futures = [executor.submit(worker) for _ in range(max(concurrency, 1))]
+            for future in futures:
+                samples.extend(future.result())
+    finally:
+        if owned_pool:
+            active_pool.close()
+    samples.sort(key=lambda sample: sample.index)
+    return samples
+
+
+def load_warmup(
+    healthcheck_url: str,
+    warmup_url: str,
+    *,
+    payloads: Sequence[bytes | None] = (None,),
+    method: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    total_requests: int | None = None,
+    duration: float | None = None,
+    phases: int = DEFAULT_PHASES,
+    health_retries: int = DEFAULT_HEALTH_RETRIES,
+    health_backoff: float = DEFAULT_HEALTH_BACKOFF,
+    health_timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Wait for the healthcheck, drive concurrent warmup load and report per-phase latency.
+
+    ``health_timeout`` defaults to ``timeout``.
+    """
+    health_started = time.perf_counter()
+    attempts = wait_for_health(
+        healthcheck_url,
+        timeout=timeout if health_timeout is None else health_timeout,
+        retries=health_retries,
+        backoff=health_backoff,
+    )
+    health_seconds = time.perf_counter() - health_started
+
+    pool = KeepAliveConnectionPool(warmup_url, timeout=timeout, max_idle=concurrency)
+    load_started = time.perf_counter()
+    try:
+        samples = run_load(
+            warmup_url,
+            payloads=payloads,
+            method=method,
+            timeout=timeout,
+            concurrency=concurrency,
+            total_requests=total_requests,
+            duration=duration,
+            pool=pool,
+        )
+    finally:
+        pool.close()
+    load_seconds = time.perf_counter() - load_started
+
+    return {
+        "healthcheck": {"attempts": attempts, "seconds": health_seconds},
+        "load": {
+            "concurrency": concurrency,
+            "seconds": load_seconds,
+            "throughput_rps": len(samples) / load_seconds if load_seconds > 0 else 0.0,
+            "connections_opened": pool.connections_opened,
+            **summarize_latencies(samples),
+        },
+        "phases": [
+            {"phase": number, **summarize_latencies(group)}
+            for number, group in enumerate(split_phases(samples, phases), start=1)
+            if group
+        ],
+    }
+
+
+def is_converged(p95_curve: Sequence[float], *, tolerance: float, stable_checks: int) -> bool:
+    """Return True when the last ``stable_checks + 1`` p95 values agree within ``tolerance``.
+
+    Agreement is measured as the spread (max - min) relative to the max.
+    """
+    needed = stable_checks + 1
+    if len(p95_curve) < needed:
+        return False
+    recent = p95_curve[-needed:]
+    highest = max(recent)
+    if highest <= 0.0:
+        return True
+    return (highest - min(recent)) / highest <= tolerance
+
+
+def adaptive_warmup(
+    healthcheck_url: str,
+    warmup_url: str,
+    *,
+    payloads: Sequence[bytes | None] = (None,),
+    method: str | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    tolerance: float = DEFAULT_TOLERANCE,
+    window: int = DEFAULT_ROLLING_WINDOW,
+    stable_checks: int = DEFAULT_STABLE_CHECKS,
+    check_every: int = DEFAULT_CHECK_EVERY,
+    max_requests: int = DEFAULT_MAX_REQUESTS,
+    max_seconds: float | None = None,
+    max_error_rate: float = DEFAULT_MAX_ERROR_RATE,
+    health_retries: int = DEFAULT_HEALTH_RETRIES,
+    health_backoff: float = DEFAULT_HEALTH_BACKOFF,
+    health_timeout: float | None = None,
+    pool: KeepAliveConnectionPool | None = None,
+    clock: Callable[[], float] = time.perf_counter,
+) -> Dict[str, Any]:
+    """Send warmup requests until the rolling p95 latency stabilises or the budget runs out.
+
+    Every ``check_every`` requests the p95 of the last ``window`` successful
+    latencies is added to the curve once the window is full. The service is
+    considered warm when the last ``stable_checks + 1`` curve points agree
+    within ``tolerance`` and no more than ``max_error_rate`` of the last
+    ``window`` requests failed. ``health_timeout`` defaults to ``timeout``.
+    """
+    attempts = wait_for_health(
+        healthcheck_url,
+        timeout=timeout if health_timeout is None else health_timeout,
+        retries=health_retries,
+        backoff=health_backoff,
+    )
+    corpus = list(payloads) or [None]
+    owned_pool = pool is None
+    active_pool = pool or KeepAliveConnectionPool(warmup_url, timeout=timeout, max_idle=concurrency)
+    started = clock()
+    latencies: list[float] = []
+    outcomes: list[bool] = []
+    p95_curve: list[float] = []
+    curve: list[Dict[str, float]] = []
+    sent = 0
+    errors = 0
+    converged = False
+    try:
+        while sent < max_requests:
+            if max_seconds is not None and clock() - started >= max_seconds:
+                break
+            batch_size = min(max(check_every, 1), max_requests - sent)
+            offset = sent % len(corpus)
+            batch = run_load(
+                warmup_url,
+                payloads=corpus[offset:] + corpus[:offset],
+                method=method,
+                timeout=timeout,
+                concurrency=concurrency,
+                total_requests=batch_size,
+                pool=active_pool,
+                clock=clock,
+            )
+            sent += len(batch)
+            errors += sum(1 for sample in batch if not sample.ok)
+            outcomes.extend(sample.ok for sample in batch)
+            latencies.extend(sample.latency_ms for sample in batch if sample.ok)
+            if len(latencies) < window:
+                continue
+            recent = outcomes[-window:]
+            error_rate = recent.count(False) / len(recent)
+            rolling_p95 = _percentile(sorted(latencies[-window:]), 0.95)
+            p95_curve.append(rolling_p95)
+            curve.append(
+                {
+                    "requests": sent,
+                    "elapsed_seconds": clock() - started,
+                    "rolling_p95_ms": rolling_p95,
+                    "error_rate": error_rate,
+                }
+            )
+            # Fast failures would otherwise look like a flat, converged p95.
+            if error_rate > max_error_rate:
+                continue
+            if is_converged(p95_curve, tolerance=tolerance, stable_checks=stable_checks):
+                converged = True
+                break
+    finally:
+        if owned_pool:
+            active_pool.close()
+
+    return {
+        "converged": converged,
+        "healthcheck": {"attempts": attempts},
+        "requests": sent,
+        "errors": errors,
+        "elapsed_seconds": clock() - started,
+        "final_p95_ms": p95_curve[-1] if p95_curve else None,
+        "settings": {
+            "tolerance": tolerance,
+            "window": window,
+            "stable_checks": stable_checks,
+            "check_every": check_every,
+            "max_requests": max_requests,
+            "max_seconds": max_seconds,
+            "max_error_rate": max_error_rate,
+        },
+        "curve": curve,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Warm up Day8 API endpoints")
+    parser.add_argument("--healthcheck-url", required=True, help="Healthcheck endpoint URL")
+    parser.add_argument("--warmup-url", required=True, help="Warmup endpoint URL")
+    parser.add_argument("--method", default=None, help="HTTP method (default: POST with payload, else GET)")
+    parser.add_argument("--payload", default=None, help="Inline JSON payload for every request")
+    parser.add_argument("--corpus", type=Path, default=None, help="File with one request body per line")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Concurrent workers")
+    parser.add_argument("--requests", type=int, default=None, help="Total warmup requests")
+    parser.add_argument("--duration", type=float, default=None, help="Stop the load after N seconds")
+    parser.add_argument("--phases", type=int, default=DEFAULT_PHASES, help="Number of latency report phases")
+    parser.add_argument(
+        "--health-retries",
+        type=int,
+        default=DEFAULT_HEALTH_RETRIES,
+        help="Healthcheck retries before giving up",
+    )
+    parser.add_argument(
+        "--health-backoff",
+        type=float,
+        default=DEFAULT_HEALTH_BACKOFF,
+        help="Initial healthcheck retry delay in seconds (doubles per attempt)",
+    )
+    parser.add_argument(
+        "--health-timeout",
+        type=float,
+        default=None,
+        help="Healthcheck timeout in seconds (default: --timeout)",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help=(
+            f"Warm until rolling p95 stabilises; exit {EXIT_NOT_CONVERGED} if the budget runs out first"
+            " and 1 if any request failed"
+        ),
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative p95 spread accepted as stable in --adaptive mode",
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_ROLLING_WINDOW,
+        help="Requests in the rolling p95 window in --adaptive mode",
+    )
+    parser.add_argument(
+        "--stable-checks",
+        type=int,
+        default=DEFAULT_STABLE_CHECKS,
+        help="Consecutive stable p95 checks required in --adaptive mode",
+    )
+    parser.add_argument(
+        "--check-every",
+        type=int,
+        default=DEFAULT_CHECK_EVERY,
+        help="Requests between p95 checks in --adaptive mode",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_MAX_REQUESTS,
+        help="Request budget in --adaptive mode",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Time budget in seconds in --adaptive mode",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=DEFAULT_MAX_ERROR_RATE,
+        help="Failed-request share in the rolling window that blocks convergence in --adaptive mode",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Optional file path to write the JSON report")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    payloads: Sequence[bytes | None]
+    if args.corpus is not None:
+        try:
+            payloads = load_payload_corpus(args.corpus)
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            parser.error(f"--corpus: {exc}")
+    elif args.payload is not None:
+        payloads = [args.payload.encode("utf-8")]
+    else:
+        payloads = [None]
+
+    try:
+        if args.adaptive:
+            report = adaptive_warmup(
+                args.healthcheck_url,
+                args.warmup_url,
+                payloads=payloads,
+                method=args.method,
+                timeout=args.timeout,
+                concurrency=args.concurrency,
+                tolerance=args.tolerance,
+                window=args.window,
+                stable_checks=args.stable_checks,
+                check_every=args.check_every,
+                max_requests=args.max_requests,
+                max_seconds=args.max_seconds,
+                max_error_rate=args.max_error_rate,
+                health_retries=args.health_retries,
+                health_backoff=args.health_backoff,
+                health_timeout=args.health_timeout,
+            )
+        else:
+            report = load_warmup(
+                args.healthcheck_url,
+                args.warmup_url,
+                payloads=payloads,
+                method=args.method,
+                timeout=args.timeout,
+                concurrency=args.concurrency,
+                total_requests=args.requests,
+                duration=args.duration,
+                phases=args.phases,
+                health_retries=args.health_retries,
+                health_backoff=args.health_backoff,
+                health_timeout=args.health_timeout,
+            )
+    except ValueError as exc:
+        print(f"Warmup failed: {exc}", file=sys.stderr)
+        return 1
+    except (OSError, http.client.HTTPException) as exc:
+        print(f"Healthcheck failed for {args.healthcheck_url}: {exc}", file=sys.stderr)
+        return 1
+
+    formatted = json.dumps(report, indent=2, sort_keys=True)
+    print(formatted)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(f"{formatted}\n", encoding="utf-8")
+    if args.adaptive:
+        # Convergence already requires the window's error rate within --max-error-rate.
+        return 0 if report["converged"] else EXIT_NOT_CONVERGED
+    return 1 if report["load"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,38 @@ HEALTH_TIMEOUT="${DAY8_API_HEALTHCHECK_TIMEOUT:-5}"
 WARMUP_TIMEOUT="${DAY8_API_WARMUP_TIMEOUT:-5}"
 WARMUP_METHOD="${DAY8_API_WARMUP_METHOD:-POST}"
 WARMUP_PAYLOAD="${DAY8_API_WARMUP_PAYLOAD:-}"
+WARMUP_ADAPTIVE="${DAY8_API_WARMUP_ADAPTIVE:-0}"
+
+if [[ "${WARMUP_ADAPTIVE}" == "1" || "${WARMUP_ADAPTIVE}" == "true" ]]; then
+  # Gate on steady-state latency: exits 0 when warm with the rolling error rate within
+  # DAY8_API_WARMUP_MAX_ERROR_RATE, 3 when the budget runs out first and 1 when the
+  # healthcheck fails.
+  SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+  adaptive_args=(
+    --adaptive
+    --healthcheck-url "${DAY8_API_HEALTHCHECK_URL}"
+    --warmup-url "${DAY8_API_WARMUP_URL}"
+    --method "${WARMUP_METHOD}"
+    --timeout "${WARMUP_TIMEOUT}"
+    --health-timeout "${HEALTH_TIMEOUT}"
+    --concurrency "${DAY8_API_WARMUP_CONCURRENCY:-4}"
+    --tolerance "${DAY8_API_WARMUP_TOLERANCE:-0.1}"
+    --max-requests "${DAY8_API_WARMUP_MAX_REQUESTS:-2000}"
+  )
+  if [[ -n "${WARMUP_PAYLOAD}" ]]; then
+    adaptive_args+=(--payload "${WARMUP_PAYLOAD}")
+  fi
+  if [[ -n "${DAY8_API_WARMUP_MAX_ERROR_RATE:-}" ]]; then
+    adaptive_args+=(--max-error-rate "${DAY8_API_WARMUP_MAX_ERROR_RATE}")
+  fi
+  if [[ -n "${DAY8_API_WARMUP_MAX_SECONDS:-}" ]]; then
+    adaptive_args+=(--max-seconds "${DAY8_API_WARMUP_MAX_SECONDS}")
+  fi
+  if [[ -n "${DAY8_API_WARMUP_REPORT:-}" ]]; then
+    adaptive_args+=(--output "${DAY8_API_WARMUP_REPORT}")
+  fi
+  exec "${PYTHON:-python3}" "${SCRIPT_DIR}/perf/warmup.py" "${adaptive_args[@]}"
+fi
 
 curl --fail --silent --show-error \
   --max-time "${HEALTH_TIMEOUT}" \
@@ -0,0 +1,57 @@
+"""Tests for scripts.perf.bench_collect_metrics."""
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+PERF_DIR = Path(__file__).resolve().parents[3] / "scripts" / "perf"
+
+
+@pytest.fixture
+def bench_module(monkeypatch):
+    monkeypatch.syspath_prepend(str(PERF_DIR))
+    spec = importlib.util.spec_from_file_location(
+        "scripts.perf.bench_collect_metrics", PERF_DIR / "bench_collect_metrics.py"
+    )
+    if spec is None or spec.loader is None:
+        raise RuntimeError("Failed to load bench_collect_metrics module")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_bench_parse_reports_cold_and_warm_throughput(bench_module) -> None:
+    config = bench_module.SyntheticConfig(series=10, histograms=2, summaries=1, noise=5, replicas=2)
+
+    result = bench_module.bench_parse(config, repeats=2)
+
+    assert result["samples"] == bench_module.synthetic_metrics_server.sample_count(config)
+    assert result["cold"]["samples_per_second"] > 0
+    assert result["warm"]["samples_per_second"] > 0
+    assert result["cold"]["peak_memory_bytes"] > 0
+    assert result["series_cache"]["hits"] > 0
+
+
+def test_main_writes_report_with_scrape(bench_module, tmp_path: Path, capsys) -> None:
+    output = tmp_path / "bench" / "report.json"
+
+    exit_code = bench_module.main(
+        [
+            "--series", "5", "--histograms", "1", "--summaries", "1", "--noise", "2",
+            "--replicas", "1", "--repeats", "1", "--output", str(output),
+        ]
+    )
+
+    assert exit_code == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report == json.loads(capsys.readouterr().out)
+    assert report["config"]["series"] == 5
+    assert report["scrape"]["samples_per_second"] > 0
+
+
+def test_main_rejects_non_positive_repeats(bench_module, capsys) -> None:
+    assert bench_module.main(["--repeats", "0", "--no-scrape"]) == 1
+    assert "--repeats" in capsys.readouterr().err
@@ -1332,6 +1332,14 @@ def test_collect_prometheus_metrics_preserves_histogram_buckets(
         "prometheus": metrics,
         "chainlit": {},
         "metrics": metrics,
+        "histograms": {
+            "day8_latency_seconds": {
+                "count": pytest.approx(9.0),
+                "p50": pytest.approx(0.6875),
+                "p95": pytest.approx(1.0),
+                "p99": pytest.approx(1.0),
+            }
+        },
     }
     assert captured.err == ""
 
@@ -1473,3 +1481,534 @@ def test_main_reports_missing_metric_when_chainlit_logs_nan(
     payload_json = json.loads(captured.out)
     assert "day8_jobs_processed_total" not in payload_json["metrics"]
     assert json.loads(captured.out) == payload_json
+
+
+def test_collect_prometheus_metrics_reuses_cached_series_keys(
+    monkeypatch: pytest.MonkeyPatch, collect_metrics_module
+) -> None:
+    payload = (
+        b'day8_request_duration_seconds_bucket{path="/api",le="0.5",pod="a"} 3\n'
+        b'day8_jobs_processed_total{instance="a"} 5\n'
+    )
+    normalize_calls: List[str] = []
+    original_normalize = collect_metrics_module._normalize_prometheus_metric_name
+
+    def counting_normalize(metric: str, *, preserve_label_for_bucket: bool = False) -> str:
+        normalize_calls.append(metric)
+        return original_normalize(metric, preserve_label_for_bucket=preserve_label_for_bucket)
+
+    monkeypatch.setattr(
+        collect_metrics_module, "_normalize_prometheus_metric_name", counting_normalize
+    )
+    monkeypatch.setattr(
+        collect_metrics_module.urllib.request,
+        "urlopen",
+        lambda url, timeout=5.0: _DummyResponse(payload),
+    )
+
+    first = collect_metrics_module.collect_prometheus_metrics("http://example.test/metrics")
+    second = collect_metrics_module.collect_prometheus_metrics("http://example.test/metrics")
+
+    assert first == second == {
+        'day8_request_duration_seconds_bucket{le="0.5",path="/api"}': 3.0,
+        "day8_jobs_processed_total": 5.0,
+    }
+    assert len(normalize_calls) == 2
+    stats = collect_metrics_module._SERIES_KEY_CACHE.stats()
+    assert stats["size"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+def test_series_key_cache_evicts_least_recently_used(collect_metrics_module) -> None:
+    cache = collect_metrics_module._SeriesKeyCache(max_size=2)
+
+    cache.normalize('day8_a_total{instance="x"}')
+    cache.normalize('day8_b_total{instance="x"}')
+    cache.normalize('day8_a_total{instance="x"}')
+    cache.normalize('day8_c_total{instance="x"}')
+
+    assert len(cache) == 2
+    assert cache.normalize('day8_a_total{instance="x"}') == "day8_a_total"
+    assert cache.stats()["hits"] == 2
+    cache.normalize('day8_b_total{instance="x"}')
+    assert cache.stats()["misses"] == 4
+
+    cache.resize(0)
+    assert len(cache) == 0
+    cache.normalize('day8_a_total{instance="x"}')
+    assert len(cache) == 0
+
+
+def test_main_reports_series_cache_stats_when_requested(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    collect_metrics_module,
+) -> None:
+    payload = (
+        b'day8_app_boot_timestamp{instance="a"} 1\n'
+        b'day8_jobs_processed_total{instance="a"} 5\n'
+        b'day8_jobs_failed_total{instance="a"} 2\n'
+        b'day8_healthz_request_total{instance="a"} 3\n'
+    )
+    monkeypatch.setattr(
+        collect_metrics_module.urllib.request,
+        "urlopen",
+        lambda url, timeout=5.0: _DummyResponse(payload),
+    )
+
+    exit_code = collect_metrics_module.main(
+        _prepare_args(tmp_path, ["--cache-stats", "--series-cache-size", "3"])
+    )
+    assert exit_code == 0
+
+    result = json.loads(capsys.readouterr().out)
+    assert result["series_cache"] == {
+        "size": 3,
+        "max_size": 3,
+        "hits": 0,
+        "misses": 4,
+        "hit_rate": 0.0,
+    }
+
+
+def test_histogram_quantile_interpolates_within_buckets(collect_metrics_module) -> None:
+    buckets = [(0.1, 10.0), (0.5, 50.0), (1.0, 90.0), (float("inf"), 100.0)]
+
+    quantile = collect_metrics_module._histogram_quantile
+
+    assert quantile(0.5, buckets) == pytest.approx(0.5)
+    assert quantile(0.3, buckets) == pytest.approx(0.3)
+    assert quantile(0.05, buckets) == pytest.approx(0.05)
+    assert quantile(0.99, buckets) == pytest.approx(1.0)
+    assert quantile(0.5, [(float("inf"), 0.0)]) is None
+
+
+def test_rolling_metrics_computes_rates_with_counter_resets(collect_metrics_module) -> None:
+    tracker = collect_metrics_module.RollingMetrics(window_seconds=60.0)
+
+    first = tracker.observe(
+        0.0,
+        {
+            "day8_jobs_processed_total": 10.0,
+            "day8_jobs_failed_total": 1.0,
+            "day8_queue_depth": 4.0,
+        },
+    )
+    assert first["rates"] == {}
+    assert first["window"]["failure_ratio"] is None
+
+    second = tracker.observe(
+        10.0,
+        {
+            "day8_jobs_processed_total": 30.0,
+            "day8_jobs_failed_total": 3.0,
+            "day8_queue_depth": 2.0,
+        },
+    )
+    assert second["rates"] == {
+        "day8_jobs_processed_total": pytest.approx(2.0),
+        "day8_jobs_failed_total": pytest.approx(0.2),
+    }
+
+    third = tracker.observe(
+        20.0,
+        {"day8_jobs_processed_total": 5.0, "day8_jobs_failed_total": 3.0},
+    )
+    assert third["rates"]["day8_jobs_processed_total"] == pytest.approx(0.5)
+    window = third["window"]
+    assert window["seconds"] == pytest.approx(20.0)
+    assert window["samples"] == 3
+    assert window["rates"]["day8_jobs_processed_total"] == pytest.approx(25.0 / 20.0)
+    assert window["failure_ratio"] == pytest.approx(2.0 / 25.0)
+
+
+def test_rolling_metrics_detects_resets_per_target(collect_metrics_module) -> None:
+    tracker = collect_metrics_module.RollingMetrics(window_seconds=60.0)
+    key = "day8_jobs_processed_total"
+
+    def observe(timestamp: float, first: float, second: float) -> dict:
+        sources = [{key: first}, {key: second}]
+        return tracker.observe(timestamp, {key: first + second}, sources=sources)
+
+    observe(0.0, 100.0, 1000.0)
+    observe(10.0, 120.0, 1010.0)
+    # Only the first replica restarts; the merged total drops from 1130 to 1025.
+    snapshot = observe(20.0, 5.0, 1020.0)
+
+    assert snapshot["rates"] == {key: pytest.approx((5.0 + 10.0) / 10.0)}
+    assert snapshot["window"]["rates"][key] == pytest.approx((30.0 + 15.0) / 20.0)
+
+
+def test_rolling_metrics_drops_scrapes_outside_window(collect_metrics_module) -> None:
+    tracker = collect_metrics_module.RollingMetrics(window_seconds=15.0)
+
+    for timestamp, value in [(0.0, 0.0), (10.0, 100.0), (20.0, 110.0), (30.0, 120.0)]:
+        snapshot = tracker.observe(timestamp, {"day8_jobs_processed_total": value})
+
+    assert snapshot["window"]["samples"] == 3
+    assert snapshot["window"]["seconds"] == pytest.approx(20.0)
+    assert snapshot["window"]["rates"]["day8_jobs_processed_total"] == pytest.approx(1.0)
+
+
+def test_rolling_metrics_derives_window_histogram_quantiles(collect_metrics_module) -> None:
+    tracker = collect_metrics_module.RollingMetrics(window_seconds=60.0)
+
+    tracker.observe(
+        0.0,
+        {
+            'day8_request_duration_seconds_bucket{le="0.5",path="/api"}': 100.0,
+            'day8_request_duration_seconds_bucket{le="1.0",path="/api"}': 100.0,
+            'day8_request_duration_seconds_bucket{le="+Inf",path="/api"}': 100.0,
+        },
+    )
+    snapshot = tracker.observe(
+        10.0,
+        {
+            'day8_request_duration_seconds_bucket{le="0.5",path="/api"}': 100.0,
+            'day8_request_duration_seconds_bucket{le="1.0",path="/api"}': 110.0,
+            'day8_request_duration_seconds_bucket{le="+Inf",path="/api"}': 110.0,
+        },
+    )
+
+    assert snapshot["quantiles"]['day8_request_duration_seconds{path="/api"}']["p50"] == (
+        pytest.approx(0.5 * 55.0 / 100.0)
+    )
+    assert snapshot["window"]["quantiles"] == {
+        'day8_request_duration_seconds{path="/api"}': {
+            "p50": pytest.approx(0.75),
+            "p95": pytest.approx(0.975),
+            "p99": pytest.approx(0.995),
+        }
+    }
+
+
+def test_main_interval_mode_emits_jsonl_snapshots(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    collect_metrics_module,
+) -> None:
+    scrapes = iter([{"day8_jobs_processed_total": 5.0}, {"day8_jobs_processed_total": 15.0}])
+    monkeypatch.setattr(
+        collect_metrics_module,
+        "collect_prometheus_metrics",
+        lambda url, metric_prefix="day8_", *, timeout=5.0: next(scrapes),
+    )
+    monkeypatch.setattr(
+        collect_metrics_module, "collect_chainlit_metrics", lambda path, metric_prefix="day8_": {}
+    )
+    now = [100.0]
+    sleeps: List[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(collect_metrics_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(collect_metrics_module.time, "time", lambda: now[0])
+    monkeypatch.setattr(collect_metrics_module.time, "sleep", fake_sleep)
+
+    output_path = tmp_path / "snapshots.jsonl"
+    exit_code = collect_metrics_module.main(
+        _prepare_args(
+            tmp_path,
+            ["--interval", "5", "--duration", "5", "--output", str(output_path)],
+        )
+    )
+    assert exit_code == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    snapshots = [json.loads(line) for line in lines]
+    assert [snapshot["scrape"] for snapshot in snapshots] == [1, 2]
+    assert sleeps == [5.0]
+    assert snapshots[1]["rates"] == {"day8_jobs_processed_total": 2.0}
+    assert "day8_jobs_failed_total" in snapshots[1]["missing"]
+    assert "series_cache" in snapshots[1]
+    assert output_path.read_text(encoding="utf-8").splitlines() == lines
+
+
+def test_main_rejects_duration_without_interval(
+    tmp_path: Path, collect_metrics_module
+) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        collect_metrics_module.main(_prepare_args(tmp_path, ["--duration", "10"]))
+
+    assert exc_info.value.code == 2
+
+
+def test_collect_chainlit_metrics_checkpoint_reads_only_appended_lines(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, collect_metrics_module
+) -> None:
+    log_path = tmp_path / "chainlit.jsonl"
+    checkpoint_path = tmp_path / "state" / "chainlit.checkpoint.json"
+    log_path.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 1}) + "\n"
+        + json.dumps({"metric": "day8_jobs_failed_total", "value": 2}) + "\n",
+        encoding="utf-8",
+    )
+
+    first = collect_metrics_module.collect_chainlit_metrics(
+        log_path, checkpoint=checkpoint_path
+    )
+    assert first == {"day8_jobs_processed_total": 1.0, "day8_jobs_failed_total": 2.0}
+
+    parsed_lines: List[str] = []
+    original_parse = collect_metrics_module._parse_chainlit_line
+
+    def recording_parse(raw_line: str):
+        parsed_lines.append(raw_line)
+        return original_parse(raw_line)
+
+    monkeypatch.setattr(collect_metrics_module, "_parse_chainlit_line", recording_parse)
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"metric": "day8_jobs_processed_total", "value": 5}) + "\n")
+        handle.write('{"metric": "day8_healthz_request_total", "val')
+
+    second = collect_metrics_module.collect_chainlit_metrics(
+        log_path, checkpoint=checkpoint_path
+    )
+    assert second == {"day8_jobs_processed_total": 5.0, "day8_jobs_failed_total": 2.0}
+    assert len(parsed_lines) == 1
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('ue": 3}\n')
+
+    third = collect_metrics_module.collect_chainlit_metrics(
+        log_path, checkpoint=checkpoint_path
+    )
+    assert third["day8_healthz_request_total"] == 3.0
+    assert len(parsed_lines) == 2
+
+
+def test_collect_chainlit_metrics_checkpoint_restarts_after_rotation(
+    tmp_path: Path, collect_metrics_module
+) -> None:
+    log_path = tmp_path / "chainlit.jsonl"
+    checkpoint_path = tmp_path / "chainlit.checkpoint.json"
+    log_path.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 10}) + "\n"
+        + json.dumps({"metric": "day8_jobs_failed_total", "value": 1}) + "\n",
+        encoding="utf-8",
+    )
+    collect_metrics_module.collect_chainlit_metrics(log_path, checkpoint=checkpoint_path)
+
+    log_path.rename(tmp_path / "chainlit.jsonl.1")
+    log_path.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 12}) + "\n",
+        encoding="utf-8",
+    )
+
+    rotated = collect_metrics_module.collect_chainlit_metrics(
+        log_path, checkpoint=checkpoint_path
+    )
+    assert rotated == {"day8_jobs_processed_total": 12.0, "day8_jobs_failed_total": 1.0}
+
+    log_path.write_text("", encoding="utf-8")
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"metric": "day8_jobs_failed_total", "value": 4}) + "\n")
+
+    truncated = collect_metrics_module.collect_chainlit_metrics(
+        log_path, checkpoint=checkpoint_path
+    )
+    assert truncated["day8_jobs_failed_total"] == 4.0
+
+    state = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    assert state["offset"] == log_path.stat().st_size
+    assert state["inode"] == log_path.stat().st_ino
+
+
+def test_collect_chainlit_metrics_checkpoint_drains_rotated_file(
+    tmp_path: Path, collect_metrics_module
+) -> None:
+    log_path = tmp_path / "chainlit.jsonl"
+    checkpoint_path = tmp_path / "chainlit.checkpoint.json"
+    log_path.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 10}) + "\n",
+        encoding="utf-8",
+    )
+    collect_metrics_module.collect_chainlit_metrics(log_path, checkpoint=checkpoint_path)
+
+    # Lines written after the checkpoint but before rotation must not be lost.
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"metric": "day8_jobs_failed_total", "value": 3}) + "\n")
+        handle.write(json.dumps({"metric": "day8_healthz_request_total", "value": 7}))
+    log_path.rename(tmp_path / "chainlit.jsonl.1")
+    log_path.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 12}) + "\n",
+        encoding="utf-8",
+    )
+
+    rotated = collect_metrics_module.collect_chainlit_metrics(log_path, checkpoint=checkpoint_path)
+
+    assert rotated == {
+        "day8_jobs_processed_total": 12.0,
+        "day8_jobs_failed_total": 3.0,
+        "day8_healthz_request_total": 7.0,
+    }
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_collect_chainlit_metrics_checkpoint_ignores_state_of_other_log(
+    tmp_path: Path, collect_metrics_module
+) -> None:
+    checkpoint_path = tmp_path / "chainlit.checkpoint.json"
+    first_log = tmp_path / "first.jsonl"
+    second_log = tmp_path / "second.jsonl"
+    first_log.write_text(
+        json.dumps({"metric": "day8_jobs_failed_total", "value": 9}) + "\n", encoding="utf-8"
+    )
+    second_log.write_text(
+        json.dumps({"metric": "day8_jobs_processed_total", "value": 1}) + "\n", encoding="utf-8"
+    )
+
+    collect_metrics_module.collect_chainlit_metrics(first_log, checkpoint=checkpoint_path)
+    second = collect_metrics_module.collect_chainlit_metrics(second_log, checkpoint=checkpoint_path)
+
+    assert second == {"day8_jobs_processed_total": 1.0}
+    assert json.loads(checkpoint_path.read_text(encoding="utf-8"))["path"] == str(second_log)
+
+
+def test_main_passes_chainlit_checkpoint(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    collect_metrics_module,
+) -> None:
+    captured: Dict[str, object] = {}
+
+    def fake_collect_chainlit(path: Path, metric_prefix: str = "day8_", *, checkpoint=None):
+        captured["checkpoint"] = checkpoint
+        return {
+            "day8_app_boot_timestamp": 1.0,
+            "day8_jobs_processed_total": 1.0,
+            "day8_jobs_failed_total": 0.0,
+            "day8_healthz_request_total": 1.0,
+        }
+
+    monkeypatch.setattr(
+        collect_metrics_module,
+        "collect_prometheus_metrics",
+        lambda url, metric_prefix="day8_", *, timeout=5.0: {},
+    )
+    monkeypatch.setattr(collect_metrics_module, "collect_chainlit_metrics", fake_collect_chainlit)
+
+    checkpoint_path = tmp_path / "chainlit.checkpoint.json"
+    exit_code = collect_metrics_module.main(
+        _prepare_args(tmp_path, ["--chainlit-checkpoint", str(checkpoint_path)])
+    )
+
+    assert exit_code == 0
+    assert captured["checkpoint"] == checkpoint_path
+
+
+def test_summarize_histograms_merges_targets_with_different_layouts(
+    collect_metrics_module,
+) -> None:
+    target_a = {
+        'day8_request_duration_seconds_bucket{le="0.5",path="/api"}': 50.0,
+        'day8_request_duration_seconds_bucket{le="1.0",path="/api"}': 100.0,
+        'day8_request_duration_seconds_bucket{le="+Inf",path="/api"}': 100.0,
+    }
+    target_b = {
+        'day8_request_duration_seconds_bucket{le="1.0",path="/api"}': 100.0,
+        'day8_request_duration_seconds_bucket{le="+Inf",path="/api"}': 100.0,
+    }
+
+    summary = collect_metrics_module.summarize_histograms([target_a, target_b])
+
+    assert summary == {
+        'day8_request_duration_seconds{path="/api"}': {
+            "count": pytest.approx(200.0),
+            "p50": pytest.approx(0.5),
+            "p95": pytest.approx(0.95),
+            "p99": pytest.approx(0.99),
+        }
+    }
+
+
+def test_main_merges_multiple_prometheus_targets(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    collect_metrics_module,
+) -> None:
+    targets = {
+        "http://a.test/metrics": {
+            "day8_app_boot_timestamp": 10.0,
+            "day8_jobs_processed_total": 5.0,
+            "day8_jobs_failed_total": 1.0,
+            "day8_healthz_request_total": 2.0,
+            'day8_latency_seconds_bucket{le="0.5"}': 2.0,
+            'day8_latency_seconds_bucket{le="+Inf"}': 4.0,
+        },
+        "http://b.test/metrics": {
+            "day8_app_boot_timestamp": 20.0,
+            "day8_jobs_processed_total": 7.0,
+            "day8_latency_seconds_quantile_0.5": 0.3,
+            'day8_latency_seconds_bucket{le="0.5"}': 4.0,
+            'day8_latency_seconds_bucket{le="+Inf"}': 4.0,
+        },
+    }
+    requested: List[str] = []
+
+    def fake_collect_prometheus(url: str, metric_prefix: str = "day8_", *, timeout: float = 5.0):
+        requested.append(url)
+        return targets[url]
+
+    monkeypatch.setattr(collect_metrics_module, "collect_prometheus_metrics", fake_collect_prometheus)
+
+    exit_code = collect_metrics_module.main(
+        [
+            "--prom-url",
+            "http://a.test/metrics",
+            "--prom-url",
+            "http://b.test/metrics",
+        ]
+    )
+    assert exit_code == 0
+    assert requested == ["http://a.test/metrics", "http://b.test/metrics"]
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["prometheus"] == {
+        "day8_app_boot_timestamp": 20.0,
+        "day8_jobs_processed_total": 12.0,
+        "day8_jobs_failed_total": 1.0,
+        "day8_healthz_request_total": 2.0,
+        "day8_latency_seconds_quantile_0.5": 0.3,
+        'day8_latency_seconds_bucket{le="0.5"}': 6.0,
+        'day8_latency_seconds_bucket{le="+Inf"}': 8.0,
+    }
+    assert payload["histograms"]["day8_latency_seconds"]["count"] == 8.0
+    assert payload["histograms"]["day8_latency_seconds"]["p50"] == pytest.approx(0.5 * 4.0 / 6.0)
+
+
+def test_main_ndjson_output_appends_compact_lines(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    collect_metrics_module,
+) -> None:
+    prom_metrics: Dict[str, float] = {
+        "day8_app_boot_timestamp": 1.0,
+        "day8_jobs_processed_total": 5.0,
+        "day8_jobs_failed_total": 2.0,
+        "day8_healthz_request_total": 3.0,
+    }
+    _configure_collectors(monkeypatch, collect_metrics_module, prom_metrics, {})
+    monkeypatch.setattr(collect_metrics_module.time, "time", lambda: 1700000000.0)
+
+    output_path = tmp_path / "metrics.ndjson"
+    args = _prepare_args(tmp_path, ["--output-format", "ndjson", "--output", str(output_path)])
+    assert collect_metrics_module.main(args) == 0
+    assert collect_metrics_module.main(args) == 0
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert capsys.readouterr().out.splitlines() == lines
+    record = json.loads(lines[0])
+    assert record["timestamp"] == 1700000000.0
+    assert record["metrics"] == prom_metrics
+    assert " " not in lines[0]
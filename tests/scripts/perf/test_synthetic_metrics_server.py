@@ -0,0 +1,72 @@
+"""Tests for scripts.perf.synthetic_metrics_server."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import threading
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+PERF_DIR = Path(__file__).resolve().parents[3] / "scripts" / "perf"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(f"scripts.perf.{name}", PERF_DIR / f"{name}.py")
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Failed to load {name} module")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules.setdefault(f"scripts.perf.{name}", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def server_module():
+    return _load("synthetic_metrics_server")
+
+
+def test_render_exposition_is_deterministic_and_counts_samples(server_module) -> None:
+    config = server_module.SyntheticConfig(series=4, histograms=2, summaries=1, noise=3, replicas=2)
+
+    payload = server_module.render_exposition(config)
+
+    assert payload == server_module.render_exposition(config)
+    samples = [line for line in payload.splitlines() if line and not line.startswith("#")]
+    assert len(samples) == server_module.sample_count(config)
+
+
+def test_render_exposition_parses_with_collector(server_module) -> None:
+    collect_metrics = _load("collect_metrics")
+    config = server_module.SyntheticConfig(series=2, histograms=1, summaries=1, noise=2, replicas=3)
+
+    first = collect_metrics.parse_prometheus_text(server_module.render_exposition(config, scrape=1))
+    second = collect_metrics.parse_prometheus_text(server_module.render_exposition(config, scrape=2))
+
+    assert first["day8_jobs_processed_total"] == pytest.approx(303.0)
+    assert second["day8_jobs_processed_total"] == pytest.approx(603.0)
+    assert not any(key.startswith("process_noise") for key in first)
+    assert first['day8_synthetic_latency_0_seconds_bucket{le="+Inf",path="/api/0"}'] == 600.0
+
+
+def test_server_serves_metrics_and_health(server_module) -> None:
+    config = server_module.SyntheticConfig(series=1, histograms=0, summaries=0, noise=0, replicas=1)
+    server = server_module.build_server(config, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            first = response.read().decode("utf-8")
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            second = response.read().decode("utf-8")
+        with urllib.request.urlopen(f"http://{host}:{port}/healthz", timeout=5) as response:
+            assert response.status == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+    assert "day8_jobs_processed_total" in first
+    assert first != second
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import importlib.util
+import json
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import List, Tuple
 
@@ -191,3 +194,330 @@ def test_warmup_forwards_method_to_send_warmup_request(
         ("health", ("https://api.day8.example/healthz", 2.5)),
         ("warmup", ("https://api.day8.example/warmup", None, 2.5, "PATCH")),
     ]
+
+
+class _WarmupHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    bodies: List[bytes] = []
+
+    def _reply(self, status: int) -> None:
+        payload = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        self._reply(200)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        body = self.rfile.read(length)
+        type(self).bodies.append(body)
+        self._reply(500 if body == b'{"fail":true}' else 200)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture
+def warmup_server():
+    _WarmupHandler.bodies = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WarmupHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_wait_for_health_retries_with_exponential_backoff(
+    monkeypatch: pytest.MonkeyPatch, warmup_module
+) -> None:
+    attempts: List[str] = []
+    delays: List[float] = []
+
+    def flaky_health(url: str, timeout: float = 5.0) -> None:
+        attempts.append(url)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("not ready")
+
+    monkeypatch.setattr(warmup_module, "perform_health_check", flaky_health)
+
+    count = warmup_module.wait_for_health(
+        "https://api.day8.example/healthz", retries=4, backoff=0.25, sleep=delays.append
+    )
+
+    assert count == 3
+    assert delays == [0.25, 0.5]
+
+
+def test_wait_for_health_raises_after_retries(
+    monkeypatch: pytest.MonkeyPatch, warmup_module
+) -> None:
+    def failing_health(url: str, timeout: float = 5.0) -> None:
+        raise ConnectionRefusedError("down")
+
+    monkeypatch.setattr(warmup_module, "perform_health_check", failing_health)
+    delays: List[float] = []
+
+    with pytest.raises(ConnectionRefusedError):
+        warmup_module.wait_for_health(
+            "https://api.day8.example/healthz", retries=2, backoff=1.0, sleep=delays.append
+        )
+
+    assert delays == [1.0, 2.0]
+
+
+def test_split_phases_and_summaries_follow_request_order(warmup_module) -> None:
+    samples = [
+        warmup_module.RequestSample(index, float(index), float(latency), True)
+        for index, latency in enumerate([90, 80, 70, 10, 12, 11])
+    ]
+
+    phases = warmup_module.split_phases(list(reversed(samples)), 2)
+    first, second = (warmup_module.summarize_latencies(group) for group in phases)
+
+    assert first["p50_ms"] == pytest.approx(80.0)
+    assert second["p50_ms"] == pytest.approx(11.0)
+    assert second["max_ms"] == pytest.approx(12.0)
+    assert first["requests"] == 3 and first["errors"] == 0
+
+
+def test_load_warmup_reuses_keep_alive_connections(
+    tmp_path: Path, warmup_module, warmup_server: str
+) -> None:
+    corpus = tmp_path / "corpus.jsonl"
+    corpus.write_text('{"prompt":"a"}\n\n{"prompt":"b"}\n', encoding="utf-8")
+
+    report = warmup_module.load_warmup(
+        f"{warmup_server}/healthz",
+        f"{warmup_server}/warmup",
+        payloads=warmup_module.load_payload_corpus(corpus),
+        concurrency=2,
+        total_requests=20,
+        phases=4,
+    )
+
+    assert report["healthcheck"]["attempts"] == 1
+    assert report["load"]["requests"] == 20
+    assert report["load"]["errors"] == 0
+    assert report["load"]["connections_opened"] <= 2
+    assert [phase["requests"] for phase in report["phases"]] == [5, 5, 5, 5]
+    assert all(phase["p95_ms"] >= phase["p50_ms"] for phase in report["phases"])
+    assert sorted(set(_WarmupHandler.bodies)) == [b'{"prompt":"a"}', b'{"prompt":"b"}']
+
+
+def test_main_reports_errors_with_nonzero_exit(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+    warmup_server: str,
+) -> None:
+    output_path = tmp_path / "warmup.json"
+
+    exit_code = warmup_module.main(
+        [
+            "--healthcheck-url",
+            f"{warmup_server}/healthz",
+            "--warmup-url",
+            f"{warmup_server}/warmup",
+            "--payload",
+            '{"fail":true}',
+            "--requests",
+            "3",
+            "--concurrency",
+            "1",
+            "--output",
+            str(output_path),
+        ]
+    )
+
+    assert exit_code == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["load"]["errors"] == 3
+    assert json.loads(output_path.read_text(encoding="utf-8")) == report
+
+
+@pytest.mark.parametrize("content", [None, "\n  \n"])
+def test_main_rejects_missing_or_empty_corpus(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+    content: str | None,
+) -> None:
+    corpus = tmp_path / "corpus.txt"
+    if content is not None:
+        corpus.write_text(content, encoding="utf-8")
+
+    with pytest.raises(SystemExit) as excinfo:
+        warmup_module.main(
+            [
+                "--healthcheck-url",
+                "http://127.0.0.1:1/healthz",
+                "--warmup-url",
+                "http://127.0.0.1:1/warmup",
+                "--corpus",
+                str(corpus),
+            ]
+        )
+
+    assert excinfo.value.code == 2
+    assert "--corpus" in capsys.readouterr().err
+
+
+def test_main_reports_unsupported_url_without_traceback(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+) -> None:
+    monkeypatch.setattr(warmup_module, "perform_health_check", lambda url, timeout=5.0: None)
+
+    exit_code = warmup_module.main(
+        [
+            "--healthcheck-url",
+            "http://127.0.0.1:1/healthz",
+            "--warmup-url",
+            "ftp://127.0.0.1/warmup",
+            "--requests",
+            "1",
+        ]
+    )
+
+    assert exit_code == 1
+    assert "Unsupported warmup URL" in capsys.readouterr().err
+
+
+def test_is_converged_requires_consecutive_stable_checks(warmup_module) -> None:
+    assert not warmup_module.is_converged([100.0, 50.0, 40.0], tolerance=0.1, stable_checks=2)
+    assert warmup_module.is_converged([100.0, 41.0, 40.0, 39.0], tolerance=0.1, stable_checks=2)
+    assert not warmup_module.is_converged([40.0, 39.0], tolerance=0.1, stable_checks=2)
+
+
+def _fake_batches(warmup_module, latencies: List[float], failures: frozenset[int] = frozenset()):
+    remaining = list(latencies)
+    sent = [0]
+
+    def fake_run_load(url: str, *, total_requests: int, **_kwargs: object):
+        batch = []
+        for index in range(min(total_requests, len(remaining))):
+            ok = sent[0] not in failures
+            sent[0] += 1
+            batch.append(warmup_module.RequestSample(index, 0.0, remaining.pop(0), ok))
+        return batch
+
+    return fake_run_load
+
+
+def test_adaptive_warmup_stops_when_rolling_p95_stabilises(
+    monkeypatch: pytest.MonkeyPatch, warmup_module
+) -> None:
+    latencies = [500.0] * 10 + [200.0] * 10 + [50.0] * 200
+    monkeypatch.setattr(warmup_module, "wait_for_health", lambda url, **_kwargs: 2)
+    monkeypatch.setattr(warmup_module, "run_load", _fake_batches(warmup_module, latencies))
+
+    report = warmup_module.adaptive_warmup(
+        "https://api.day8.example/healthz",
+        "https://api.day8.example/warmup",
+        window=10,
+        check_every=10,
+        stable_checks=2,
+        tolerance=0.05,
+        pool=object(),
+    )
+
+    assert report["converged"] is True
+    assert report["healthcheck"] == {"attempts": 2}
+    assert report["requests"] == 50
+    assert [point["rolling_p95_ms"] for point in report["curve"]] == [500.0, 200.0, 50.0, 50.0, 50.0]
+    assert report["final_p95_ms"] == 50.0
+
+
+def _adaptive_main_with_failures(warmup_module, monkeypatch: pytest.MonkeyPatch, failures: frozenset[int]) -> int:
+    monkeypatch.setattr(warmup_module, "wait_for_health", lambda url, **_kwargs: 1)
+    monkeypatch.setattr(warmup_module, "run_load", _fake_batches(warmup_module, [50.0] * 200, failures))
+    return warmup_module.main(
+        [
+            "--healthcheck-url",
+            "https://api.day8.example/healthz",
+            "--warmup-url",
+            "https://api.day8.example/warmup",
+            "--adaptive",
+            "--window",
+            "10",
+            "--check-every",
+            "10",
+            "--stable-checks",
+            "1",
+            "--max-requests",
+            "200",
+        ]
+    )
+
+
+def test_adaptive_warmup_refuses_convergence_while_requests_fail(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+) -> None:
+    # Every other request in the first 40 fails fast; the successes alone look stable.
+    exit_code = _adaptive_main_with_failures(warmup_module, monkeypatch, frozenset(range(0, 40, 2)))
+
+    # Cold-start errors inside the error budget do not fail a converged warmup.
+    assert exit_code == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["converged"] is True
+    assert report["errors"] == 20
+    assert [point["error_rate"] for point in report["curve"]] == [0.5, 0.5, 0.5, 0.0]
+    assert report["requests"] == 50
+
+
+def test_adaptive_warmup_does_not_converge_while_errors_persist(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+) -> None:
+    exit_code = _adaptive_main_with_failures(warmup_module, monkeypatch, frozenset(range(0, 200, 2)))
+
+    assert exit_code == warmup_module.EXIT_NOT_CONVERGED
+    report = json.loads(capsys.readouterr().out)
+    assert report["converged"] is False
+    assert report["errors"] == 100
+
+
+def test_adaptive_warmup_reports_budget_exhaustion(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    warmup_module,
+) -> None:
+    latencies = [float(value) for value in range(100, 0, -1)]
+    monkeypatch.setattr(warmup_module, "wait_for_health", lambda url, **_kwargs: 1)
+    monkeypatch.setattr(warmup_module, "run_load", _fake_batches(warmup_module, latencies))
+
+    exit_code = warmup_module.main(
+        [
+            "--healthcheck-url",
+            "https://api.day8.example/healthz",
+            "--warmup-url",
+            "https://api.day8.example/warmup",
+            "--adaptive",
+            "--window",
+            "5",
+            "--check-every",
+            "5",
+            "--tolerance",
+            "0.01",
+            "--max-requests",
+            "30",
+        ]
+    )
+
+    assert exit_code == warmup_module.EXIT_NOT_CONVERGED
+    report = json.loads(capsys.readouterr().out)
+    assert report["converged"] is False
+    assert report["requests"] == 30
+    assert len(report["curve"]) == 6
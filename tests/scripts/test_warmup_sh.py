@@ -55,3 +55,44 @@ def test_warmup_script_runs_healthcheck_then_warmup(tmp_path: Path) -> None:
     assert warmup_call[-1] == "https://api.example/warmup"
     assert "--data" in warmup_call
     assert "-X" in warmup_call or "--request" in warmup_call
+
+
+def test_warmup_script_adaptive_mode_delegates_to_python(tmp_path: Path) -> None:
+    log_path = tmp_path / "python_calls.jsonl"
+    python_stub = tmp_path / "python-stub"
+    python_stub.write_text(
+        "#!/usr/bin/env python3\n"
+        "import json, os, sys\n"
+        "from pathlib import Path\n"
+        "log_path = Path(os.environ['WARMUP_LOG'])\n"
+        "with log_path.open('a', encoding='utf-8') as fh:\n"
+        "    json.dump(sys.argv[1:], fh)\n"
+        "    fh.write('\\n')\n"
+        "sys.exit(3)\n",
+        encoding="utf-8",
+    )
+    python_stub.chmod(python_stub.stat().st_mode | stat.S_IEXEC)
+
+    env = {
+        **os.environ,
+        "PYTHON": str(python_stub),
+        "WARMUP_LOG": str(log_path),
+        "DAY8_API_HEALTHCHECK_URL": "https://api.example/healthz",
+        "DAY8_API_HEALTHCHECK_TIMEOUT": "7",
+        "DAY8_API_WARMUP_URL": "https://api.example/warmup",
+        "DAY8_API_WARMUP_PAYLOAD": "{\"ping\":\"warmup\"}",
+        "DAY8_API_WARMUP_ADAPTIVE": "1",
+        "DAY8_API_WARMUP_TOLERANCE": "0.05",
+        "DAY8_API_WARMUP_REPORT": str(tmp_path / "warmup.json"),
+    }
+
+    result = subprocess.run([str(SCRIPT_PATH)], check=False, env=env)
+
+    assert result.returncode == 3
+    (call,) = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert call[0] == str(SCRIPT_PATH.parent / "perf" / "warmup.py")
+    assert "--adaptive" in call
+    assert call[call.index("--tolerance") + 1] == "0.05"
+    assert call[call.index("--health-timeout") + 1] == "7"
+    assert call[call.index("--payload") + 1] == "{\"ping\":\"warmup\"}"
+    assert call[call.index("--output") + 1] == str(tmp_path / "warmup.json")
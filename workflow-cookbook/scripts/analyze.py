@@ -2,15 +2,38 @@ from __future__ import annotations
 
 import argparse
 import ast
+import bisect
+import copy
 import datetime
+import functools
+import hashlib
+import heapq
+import importlib
+import importlib.util
 import logging
 import json
 import math
-import statistics
+import os
 import sys
+import tempfile
+import threading
+from array import array
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Final, Sequence
+from types import ModuleType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Final,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+)
 
 StatusMap = dict[str, set[str]]
 
@@ -27,9 +50,71 @@ REPORT: Path = DEFAULT_REPORT
 ISSUE_OUT: Path = DEFAULT_ISSUE_OUT
 REFLECTION_MANIFEST: Path = DEFAULT_REFLECTION_MANIFEST
 
+INDEX_SUFFIX: Final[str] = ".idx"
+INDEX_MAGIC: Final[bytes] = b"D8RUNS"
+INDEX_VERSION: Final[int] = 2
+INDEX_DIGEST_BYTES: Final[int] = 4096
+CHECKPOINT_SUFFIX: Final[str] = ".checkpoint.json"
+CHECKPOINT_VERSION: Final[int] = 2
+PER_TEST_REPORT_LIMIT: Final[int] = 20
+BASELINE_VERSION: Final[int] = 2
+DEFAULT_JOBS: Final[int] = min(8, os.cpu_count() or 1)
+REGRESSION_Z_THRESHOLD: Final[float] = 3.0
+REGRESSION_MIN_BASELINE_RUNS: Final[int] = 5
+REGRESSION_MIN_DELTA_MS: Final[int] = 20
+CHANGE_POINT_MIN_SEGMENT: Final[int] = 3
+SLOWEST_REPORT_LIMIT: Final[int] = 5
+FLAKY_HALF_LIFE_RUNS: Final[float] = 20.0
+FLAKY_MIN_RUNS: Final[int] = 2
+FLAKY_REPORT_LIMIT: Final[int] = 10
+FLAKY_LOOKBACK_RUNS: Final[int] = 8
+
 logger = logging.getLogger(__name__)
 
 
+
+def _load_sibling_module(name: str) -> ModuleType:
+    """Import a module living next to this script however the script was loaded.
+
+    The reflection workflow imports ``scripts.analyze``, CI runs the file
+    directly, and the repository root ``scripts`` package loads it by path.
+    """
+    if __package__:
+        try:
+            return importlib.import_module(f".{name}", __package__)
+        except ImportError:
+            pass
+    try:
+        return importlib.import_module(name)
+    except ModuleNotFoundError:
+        pass
+    qualified = f"_workflow_cookbook_{name}"
+    existing = sys.modules.get(qualified)
+    if existing is not None:
+        return existing
+    spec = importlib.util.spec_from_file_location(
+        qualified, Path(__file__).resolve().with_name(f"{name}.py")
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Failed to load sibling module {name}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[qualified] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(qualified, None)
+        raise
+    return module
+
+
+if TYPE_CHECKING:
+    import percentiles as percentile_engine
+    from percentiles import DurationSketch
+else:
+    percentile_engine = _load_sibling_module("percentiles")
+    DurationSketch = percentile_engine.DurationSketch
+
+
 def _resolve_under_root(root: Path, default: Path) -> Path:
     if default == DEFAULT_BASE_DIR:
         return root
@@ -266,6 +351,102 @@ def _fallback_read_targets_first_log(text: str) -> str | None:
     return None
 
 
+def _fallback_list_items(candidate_text: str) -> list[str]:
+    try:
+        parsed = ast.literal_eval(candidate_text)
+    except Exception:
+        stripped = candidate_text.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            items = (_normalize_text_token(item) for item in stripped[1:-1].split(","))
+            return [item for item in items if item]
+        normalized = _normalize_text_token(candidate_text)
+        return [normalized] if normalized else []
+    values = parsed if isinstance(parsed, list) else [parsed]
+    normalized_values = (_normalize_python_string(item) for item in values)
+    return [item for item in normalized_values if item]
+
+
+def _fallback_read_targets(text: str) -> list[dict[str, Any]]:
+    targets: list[dict[str, Any]] = []
+    in_targets = False
+    current: dict[str, Any] | None = None
+    item_indent: int | None = None
+    collecting_logs = False
+    logs_indent = 0
+    for raw_line in text.splitlines():
+        stripped = raw_line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(raw_line) - len(raw_line.lstrip(" "))
+        if not in_targets:
+            if stripped.startswith("targets:") and indent == 0:
+                in_targets = True
+            continue
+        if indent == 0:
+            break
+        if collecting_logs and current is not None:
+            if (
+                stripped.startswith("-")
+                and indent >= logs_indent
+                and item_indent is not None
+                and indent > item_indent
+            ):
+                value = _normalize_text_token(_strip_inline_comment(stripped[1:].strip()))
+                if value:
+                    current["logs"].append(value)
+                continue
+            collecting_logs = False
+        if stripped.startswith("-") and (item_indent is None or indent <= item_indent):
+            item_indent = indent
+            current = {"logs": []}
+            targets.append(current)
+            stripped = stripped[1:].strip()
+            indent += 2
+            if not stripped:
+                continue
+        if current is None:
+            continue
+        key, separator, raw_value = stripped.partition(":")
+        if not separator:
+            continue
+        value_text = _strip_inline_comment(raw_value.strip())
+        if key.strip() == "name":
+            name = _normalize_text_token(value_text)
+            if name:
+                current["name"] = name
+        elif key.strip() == "logs":
+            if value_text:
+                current["logs"].extend(_fallback_list_items(value_text))
+            else:
+                collecting_logs = True
+                logs_indent = indent
+    return targets
+
+
+def _manifest_targets(manifest: dict[str, Any] | None) -> list[tuple[str, list[str]]]:
+    """Return ``(name, logs)`` for every manifest target that lists log files."""
+    raw_targets = manifest.get("targets") if manifest else None
+    if isinstance(raw_targets, dict):
+        targets: list[Any] = [raw_targets]
+    elif isinstance(raw_targets, list):
+        targets = raw_targets
+    else:
+        return []
+    resolved: list[tuple[str, list[str]]] = []
+    for index, target in enumerate(targets):
+        if not isinstance(target, dict):
+            continue
+        logs_value = target.get("logs")
+        values = logs_value if isinstance(logs_value, list) else [logs_value]
+        logs = [item.strip() for item in values if isinstance(item, str) and item.strip()]
+        if not logs:
+            continue
+        raw_name = target.get("name")
+        name = str(raw_name).strip() if raw_name is not None and str(raw_name).strip() else ""
+        resolved.append((name or f"target-{index + 1}", logs))
+    return resolved
+
+
 def _manifest_first_log(manifest: dict[str, Any]) -> str | None:
     raw_targets = manifest.get("targets")
     if isinstance(raw_targets, dict):
@@ -308,23 +489,24 @@ def _fallback_manifest_from_text(
     }
     first_log = _fallback_read_targets_first_log(text)
     if first_log:
-        manifest["targets"] = [{"logs": [first_log]}]
+        targets = _fallback_read_targets(text)
+        # Keep the established first-log resolution authoritative.
+        if _manifest_first_log({"targets": targets}) != first_log:
+            targets = [{"logs": [first_log]}]
+        manifest["targets"] = targets
     return manifest
 
 
-def load_reflection_manifest(
-    path: Path | None = None,
+_MANIFEST_CACHE: dict[tuple[Any, ...], dict[str, Any]] = {}
+_MANIFEST_CACHE_LOCK = threading.Lock()
+
+
+def _parse_reflection_manifest(
+    text: str,
     *,
-    default_suggest_issues: bool = True,
-    default_include_why: bool = True,
+    default_suggest_issues: bool,
+    default_include_why: bool,
 ) -> dict[str, Any]:
-    target = path or REFLECTION_MANIFEST
-    if not target.exists():
-        return {}
-    try:
-        text = target.read_text(encoding="utf-8")
-    except OSError:
-        return {}
     try:
         import yaml  # type: ignore
     except ModuleNotFoundError:
@@ -342,6 +524,59 @@ def load_reflection_manifest(
     return {}
 
 
+def _yaml_available() -> bool:
+    return importlib.util.find_spec("yaml") is not None
+
+
+def clear_manifest_cache() -> None:
+    with _MANIFEST_CACHE_LOCK:
+        _MANIFEST_CACHE.clear()
+
+
+def load_reflection_manifest(
+    path: Path | None = None,
+    *,
+    default_suggest_issues: bool = True,
+    default_include_why: bool = True,
+) -> dict[str, Any]:
+    """Return the parsed manifest, re-parsing only when the file changes.
+
+    Parsed manifests are cached by path, mtime and size (plus the parser in
+    use and the fallback defaults); callers receive a private copy.
+    """
+    target = path or REFLECTION_MANIFEST
+    try:
+        stat = target.stat()
+    except OSError:
+        return {}
+    key = (
+        str(target.resolve()),
+        stat.st_mtime_ns,
+        stat.st_size,
+        _yaml_available(),
+        default_suggest_issues,
+        default_include_why,
+    )
+    with _MANIFEST_CACHE_LOCK:
+        cached = _MANIFEST_CACHE.get(key)
+    if cached is None:
+        try:
+            text = target.read_text(encoding="utf-8")
+        except OSError:
+            return {}
+        cached = _parse_reflection_manifest(
+            text,
+            default_suggest_issues=default_suggest_issues,
+            default_include_why=default_include_why,
+        )
+        with _MANIFEST_CACHE_LOCK:
+            # Drop entries for older versions of the same file.
+            for stale in [k for k in _MANIFEST_CACHE if k[0] == key[0]]:
+                del _MANIFEST_CACHE[stale]
+            _MANIFEST_CACHE[key] = cached
+    return copy.deepcopy(cached)
+
+
 def load_actions_suggest_issues(
     path: Path | None = None,
     default: bool = True,
@@ -495,13 +730,286 @@ def _resolve_log_path(*, manifest: dict[str, Any] | None) -> Path:
     return fallback
 
 
-def load_results(
-    *, manifest: dict[str, Any] | None = None
-) -> tuple[list[str], list[int], list[str], StatusMap]:
-    tests: list[str] = []
-    durs: list[int] = []
-    fails: list[str] = []
-    statuses: StatusMap = {}
+def _parse_timestamp(value: object) -> float:
+    """Return ``value`` as epoch seconds, or NaN when it is missing or invalid."""
+    if isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.strip():
+        text = value.strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        try:
+            parsed = datetime.datetime.fromisoformat(text)
+        except ValueError:
+            return math.nan
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.UTC)
+        return parsed.timestamp()
+    return math.nan
+
+
+def _parse_record(obj: dict[str, Any]) -> tuple[Any, object, int, float]:
+    value = obj.get("duration_ms")
+    duration = int(value) if isinstance(value, (int, float)) else 0
+    return obj.get("name", "unknown"), obj.get("status"), duration, _parse_timestamp(obj.get("ts"))
+
+
+class TestRunStore:
+    """Columnar store of test runs parsed from the reflection JSONL log.
+
+    Test names and statuses are interned once; per-run name ids, status ids and
+    durations live in compact ``array`` columns so the log is parsed a single
+    time per invocation and can be persisted as a binary sidecar.
+    """
+
+    NO_STATUS: Final[int] = -1
+
+    def __init__(self) -> None:
+        self.names: list[Any] = []
+        self.status_names: list[str] = []
+        self.name_ids = array("I")
+        self.status_ids = array("i")
+        self.durations = array("q")
+        self.timestamps = array("d")
+        self.source_offset = 0
+        self._name_index: dict[Any, int] = {}
+        self._status_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.name_ids)
+
+    def _intern_name(self, name: Any) -> int:
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_index[name] = name_id
+            self.names.append(name)
+        return name_id
+
+    def _intern_status(self, status: str) -> int:
+        status_id = self._status_index.get(status)
+        if status_id is None:
+            status_id = len(self.status_names)
+            self._status_index[status] = status_id
+            self.status_names.append(status)
+        return status_id
+
+    def append(
+        self, name: Any, status: object, duration_ms: int, timestamp: float = math.nan
+    ) -> None:
+        self.name_ids.append(self._intern_name(name))
+        self.status_ids.append(
+            self.NO_STATUS if status is None else self._intern_status(str(status))
+        )
+        self.durations.append(duration_ms)
+        self.timestamps.append(timestamp)
+
+    def append_record(self, obj: dict[str, Any]) -> None:
+        self.append(*_parse_record(obj))
+
+    def extend_from_lines(self, handle: IO[bytes]) -> bool:
+        """Append records from ``handle``; return whether the input ended on a newline."""
+        complete = True
+        for raw_line in handle:
+            self.source_offset += len(raw_line)
+            complete = raw_line.endswith(b"\n")
+            line = raw_line.strip()
+            if line:
+                self.append_record(json.loads(line))
+        return complete
+
+    def fail_status_id(self) -> int | None:
+        return self._status_index.get("fail")
+
+    def failed_name_ids(self) -> set[int]:
+        fail_id = self.fail_status_id()
+        if fail_id is None:
+            return set()
+        return {
+            name_id
+            for name_id, status_id in zip(self.name_ids, self.status_ids)
+            if status_id == fail_id
+        }
+
+    def tests(self) -> list[Any]:
+        names = self.names
+        return [names[name_id] for name_id in self.name_ids]
+
+    def failures(self) -> list[Any]:
+        fail_id = self.fail_status_id()
+        if fail_id is None:
+            return []
+        names = self.names
+        return [
+            names[name_id]
+            for name_id, status_id in zip(self.name_ids, self.status_ids)
+            if status_id == fail_id
+        ]
+
+    def status_map(self) -> StatusMap:
+        per_name: list[set[str]] = [set() for _ in self.names]
+        status_names = self.status_names
+        for name_id, status_id in zip(self.name_ids, self.status_ids):
+            if status_id != self.NO_STATUS:
+                per_name[name_id].add(status_names[status_id])
+        return dict(zip(self.names, per_name))
+
+    def extend(self, other: "TestRunStore") -> None:
+        """Append every run of ``other``, re-interning its names and statuses."""
+        name_map = [self._intern_name(name) for name in other.names]
+        status_map = [self._intern_status(status) for status in other.status_names]
+        self.name_ids.extend(name_map[name_id] for name_id in other.name_ids)
+        self.status_ids.extend(
+            self.NO_STATUS if status_id == self.NO_STATUS else status_map[status_id]
+            for status_id in other.status_ids
+        )
+        self.durations.extend(other.durations)
+        self.timestamps.extend(other.timestamps)
+
+    @classmethod
+    def combine(cls, stores: Iterable["TestRunStore"]) -> "TestRunStore":
+        combined = cls()
+        for store in stores:
+            combined.extend(store)
+        return combined
+
+    def as_results(self) -> tuple[list[Any], list[int], list[Any], StatusMap]:
+        return self.tests(), self.durations.tolist(), self.failures(), self.status_map()
+
+    def to_bytes(self, *, prefix_digest: str) -> bytes:
+        header = json.dumps(
+            {
+                "version": INDEX_VERSION,
+                "byteorder": sys.byteorder,
+                "source_offset": self.source_offset,
+                "prefix_digest": prefix_digest,
+                "count": len(self),
+                "names": self.names,
+                "status_names": self.status_names,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        return b"".join(
+            (
+                INDEX_MAGIC,
+                len(header).to_bytes(4, "little"),
+                header,
+                self.name_ids.tobytes(),
+                self.status_ids.tobytes(),
+                self.durations.tobytes(),
+                self.timestamps.tobytes(),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> tuple["TestRunStore", dict[str, Any]]:
+        if not payload.startswith(INDEX_MAGIC):
+            raise ValueError("not a test run index")
+        cursor = len(INDEX_MAGIC)
+        header_length = int.from_bytes(payload[cursor : cursor + 4], "little")
+        cursor += 4
+        header = json.loads(payload[cursor : cursor + header_length].decode("utf-8"))
+        cursor += header_length
+        if header.get("version") != INDEX_VERSION or header.get("byteorder") != sys.byteorder:
+            raise ValueError("incompatible test run index")
+        store = cls()
+        for name in header["names"]:
+            store._intern_name(name)
+        for status in header["status_names"]:
+            store._intern_status(status)
+        count = int(header["count"])
+        for column in (store.name_ids, store.status_ids, store.durations, store.timestamps):
+            size = count * column.itemsize
+            column.frombytes(payload[cursor : cursor + size])
+            cursor += size
+        if cursor != len(payload):
+            raise ValueError("truncated test run index")
+        store.source_offset = int(header["source_offset"])
+        return store, header
+
+
+def _index_path_for(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+
+def _prefix_digest(log_path: Path, length: int) -> str:
+    """Fingerprint the first ``length`` bytes of ``log_path`` by their head and tail.
+
+    Hashing the bytes just before ``length`` as well as the head catches logs
+    rewritten past the first few kilobytes without reading the whole prefix.
+    """
+    digest = hashlib.sha256(str(length).encode("ascii"))
+    with log_path.open("rb") as handle:
+        digest.update(handle.read(min(length, INDEX_DIGEST_BYTES)))
+        tail_start = max(length - INDEX_DIGEST_BYTES, INDEX_DIGEST_BYTES)
+        if tail_start < length:
+            handle.seek(tail_start)
+            digest.update(handle.read(length - tail_start))
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _load_index(log_path: Path, index_path: Path) -> TestRunStore | None:
+    try:
+        store, header = TestRunStore.from_bytes(index_path.read_bytes())
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    size = log_path.stat().st_size
+    if store.source_offset > size:
+        return None
+    if header.get("prefix_digest") != _prefix_digest(log_path, store.source_offset):
+        return None
+    return store
+
+
+def build_test_run_store(log_path: Path, *, use_index: bool = False) -> TestRunStore:
+    """Parse ``log_path`` into a :class:`TestRunStore`.
+
+    With ``use_index`` a binary sidecar next to the log is reused while the log
+    is unchanged and extended with only the appended lines when it grows; it is
+    rebuilt from scratch when the log was truncated or rewritten.
+    """
+    if not log_path.exists():
+        return TestRunStore()
+    index_path = _index_path_for(log_path)
+    store = _load_index(log_path, index_path) if use_index else None
+    previous_offset = store.source_offset if store is not None else None
+    if store is None:
+        store = TestRunStore()
+    with log_path.open("rb") as handle:
+        handle.seek(store.source_offset)
+        complete = store.extend_from_lines(handle)
+    # Only persist offsets on a line boundary so a half-written line is re-read.
+    if use_index and complete and store.source_offset != previous_offset:
+        digest = _prefix_digest(log_path, store.source_offset)
+        try:
+            _write_atomic(index_path, store.to_bytes(prefix_digest=digest))
+        except OSError as exc:
+            logger.warning("Failed to write test run index %s: %s", index_path, exc)
+    return store
+
+
+def load_test_runs(
+    *, manifest: dict[str, Any] | None = None, use_index: bool = False
+) -> TestRunStore:
     manifest_data = (
         load_reflection_manifest(
             default_suggest_issues=True,
@@ -511,63 +1019,862 @@ def load_results(
         else manifest
     )
     log_path = _resolve_log_path(manifest=manifest_data)
+    return build_test_run_store(log_path, use_index=use_index)
+
+
+def load_results(
+    *, manifest: dict[str, Any] | None = None
+) -> tuple[list[str], list[int], list[str], StatusMap]:
+    return load_test_runs(manifest=manifest).as_results()
+
+
+class ReflectionStats(NamedTuple):
+    total: int
+    fail_counts: dict[Any, int]
+    statuses: StatusMap
+    duration_p95: int
+    duration_percentiles: Mapping[float, float] | None = None
+    per_test_percentiles: dict[Any, dict[float, int]] | None = None
+    per_test_runs: dict[Any, int] | None = None
+
+    @property
+    def failures(self) -> int:
+        return sum(self.fail_counts.values())
+
+
+class ReflectionAggregates:
+    """Running aggregates over the reflection log, resumable from a byte offset."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.fail_counts: dict[Any, int] = {}
+        self.statuses: StatusMap = {}
+        self.sketch = DurationSketch()
+        self.test_sketches: dict[Any, DurationSketch] = {}
+        self.source_offset = 0
+
+    def observe(
+        self, name: Any, status: object, duration_ms: int, timestamp: float = math.nan
+    ) -> None:
+        self.total += 1
+        self.sketch.add(duration_ms)
+        test_sketch = self.test_sketches.get(name)
+        if test_sketch is None:
+            test_sketch = self.test_sketches[name] = DurationSketch()
+        test_sketch.add(duration_ms)
+        entry_statuses = self.statuses.setdefault(name, set())
+        if status is not None:
+            entry_statuses.add(str(status))
+            if status == "fail":
+                self.fail_counts[name] = self.fail_counts.get(name, 0) + 1
+
+    def extend_from_lines(self, handle: IO[bytes]) -> bool:
+        complete = True
+        for raw_line in handle:
+            self.source_offset += len(raw_line)
+            complete = raw_line.endswith(b"\n")
+            line = raw_line.strip()
+            if line:
+                self.observe(*_parse_record(json.loads(line)))
+        return complete
+
+    def stats(
+        self, pcts: Sequence[float] = percentile_engine.DEFAULT_PERCENTILES
+    ) -> ReflectionStats:
+        def _rounded(sketch: DurationSketch) -> dict[float, int]:
+            return {pct: int(round(value)) for pct, value in sketch.percentiles(pcts).items()}
+
+        return ReflectionStats(
+            total=self.total,
+            fail_counts=dict(self.fail_counts),
+            statuses=self.statuses,
+            duration_p95=int(round(self.sketch.quantile(0.95))),
+            duration_percentiles=_rounded(self.sketch),
+            per_test_percentiles={
+                name: _rounded(sketch) for name, sketch in self.test_sketches.items()
+            },
+            per_test_runs={name: sketch.count for name, sketch in self.test_sketches.items()},
+        )
+
+    def merge(self, other: "ReflectionAggregates") -> None:
+        self.total += other.total
+        for name, count in other.fail_counts.items():
+            self.fail_counts[name] = self.fail_counts.get(name, 0) + count
+        for name, values in other.statuses.items():
+            self.statuses.setdefault(name, set()).update(values)
+        self.sketch.merge(other.sketch)
+        for name, sketch in other.test_sketches.items():
+            existing = self.test_sketches.get(name)
+            if existing is None:
+                existing = self.test_sketches[name] = DurationSketch()
+            existing.merge(sketch)
+
+    def to_dict(self) -> dict[str, Any]:
+        # Names are JSON object keys only when they are strings, so keep pairs.
+        return {
+            "total": self.total,
+            "fail_counts": [[name, count] for name, count in self.fail_counts.items()],
+            "statuses": [[name, sorted(values)] for name, values in self.statuses.items()],
+            "sketch": self.sketch.to_dict(),
+            "test_sketches": [
+                [name, sketch.to_dict()] for name, sketch in self.test_sketches.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ReflectionAggregates":
+        aggregates = cls()
+        aggregates.total = int(data["total"])
+        aggregates.fail_counts = {name: int(count) for name, count in data["fail_counts"]}
+        aggregates.statuses = {name: set(values) for name, values in data["statuses"]}
+        aggregates.sketch = DurationSketch.from_dict(data["sketch"])
+        aggregates.test_sketches = {
+            name: DurationSketch.from_dict(sketch) for name, sketch in data["test_sketches"]
+        }
+        return aggregates
+
+
+def _checkpoint_path_for(log_path: Path) -> Path:
+    return log_path.with_name(log_path.name + CHECKPOINT_SUFFIX)
+
+
+def _load_checkpoint(log_path: Path, checkpoint_path: Path) -> ReflectionAggregates | None:
+    try:
+        data = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+        return None
+    if data.get("log") != str(log_path):
+        return None
+    try:
+        offset = int(data["offset"])
+        aggregates = ReflectionAggregates.from_dict(data["aggregates"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if offset > log_path.stat().st_size:
+        return None
+    if data.get("prefix_digest") != _prefix_digest(log_path, offset):
+        return None
+    aggregates.source_offset = offset
+    return aggregates
+
+
+class TargetLogs(NamedTuple):
+    name: str
+    logs: list[Path]
+
+
+def resolve_targets(manifest: dict[str, Any] | None) -> list[TargetLogs]:
+    """Resolve every manifest target to its existing log files under ``BASE_DIR``."""
+    merged: dict[str, list[Path]] = {}
+    for name, logs in _manifest_targets(manifest):
+        paths = merged.setdefault(name, [])
+        for raw in logs:
+            candidate = Path(raw)
+            if not candidate.is_absolute():
+                candidate = BASE_DIR / candidate
+            if not candidate.exists():
+                logger.warning("Log %s for target %s does not exist", candidate, name)
+                continue
+            if candidate not in paths:
+                paths.append(candidate)
+    return [TargetLogs(name, paths) for name, paths in merged.items() if paths]
+
+
+class ReflectionSettings(NamedTuple):
+    """Every ``reflection.yaml`` setting the CLI needs, resolved in one pass."""
+
+    manifest: dict[str, Any]
+    report_path: Path
+    include_why: bool
+    suggest_issues: bool
+    targets: list[TargetLogs]
+    log_path: Path
+
+
+def resolve_reflection_settings(manifest: dict[str, Any] | None = None) -> ReflectionSettings:
+    manifest_data = manifest if manifest is not None else load_reflection_manifest()
+    return ReflectionSettings(
+        manifest=manifest_data,
+        report_path=load_report_output_path(manifest=manifest_data),
+        include_why=load_report_include_why(manifest=manifest_data),
+        suggest_issues=load_actions_suggest_issues(manifest=manifest_data),
+        targets=resolve_targets(manifest_data),
+        log_path=_resolve_log_path(manifest=manifest_data),
+    )
+
+
+_T = TypeVar("_T")
+
+
+def _map_concurrently(func: Callable[[Path], _T], paths: Sequence[Path], jobs: int) -> list[_T]:
+    if len(paths) <= 1 or jobs <= 1:
+        return [func(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+        return list(pool.map(func, paths))
+
+
+def load_log_stores(
+    paths: Sequence[Path], *, use_index: bool = False, jobs: int = DEFAULT_JOBS
+) -> dict[Path, TestRunStore]:
+    """Parse several logs concurrently, one store per log file."""
+    stores = _map_concurrently(
+        lambda path: build_test_run_store(path, use_index=use_index), paths, jobs
+    )
+    return dict(zip(paths, stores))
+
+
+def _unique_target_logs(targets: Sequence[TargetLogs]) -> list[Path]:
+    paths: list[Path] = []
+    for target in targets:
+        paths.extend(path for path in target.logs if path not in paths)
+    return paths
+
+
+def update_aggregates(
+    log_path: Path, checkpoint_path: Path | None = None
+) -> ReflectionAggregates:
+    """Fold lines appended since the last checkpoint into the stored aggregates.
+
+    The checkpoint records the byte offset it covers and a digest of the bytes
+    before it; a truncated or rewritten log triggers a full recount.
+    """
     if not log_path.exists():
-        return tests, durs, fails, statuses
-    with log_path.open() as f:
-        for line in f:
-            line = line.strip()
+        return ReflectionAggregates()
+    target = checkpoint_path or _checkpoint_path_for(log_path)
+    aggregates = _load_checkpoint(log_path, target) or ReflectionAggregates()
+    previous_offset = aggregates.source_offset
+    with log_path.open("rb") as handle:
+        handle.seek(aggregates.source_offset)
+        complete = aggregates.extend_from_lines(handle)
+    if complete and aggregates.source_offset != previous_offset:
+        payload = {
+            "version": CHECKPOINT_VERSION,
+            "log": str(log_path),
+            "offset": aggregates.source_offset,
+            "prefix_digest": _prefix_digest(log_path, aggregates.source_offset),
+            "aggregates": aggregates.to_dict(),
+        }
+        try:
+            _write_atomic(
+                target,
+                json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            )
+        except OSError as exc:
+            logger.warning("Failed to write reflection checkpoint %s: %s", target, exc)
+    return aggregates
+
+
+def _stats_from_runs(
+    runs: TestRunStore, pcts: Sequence[float] = percentile_engine.DEFAULT_PERCENTILES
+) -> ReflectionStats:
+    durations = runs.durations.tolist()
+    grouped: list[list[int]] = [[] for _ in runs.names]
+    for name_id, duration in zip(runs.name_ids, durations):
+        grouped[name_id].append(duration)
+    return ReflectionStats(
+        total=len(runs),
+        fail_counts=dict(Counter(runs.failures())),
+        statuses=runs.status_map(),
+        duration_p95=p95(durations),
+        duration_percentiles=percentile_engine.summarize(durations, pcts),
+        per_test_percentiles={
+            name: percentile_engine.percentiles(values, pcts)
+            for name, values in zip(runs.names, grouped)
+        },
+        per_test_runs={name: len(values) for name, values in zip(runs.names, grouped)},
+    )
+
+
+def _format_epoch(seconds: float) -> str:
+    return datetime.datetime.fromtimestamp(seconds, datetime.UTC).isoformat()
+
+
+def window_series(
+    runs: TestRunStore,
+    window: datetime.timedelta,
+    *,
+    step: datetime.timedelta | None = None,
+) -> list[dict[str, Any]]:
+    """Compute pass rate, flaky rate and p95 over sliding time windows.
+
+    Runs are ordered once by timestamp and every window is located with a binary
+    search, so each window costs only the runs it contains. Windows start on
+    multiples of ``step`` (default: tumbling windows of ``window``); empty
+    windows are skipped and runs without a timestamp are ignored.
+    """
+    width = window.total_seconds()
+    stride = step.total_seconds() if step is not None else width
+    if width <= 0 or stride <= 0:
+        raise ValueError("window and step must be positive")
+    timestamps = runs.timestamps
+    # Append-only logs are already time ordered, which keeps this sort linear.
+    order = sorted(
+        (index for index, stamp in enumerate(timestamps) if not math.isnan(stamp)),
+        key=timestamps.__getitem__,
+    )
+    stamps = [timestamps[index] for index in order]
+    if not stamps:
+        return []
+    fail_id = runs.fail_status_id()
+    pass_id = runs._status_index.get("pass")
+    series: list[dict[str, Any]] = []
+    start = math.floor((stamps[0] - width) / stride + 1) * stride
+    while True:
+        lo = bisect.bisect_left(stamps, start)
+        if lo == len(stamps):
+            break
+        hi = bisect.bisect_left(stamps, start + width)
+        if hi == lo:
+            # Jump to the first window that contains the next run.
+            start = max(start + stride, math.floor((stamps[lo] - width) / stride + 1) * stride)
+            continue
+        rows = order[lo:hi]
+        failures = 0
+        seen: dict[int, int] = {}
+        durations: list[int] = []
+        for row in rows:
+            status_id = runs.status_ids[row]
+            name_id = runs.name_ids[row]
+            durations.append(runs.durations[row])
+            mask = seen.get(name_id, 0)
+            if status_id == fail_id:
+                failures += 1
+                mask |= 2
+            elif status_id == pass_id:
+                mask |= 1
+            seen[name_id] = mask
+        flaky = sum(1 for mask in seen.values() if mask == 3)
+        series.append(
+            {
+                "start": _format_epoch(start),
+                "end": _format_epoch(start + width),
+                "total": len(rows),
+                "failures": failures,
+                "pass_rate": (len(rows) - failures) / len(rows),
+                "flaky_rate": flaky / len(seen),
+                "duration_p95": p95(durations),
+            }
+        )
+        start += stride
+    return series
+
+
+def p95(values: list[int]) -> int:
+    return int(percentile_engine.percentile(values, 95))
+
+
+class _RunningStats:
+    """Welford running mean/variance of one test's durations."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0) -> None:
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        """Undo a previous :meth:`add` of ``value``."""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        previous_mean = self.mean
+        self.count -= 1
+        self.mean = (previous_mean * (self.count + 1) - value) / self.count
+        self.m2 = max(self.m2 - (value - self.mean) * (value - previous_mean), 0.0)
+
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+def _baseline_states(
+    baseline_path: Path | None, sources: Sequence[tuple[Path, TestRunStore]]
+) -> tuple[dict[Any, _RunningStats], list[tuple[int, int]]]:
+    """Load stored per-test baselines and the combined-row ranges they already cover.
+
+    ``sources`` lists each log with its store in the order they were combined.
+    """
+    if baseline_path is None or not baseline_path.exists():
+        return {}, []
+    try:
+        data = json.loads(baseline_path.read_text(encoding="utf-8"))
+        states = {
+            name: _RunningStats(int(count), float(mean), float(m2))
+            for name, count, mean, m2 in data["tests"]
+        }
+        recorded = {
+            str(entry["log"]): (int(entry["rows"]), int(entry["offset"]), entry["prefix_digest"])
+            for entry in data.get("sources", [])
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("Ignoring unreadable duration baseline %s", baseline_path)
+        return {}, []
+    if data.get("version") != BASELINE_VERSION:
+        return {}, []
+    covered: list[tuple[int, int]] = []
+    start = 0
+    for log_path, runs in sources:
+        previous = recorded.get(str(log_path))
+        if previous is not None and log_path.exists():
+            rows, offset, digest = previous
+            # Rows already folded into the baseline are skipped while the log only grew.
+            if (
+                rows <= len(runs)
+                and offset <= log_path.stat().st_size
+                and digest == _prefix_digest(log_path, offset)
+            ):
+                covered.append((start, start + rows))
+        start += len(runs)
+    return states, covered
+
+
+def save_duration_baseline(
+    path: Path,
+    states: dict[Any, _RunningStats],
+    *,
+    sources: Sequence[tuple[Path, TestRunStore]],
+) -> None:
+    payload: dict[str, Any] = {
+        "version": BASELINE_VERSION,
+        "sources": [
+            {
+                "log": str(log_path),
+                "rows": len(runs),
+                "offset": runs.source_offset,
+                "prefix_digest": (
+                    _prefix_digest(log_path, runs.source_offset) if log_path.exists() else None
+                ),
+            }
+            for log_path, runs in sources
+        ],
+        "tests": [
+            [name, state.count, state.mean, state.m2] for name, state in states.items()
+        ],
+    }
+    _write_atomic(path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def _best_change_point(
+    series: Sequence[int], *, z_threshold: float, min_delta_ms: float
+) -> dict[str, Any] | None:
+    """Return the strongest upward mean shift in ``series`` (two-sample t score)."""
+    n = len(series)
+    if n < 2 * CHANGE_POINT_MIN_SEGMENT:
+        return None
+    prefix = [0.0]
+    prefix_sq = [0.0]
+    for value in series:
+        prefix.append(prefix[-1] + value)
+        prefix_sq.append(prefix_sq[-1] + value * value)
+    best: dict[str, Any] | None = None
+    for split in range(CHANGE_POINT_MIN_SEGMENT, n - CHANGE_POINT_MIN_SEGMENT + 1):
+        before_n, after_n = split, n - split
+        before_mean = prefix[split] / before_n
+        after_mean = (prefix[n] - prefix[split]) / after_n
+        delta = after_mean - before_mean
+        if delta < min_delta_ms:
+            continue
+        before_ss = prefix_sq[split] - before_n * before_mean**2
+        after_ss = (prefix_sq[n] - prefix_sq[split]) - after_n * after_mean**2
+        pooled = max(before_ss + after_ss, 0.0) / (n - 2)
+        scale = math.sqrt(pooled * (1 / before_n + 1 / after_n))
+        score = delta / scale if scale > 0 else math.inf
+        if score < z_threshold or (best is not None and score <= best["_score"]):
+            continue
+        best = {
+            "index": split,
+            "before_mean_ms": round(before_mean, 2),
+            "after_mean_ms": round(after_mean, 2),
+            "_score": score,
+        }
+    if best is None:
+        return None
+    score = best.pop("_score")
+    best["score"] = round(score, 2) if math.isfinite(score) else None
+    return best
+
+
+def _chronological_rows(runs: TestRunStore) -> list[int]:
+    """Return row indices ordered by timestamp, stable for equal or missing ones.
+
+    A row without a timestamp inherits the last one seen before it, so untimed
+    logs keep their file order and combined logs interleave by time.
+    """
+    keys: list[float] = []
+    current = -math.inf
+    for stamp in runs.timestamps:
+        if not math.isnan(stamp):
+            current = stamp
+        keys.append(current)
+    # Already-ordered input (one append-only log) keeps this sort linear.
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def detect_duration_regressions(
+    runs: TestRunStore,
+    *,
+    baseline: dict[Any, _RunningStats] | None = None,
+    covered_ranges: Sequence[tuple[int, int]] = (),
+    z_threshold: float = REGRESSION_Z_THRESHOLD,
+    min_runs: int = REGRESSION_MIN_BASELINE_RUNS,
+    min_delta_ms: float = REGRESSION_MIN_DELTA_MS,
+) -> tuple[dict[str, list[dict[str, Any]]], dict[Any, _RunningStats]]:
+    """Find slow tests and duration regressions in a single pass over ``runs``.
+
+    Each run is scored against the running baseline of the same test (stored
+    baselines first, then earlier runs in the log) before being folded into it;
+    the latest run of every test decides whether it regressed. Runs are visited
+    in timestamp order, so logs combined from several files interleave by
+    time rather than by file. Rows inside
+    ``covered_ranges`` are already part of the stored baseline: they are taken
+    back out before scoring so they are not folded twice, and the report does
+    not depend on how often the same log was analysed. Per-test series are
+    collected in the same pass for upward change-point detection.
+    """
+    states: dict[Any, _RunningStats] = {
+        name: _RunningStats(state.count, state.mean, state.m2)
+        for name, state in (baseline or {}).items()
+    }
+    names = runs.names
+    name_states = [states.setdefault(name, _RunningStats()) for name in names]
+    for start, end in covered_ranges:
+        for name_id, duration in zip(runs.name_ids[start:end], runs.durations[start:end]):
+            name_states[name_id].remove(duration)
+    latest: list[dict[str, Any] | None] = [None] * len(names)
+    series: list[list[int]] = [[] for _ in names]
+    name_ids = runs.name_ids
+    durations = runs.durations
+    for row in _chronological_rows(runs):
+        name_id = name_ids[row]
+        duration = durations[row]
+        series[name_id].append(duration)
+        state = name_states[name_id]
+        record: dict[str, Any] = {
+            "name": names[name_id],
+            "duration_ms": duration,
+            "baseline_mean_ms": round(state.mean, 2) if state.count else None,
+            "baseline_std_ms": round(state.std(), 2) if state.count else None,
+            "baseline_runs": state.count,
+            "z_score": None,
+            "delta_ms": None,
+            "regressed": False,
+        }
+        if state.count >= min_runs:
+            delta = duration - state.mean
+            std = state.std()
+            record["delta_ms"] = round(delta, 2)
+            if std > 0:
+                record["z_score"] = round(delta / std, 2)
+                record["regressed"] = delta / std >= z_threshold and delta >= min_delta_ms
+            else:
+                record["regressed"] = delta >= min_delta_ms
+        latest[name_id] = record
+        state.add(duration)
+
+    latest_records = [record for record in latest if record is not None]
+    regressions = sorted(
+        (record for record in latest_records if record["regressed"]),
+        key=lambda record: (
+            record["z_score"] if record["z_score"] is not None else math.inf,
+            record["delta_ms"],
+        ),
+        reverse=True,
+    )
+    slowest = sorted(
+        (
+            {"name": names[name_id], "duration_ms": values[-1]}
+            for name_id, values in enumerate(series)
+            if values
+        ),
+        key=lambda record: record["duration_ms"],
+        reverse=True,
+    )[:SLOWEST_REPORT_LIMIT]
+    change_points = []
+    for name_id, values in enumerate(series):
+        point = _best_change_point(values, z_threshold=z_threshold, min_delta_ms=min_delta_ms)
+        if point is not None:
+            change_points.append({"name": names[name_id], **point})
+    change_points.sort(key=lambda point: point["after_mean_ms"] - point["before_mean_ms"], reverse=True)
+    for record in regressions:
+        record.pop("regressed")
+    return {
+        "slowest": slowest,
+        "regressions": regressions,
+        "change_points": change_points,
+    }, states
+
+
+def _write_regressions(handle: IO[str], regressions: dict[str, list[dict[str, Any]]]) -> None:
+    handle.write("\n## Slowest tests / biggest regressions\n")
+    for record in regressions["slowest"]:
+        handle.write(f"- slow: {record['name']} ({record['duration_ms']} ms latest)\n")
+    for record in regressions["regressions"]:
+        z_text = f"z={record['z_score']}" if record["z_score"] is not None else "z=n/a"
+        handle.write(
+            f"- regression: {record['name']} {record['duration_ms']} ms vs baseline "
+            f"{record['baseline_mean_ms']} ms over {record['baseline_runs']} runs "
+            f"({z_text}, +{record['delta_ms']} ms)\n"
+        )
+    for point in regressions["change_points"]:
+        handle.write(
+            f"- shift: {point['name']} {point['before_mean_ms']} → {point['after_mean_ms']} ms "
+            f"from run #{point['index'] + 1}\n"
+        )
+    if not regressions["regressions"] and not regressions["change_points"]:
+        handle.write("- No duration regressions detected\n")
+
+
+_PASS_BIT: Final[int] = 1
+_FAIL_BIT: Final[int] = 2
+
+
+class _FlakeState:
+    """Per-test flip counters plus the outcome masks of runs not yet scored."""
+
+    __slots__ = (
+        "pending",
+        "previous_final",
+        "last_closed_run",
+        "runs",
+        "retry_runs",
+        "flips",
+        "decayed_events",
+        "decayed_runs",
+    )
+
+    def __init__(self) -> None:
+        # run ordinal -> [outcome mask, last outcome bit]
+        self.pending: dict[int, list[int]] = {}
+        self.previous_final = 0
+        self.last_closed_run = -1
+        self.runs = 0
+        self.retry_runs = 0
+        self.flips = 0
+        self.decayed_events = 0.0
+        self.decayed_runs = 0.0
+
+    def observe(self, run: int, bit: int, decay: float, lookback: int) -> None:
+        if run <= self.last_closed_run:
+            # Too late: the run already left the lookback and was scored.
+            return
+        entry = self.pending.get(run)
+        if entry is None:
+            self.pending[run] = [bit, bit]
+            self.close(decay, through=run - lookback)
+        else:
+            entry[0] |= bit
+            entry[1] = bit
+
+    def close(self, decay: float, through: int | None = None) -> None:
+        """Score pending runs up to ordinal ``through`` (all by default) in run order."""
+        for run in sorted(self.pending):
+            if through is not None and run > through:
+                break
+            mask, final = self.pending.pop(run)
+            self._close_run(run, mask, final, decay)
+
+    def _close_run(self, run: int, mask: int, final: int, decay: float) -> None:
+        event = 0
+        if mask == _PASS_BIT | _FAIL_BIT:
+            # Passed and failed inside one CI run: a retry flake.
+            self.retry_runs += 1
+            event = 1
+        if self.previous_final and final != self.previous_final:
+            self.flips += 1
+            event = 1
+        if self.last_closed_run >= 0:
+            # Age earlier runs by how many CI runs have happened since.
+            weight = decay ** (run - self.last_closed_run)
+            self.decayed_events *= weight
+            self.decayed_runs *= weight
+        self.decayed_events += event
+        self.decayed_runs += 1
+        self.runs += 1
+        self.previous_final = final
+        self.last_closed_run = run
+
+
+class FlakinessEngine:
+    """Streaming per-test flakiness scoring grouped by CI run.
+
+    Records are grouped by ``run_id`` through a hash index of run ordinals.
+    Each test's outcomes are merged per run while the run is within
+    ``lookback_runs`` of the test's newest run, so interleaved records from
+    concurrent jobs count once; older runs are scored in ordinal order and
+    dropped, keeping at most ``lookback_runs + 1`` open runs per test. A run
+    counts as a flip event when the test both passed and failed in it (a
+    retry) or when its outcome differs from the test's previous run. Scores
+    are exponentially decayed flip rates with a half-life in CI runs.
+    Records from older logs without ``run_id`` are grouped by UTC day.
+    """
+
+    def __init__(
+        self, half_life_runs: float = FLAKY_HALF_LIFE_RUNS, lookback_runs: int = FLAKY_LOOKBACK_RUNS
+    ) -> None:
+        if half_life_runs <= 0:
+            raise ValueError("half_life_runs must be positive")
+        if lookback_runs < 0:
+            raise ValueError("lookback_runs must not be negative")
+        self.decay = 0.5 ** (1 / half_life_runs)
+        self.lookback_runs = lookback_runs
+        self.run_index: dict[str, int] = {}
+        self.tests: dict[Any, _FlakeState] = {}
+
+    @staticmethod
+    def run_key(obj: dict[str, Any]) -> str:
+        run_id = obj.get("run_id")
+        if run_id is not None and str(run_id).strip():
+            return str(run_id).strip()
+        ts = obj.get("ts")
+        return f"legacy:{ts[:10]}" if isinstance(ts, str) else "legacy"
+
+    def observe(self, name: Any, status: object, run_key: str) -> None:
+        bit = _PASS_BIT if status == "pass" else _FAIL_BIT if status == "fail" else 0
+        if not bit:
+            return
+        ordinal = self.run_index.get(run_key)
+        if ordinal is None:
+            ordinal = self.run_index[run_key] = len(self.run_index)
+        state = self.tests.get(name)
+        if state is None:
+            state = self.tests[name] = _FlakeState()
+        state.observe(ordinal, bit, self.decay, self.lookback_runs)
+
+    def extend_from_lines(self, handle: IO[bytes]) -> None:
+        for raw_line in handle:
+            line = raw_line.strip()
             if not line:
                 continue
             obj = json.loads(line)
-            name = obj.get("name", "unknown")
-            tests.append(name)
-            value = obj.get("duration_ms")
-            duration = int(value) if isinstance(value, (int, float)) else 0
-            durs.append(duration)
-            status = obj.get("status")
-            entry_statuses = statuses.setdefault(name, set())
-            if status is not None:
-                entry_statuses.add(str(status))
-                if status == "fail":
-                    fails.append(name)
-    return tests, durs, fails, statuses
+            self.observe(obj.get("name", "unknown"), obj.get("status"), self.run_key(obj))
+
+    def finish(self) -> None:
+        for state in self.tests.values():
+            state.close(self.decay)
+
+    def ranked(
+        self, *, limit: int = FLAKY_REPORT_LIMIT, min_runs: int = FLAKY_MIN_RUNS
+    ) -> list[dict[str, Any]]:
+        """Return the ``limit`` flakiest tests; call :meth:`finish` first."""
+        candidates = (
+            (state.decayed_events / state.decayed_runs, state.decayed_events, str(name), name, state)
+            for name, state in self.tests.items()
+            if state.runs >= min_runs and state.decayed_events > 0
+        )
+        top = heapq.nlargest(limit, candidates, key=lambda item: item[:3])
+        return [
+            {
+                "name": name,
+                "score": round(score, 4),
+                "runs": state.runs,
+                "flips": state.flips,
+                "retry_runs": state.retry_runs,
+            }
+            for score, _events, _label, name, state in top
+        ]
 
 
-def p95(values: list[int]) -> int:
-    if not values:
-        return 0
-    try:
-        # statistics.quantiles with n=20 approximates percentiles
-        return int(statistics.quantiles(values, n=20)[18])
-    except Exception:
-        values_sorted = sorted(values)
-        idx = math.ceil(0.95 * (len(values_sorted) - 1))
-        capped_idx = min(idx, len(values_sorted) - 1)
-        return int(values_sorted[capped_idx])
+def score_flakiness(
+    log_paths: Iterable[Path],
+    *,
+    half_life_runs: float = FLAKY_HALF_LIFE_RUNS,
+    limit: int = FLAKY_REPORT_LIMIT,
+    min_runs: int = FLAKY_MIN_RUNS,
+) -> list[dict[str, Any]]:
+    """Stream ``log_paths`` once and rank the flakiest tests."""
+    engine = FlakinessEngine(half_life_runs)
+    for path in log_paths:
+        try:
+            with path.open("rb") as handle:
+                engine.extend_from_lines(handle)
+        except FileNotFoundError:
+            continue
+    engine.finish()
+    return engine.ranked(limit=limit, min_runs=min_runs)
+
+
+def _write_flaky_tests(handle: IO[str], flaky: list[dict[str, Any]]) -> None:
+    handle.write("\n## Top flaky tests (decayed flip rate per CI run)\n")
+    for record in flaky:
+        handle.write(
+            f"- {record['name']}: score {record['score']:.2f} "
+            f"(flips {record['flips']}, retried {record['retry_runs']}, runs {record['runs']})\n"
+        )
+
+
+def _rates(stats: ReflectionStats) -> tuple[float, float]:
+    """Return ``(pass_rate, flaky_rate)`` for ``stats``."""
+    pass_rate = (stats.total - stats.failures) / stats.total if stats.total else 0.0
+    statuses = stats.statuses
+    flaky_tests = sum(1 for vals in statuses.values() if {"pass", "fail"}.issubset(vals))
+    flaky_rate = flaky_tests / len(statuses) if statuses else 0.0
+    return pass_rate, flaky_rate
+
+
+def _write_per_test_percentiles(handle: IO[str], stats: ReflectionStats) -> None:
+    per_test = stats.per_test_percentiles or {}
+    runs = stats.per_test_runs or {}
+    pcts = list(next(iter(per_test.values()), {}))
+    if not pcts:
+        return
+    slowest = sorted(
+        per_test.items(),
+        key=lambda item: item[1][pcts[-1]],
+        reverse=True,
+    )[:PER_TEST_REPORT_LIMIT]
+    labels = [percentile_engine.percentile_label(pct) for pct in pcts]
+    handle.write(f"\n## Per-test durations (top {len(slowest)} by {labels[-1]}, ms)\n")
+    handle.write("| Test | Runs | " + " | ".join(labels) + " |\n")
+    handle.write("|---|---:|" + "---:|" * len(labels) + "\n")
+    for name, values in slowest:
+        cells = " | ".join(str(values[pct]) for pct in pcts)
+        handle.write(f"| {name} | {runs.get(name, 0)} | {cells} |\n")
 
 
 def generate_report(
-    *, manifest: dict[str, Any] | None = None, focuses: Sequence[str] | None = None
+    *,
+    manifest: dict[str, Any] | None = None,
+    focuses: Sequence[str] | None = None,
+    runs: TestRunStore | None = None,
+    stats: ReflectionStats | None = None,
+    window: datetime.timedelta | None = None,
+    window_step: datetime.timedelta | None = None,
+    regressions: dict[str, list[dict[str, Any]]] | None = None,
+    target_stats: dict[str, ReflectionStats] | None = None,
+    windows: list[dict[str, Any]] | None = None,
+    settings: ReflectionSettings | None = None,
+    flaky: list[dict[str, Any]] | None = None,
 ) -> None:
     if focuses:
         logger.debug("Generating report (focus=%s)", ",".join(focuses))
-    manifest_data = manifest if manifest is not None else load_reflection_manifest()
-    tests, durs, fails, statuses = load_results(manifest=manifest_data)
-    total = len(tests)
-    if total == 0:
-        pass_rate: float = 0.0
-    else:
-        pass_rate = (total - len(fails)) / total
-    unique_tests = len(statuses)
-    flaky_tests = sum(1 for vals in statuses.values() if {"pass", "fail"}.issubset(vals))
-    if unique_tests == 0:
-        flaky_rate = 0.0
-    else:
-        flaky_rate = flaky_tests / unique_tests
-    dur_p95 = p95(durs)
+    if settings is None:
+        settings = resolve_reflection_settings(manifest)
+    manifest_data = settings.manifest
+    if stats is None:
+        if runs is None:
+            runs = load_test_runs(manifest=manifest_data)
+        stats = _stats_from_runs(runs)
+    if regressions is None and runs is not None:
+        regressions, _states = detect_duration_regressions(runs)
+    if windows is None and window is not None:
+        if runs is None:
+            runs = load_test_runs(manifest=manifest_data)
+        windows = window_series(runs, window, step=window_step)
+    total = stats.total
+    fail_counts = stats.fail_counts
+    pass_rate, flaky_rate = _rates(stats)
+    dur_p95 = stats.duration_p95
     now = datetime.datetime.now(datetime.UTC).isoformat()
-    report_path = load_report_output_path(manifest=manifest_data)
-    include_why = load_report_include_why(manifest=manifest_data)
+    report_path = settings.report_path
+    include_why = settings.include_why
 
     report_path.parent.mkdir(parents=True, exist_ok=True)
     with report_path.open("w", encoding="utf-8") as f:
@@ -576,16 +1883,44 @@ def generate_report(
         f.write(f"- Pass rate: {pass_rate:.2%}\n")
         f.write(f"- Flaky rate: {flaky_rate:.2%}\n")
         f.write(f"- Duration p95: {dur_p95} ms\n")
-        f.write(f"- Failures: {len(fails)}\n\n")
-        if fails and include_why:
+        if stats.duration_percentiles:
+            rendered = ", ".join(
+                f"{percentile_engine.percentile_label(pct)} {value} ms"
+                for pct, value in stats.duration_percentiles.items()
+            )
+            f.write(f"- Duration percentiles: {rendered}\n")
+        f.write(f"- Failures: {stats.failures}\n\n")
+        for name, per_target in (target_stats or {}).items():
+            target_pass, target_flaky = _rates(per_target)
+            f.write(f"## Target: {name}\n")
+            f.write(f"- Total tests: {per_target.total}\n")
+            f.write(f"- Pass rate: {target_pass:.2%}\n")
+            f.write(f"- Flaky rate: {target_flaky:.2%}\n")
+            f.write(f"- Duration p95: {per_target.duration_p95} ms\n")
+            f.write(f"- Failures: {per_target.failures}\n\n")
+        if fail_counts and include_why:
             f.write("## Why-Why (draft)\n")
-            for name, cnt in Counter(fails).items():
+            for name, cnt in fail_counts.items():
                 f.write(
                     f"- {name} (x{cnt}): 仮説=前処理の不安定/依存の競合/境界値不足\n"
                 )
+        if regressions is not None and regressions["slowest"]:
+            _write_regressions(f, regressions)
+        if flaky:
+            _write_flaky_tests(f, flaky)
+        if stats.per_test_percentiles:
+            _write_per_test_percentiles(f, stats)
+        if windows and window is not None:
+            f.write(f"\n## Window trend ({int(window.total_seconds())}s)\n")
+            for entry in windows:
+                f.write(
+                    f"- {entry['start']}: total {entry['total']}, "
+                    f"pass {entry['pass_rate']:.2%}, flaky {entry['flaky_rate']:.2%}, "
+                    f"p95 {entry['duration_p95']} ms\n"
+                )
 
     # Issue候補のメモ（Actionsで拾ってIssue化）
-    suggest_issues = load_actions_suggest_issues(manifest=manifest_data)
+    suggest_issues = settings.suggest_issues
     issue_output_path = ISSUE_OUT
     if not issue_output_path.is_absolute():
         issue_output_path = BASE_DIR / issue_output_path
@@ -594,52 +1929,84 @@ def generate_report(
         and report_path.parent != DEFAULT_REPORT.parent
     ):
         issue_output_path = report_path.parent / issue_output_path.name
-    if fails and suggest_issues:
+    if fail_counts and suggest_issues:
         issue_output_path.parent.mkdir(parents=True, exist_ok=True)
         with issue_output_path.open("w", encoding="utf-8") as f:
             f.write("### 反省TODO\n")
-            for name in sorted(set(fails)):
+            for name in sorted(fail_counts):
                 f.write(f"- [ ] {name} の再現手順/前提/境界値を追加\n")
                 f.write(f"- [ ] {name} の再現手順/前提/境界値の工程を増やす\n")
     elif issue_output_path.exists():
         issue_output_path.unlink()
 
 
+_SHARED_ENTRIES_PLACEHOLDER: Final[str] = "\u0000entries\u0000"
+
+
+def _indent_json_block(rendered: str, indent: str = "  ") -> str:
+    """Re-indent a top-level ``json.dumps(..., indent=2)`` block to nest one level deeper."""
+    return rendered.replace("\n", "\n" + indent)
+
+
 def emit_samples(
     *,
     manifest: dict[str, Any] | None = None,
     focuses: Sequence[str] | None = None,
     window: datetime.timedelta | None = None,
     fail_on: Sequence[str] | None = None,
+    runs: TestRunStore | None = None,
+    window_step: datetime.timedelta | None = None,
+    regressions: dict[str, list[dict[str, Any]]] | None = None,
+    windows: list[dict[str, Any]] | None = None,
 ) -> None:
     manifest_data = manifest if manifest is not None else load_reflection_manifest()
-    tests, durs, fails, statuses = load_results(manifest=manifest_data)
+    if runs is None:
+        runs = load_test_runs(manifest=manifest_data)
+    if regressions is None:
+        regressions, _states = detect_duration_regressions(runs)
+    statuses = runs.status_map()
+    failed_ids = runs.failed_name_ids()
+    # Per-name fields are computed once and shared by every run of that test.
+    per_name = [
+        (name, sorted(statuses.get(name, set())), name_id in failed_ids)
+        for name_id, name in enumerate(runs.names)
+    ]
     entries: list[dict[str, object]] = []
-    for index, name in enumerate(tests):
-        duration = durs[index] if index < len(durs) else 0
+    for name_id, duration in zip(runs.name_ids, runs.durations):
+        name, sorted_statuses, failed = per_name[name_id]
         entries.append(
             {
                 "name": name,
                 "duration_ms": duration,
-                "statuses": sorted(statuses.get(name, set())),
-                "failed": name in fails,
+                "statuses": sorted_statuses,
+                "failed": failed,
             }
         )
     window_seconds = int(window.total_seconds()) if window is not None else None
+    if windows is None and window is not None:
+        windows = window_series(runs, window, step=window_step)
     fail_on_tokens = sorted(set(fail_on or ()))
     focus_tokens = list(focuses or ("general",))
+    # The entries dominate the payload and are identical for every focus, so
+    # they are serialized once and spliced into each focus file.
+    entries_json = _indent_json_block(json.dumps(entries, ensure_ascii=False, indent=2))
+    output_dir = BASE_DIR / "reports"
+    output_dir.mkdir(parents=True, exist_ok=True)
     for focus in focus_tokens:
-        output_path = BASE_DIR / "reports" / f"samples_{focus}.json"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
+        output_path = output_dir / f"samples_{focus}.json"
+        payload: dict[str, object] = {
             "focus": focus,
             "window_seconds": window_seconds,
             "fail_on": fail_on_tokens,
-            "entries": entries,
+            "entries": _SHARED_ENTRIES_PLACEHOLDER,
+            "regressions": regressions,
         }
-        output_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8"
+        if windows is not None:
+            payload["windows"] = windows
+        rendered = json.dumps(payload, ensure_ascii=False, indent=2).replace(
+            json.dumps(_SHARED_ENTRIES_PLACEHOLDER), entries_json, 1
         )
+        output_path.write_text(rendered, encoding="utf-8")
 
 
 def emit_ping(
@@ -647,12 +2014,20 @@ def emit_ping(
     manifest: dict[str, Any] | None = None,
     focuses: Sequence[str] | None = None,
     fail_on: Sequence[str] | None = None,
+    runs: TestRunStore | None = None,
+    stats: ReflectionStats | None = None,
+    target_stats: dict[str, ReflectionStats] | None = None,
+    flaky: list[dict[str, Any]] | None = None,
 ) -> None:
     manifest_data = manifest if manifest is not None else load_reflection_manifest()
-    tests, _durs, fails, statuses = load_results(manifest=manifest_data)
-    payload = {
-        "status": "ok" if not fails else "degraded",
-        "total_tests": len(tests),
+    if stats is None:
+        if runs is None:
+            runs = load_test_runs(manifest=manifest_data)
+        stats = _stats_from_runs(runs)
+    statuses = stats.statuses
+    payload: dict[str, Any] = {
+        "status": "ok" if not stats.fail_counts else "degraded",
+        "total_tests": stats.total,
         "flaky_tests": [
             name
             for name, status_set in statuses.items()
@@ -660,8 +2035,19 @@ def emit_ping(
         ],
         "focus": sorted(set(focuses or ())),
         "fail_on": sorted(set(fail_on or ())),
-        "failures": sorted(set(fails)),
+        "failures": sorted(stats.fail_counts),
     }
+    if target_stats:
+        payload["targets"] = {
+            name: {
+                "status": "ok" if not per_target.fail_counts else "degraded",
+                "total_tests": per_target.total,
+                "failures": sorted(per_target.fail_counts),
+            }
+            for name, per_target in target_stats.items()
+        }
+    if flaky is not None:
+        payload["top_flaky"] = flaky
     output_path = BASE_DIR / "reports" / "ping.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(
@@ -669,13 +2055,136 @@ def emit_ping(
     )
 
 
+class AnalysisModel(NamedTuple):
+    """Everything the emitters need, computed once per invocation."""
+
+    runs: TestRunStore | None
+    stats: ReflectionStats
+    target_stats: dict[str, ReflectionStats]
+    regressions: dict[str, list[dict[str, Any]]] | None
+    windows: list[dict[str, Any]] | None
+    flaky: list[dict[str, Any]] | None = None
+
+
+def build_analysis_model(
+    settings: ReflectionSettings,
+    *,
+    emit_tokens: Sequence[str] = ("report",),
+    window: datetime.timedelta | None = None,
+    window_step: datetime.timedelta | None = None,
+    pcts: Sequence[float] = percentile_engine.DEFAULT_PERCENTILES,
+    incremental: bool = False,
+    checkpoint: Path | None = None,
+    baseline: Path | None = None,
+    regression_z: float = REGRESSION_Z_THRESHOLD,
+    use_index: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    flaky_half_life: float = FLAKY_HALF_LIFE_RUNS,
+) -> AnalysisModel:
+    """Load every configured log once and derive the shared analysis results."""
+    targets = settings.targets
+    log_paths = _unique_target_logs(targets)
+    multi_target = len(log_paths) > 1
+    if not multi_target:
+        # A single log keeps the LOG override / manifest precedence rules.
+        log_paths = [settings.log_path]
+        targets = []
+    if multi_target and incremental and checkpoint is not None:
+        raise ValueError(
+            "--checkpoint needs a single log; multiple targets use <log>.checkpoint.json"
+        )
+
+    runs: TestRunStore | None = None
+    stores: dict[Path, TestRunStore] = {}
+    stats: ReflectionStats | None = None
+    target_stats: dict[str, ReflectionStats] = {}
+    if incremental:
+        log_checkpoint = checkpoint if not multi_target else None
+        per_log = dict(
+            zip(
+                log_paths,
+                _map_concurrently(
+                    lambda path: update_aggregates(path, log_checkpoint), log_paths, jobs
+                ),
+            )
+        )
+        combined = ReflectionAggregates()
+        for aggregates in per_log.values():
+            combined.merge(aggregates)
+        stats = combined.stats(pcts)
+        for target in targets:
+            merged = ReflectionAggregates()
+            for path in target.logs:
+                merged.merge(per_log[path])
+            target_stats[target.name] = merged.stats(pcts)
+        # Duration baselines compare individual rows, which the aggregates do not keep.
+        if (
+            baseline is not None
+            or "samples" in emit_tokens
+            or (window is not None and "report" in emit_tokens)
+        ):
+            stores = load_log_stores(log_paths, use_index=use_index, jobs=jobs)
+    else:
+        stores = load_log_stores(log_paths, use_index=use_index, jobs=jobs)
+        for target in targets:
+            target_stats[target.name] = _stats_from_runs(
+                TestRunStore.combine(stores[path] for path in target.logs), pcts
+            )
+    if stores:
+        runs = stores[log_paths[0]] if len(stores) == 1 else TestRunStore.combine(stores.values())
+        if stats is None:
+            stats = _stats_from_runs(runs, pcts)
+    if stats is None:
+        stats = _stats_from_runs(TestRunStore(), pcts)
+
+    regressions: dict[str, list[dict[str, Any]]] | None = None
+    windows: list[dict[str, Any]] | None = None
+    if runs is not None:
+        sources = [(path, stores[path]) for path in log_paths]
+        baseline_states, covered_ranges = _baseline_states(baseline, sources)
+        regressions, states = detect_duration_regressions(
+            runs,
+            baseline=baseline_states,
+            covered_ranges=covered_ranges,
+            z_threshold=regression_z,
+        )
+        if baseline is not None:
+            save_duration_baseline(baseline, states, sources=sources)
+        if window is not None:
+            windows = window_series(runs, window, step=window_step)
+    flaky: list[dict[str, Any]] | None = None
+    if not incremental and {"report", "ping"} & set(emit_tokens):
+        # A separate streaming pass: run ids are not kept in the run store.
+        flaky = score_flakiness(log_paths, half_life_runs=flaky_half_life)
+    return AnalysisModel(runs, stats, target_stats, regressions, windows, flaky)
+
+
+def run_emitters(tasks: Sequence[Callable[[], None]], *, jobs: int = DEFAULT_JOBS) -> None:
+    """Run independent emitters concurrently; each one writes its own files."""
+    if len(tasks) <= 1 or jobs <= 1:
+        for task in tasks:
+            task()
+        return
+    with ThreadPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        for future in [pool.submit(task) for task in tasks]:
+            future.result()
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Analyze workflow reflection logs")
     parser.add_argument("--root", type=Path, default=None, help="Base directory override")
     parser.add_argument("--emit", default=None, help="Slash-separated emit targets")
     parser.add_argument("--focus", default=None, help="Slash-separated focus areas")
     parser.add_argument(
-        "--window", default=None, help="Optional window (e.g. 15m, 1h) for sampling"
+        "--window",
+        default=None,
+        help="Optional window (e.g. 15m, 1h) for per-window pass/flaky/p95 series",
+    )
+    parser.add_argument(
+        "--window-step",
+        dest="window_step",
+        default=None,
+        help="Slide windows by this step (default: same as --window)",
     )
     parser.add_argument(
         "--fail-on",
@@ -683,6 +2192,54 @@ def main(argv: Sequence[str] | None = None) -> int:
         default=None,
         help="Slash-separated failure thresholds (e.g. warnings)",
     )
+    parser.add_argument(
+        "--log-index",
+        dest="log_index",
+        action="store_true",
+        help="Persist a binary sidecar index next to the log and reuse it while the log only grows",
+    )
+    parser.add_argument(
+        "--percentiles",
+        default=None,
+        help="Slash-separated duration percentiles to report (default: 50/90/99)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="Per-test duration baseline to compare against and update after the run",
+    )
+    parser.add_argument(
+        "--regression-z",
+        dest="regression_z",
+        type=float,
+        default=REGRESSION_Z_THRESHOLD,
+        help="z-score above the per-test baseline that counts as a duration regression",
+    )
+    parser.add_argument(
+        "--flaky-half-life",
+        dest="flaky_half_life",
+        type=float,
+        default=FLAKY_HALF_LIFE_RUNS,
+        help="Half-life in CI runs for the decayed flip rate behind the flaky ranking",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Worker threads used to read multiple target logs",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Resume report/ping aggregates from a checkpoint and read only appended log lines",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint path for --incremental (default: <log>.checkpoint.json)",
+    )
     argv_list = list(argv) if argv is not None else []
     args = parser.parse_args(argv_list)
 
@@ -690,6 +2247,13 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     try:
         window = _parse_window_spec(args.window)
+        window_step = _parse_window_spec(args.window_step)
+        pcts = percentile_engine.parse_percentiles(args.percentiles)
+        for spec in (window, window_step):
+            if spec is not None and spec.total_seconds() <= 0:
+                raise ValueError("window must be positive")
+        if args.flaky_half_life <= 0:
+            raise ValueError("--flaky-half-life must be positive")
     except ValueError as exc:
         parser.error(str(exc))
         return 2  # pragma: no cover - argparse.error raises SystemExit
@@ -700,23 +2264,76 @@ def main(argv: Sequence[str] | None = None) -> int:
     focus_tokens = _split_tokens(args.focus)
     fail_on_tokens = _split_tokens(args.fail_on)
 
-    manifest = load_reflection_manifest()
+    settings = resolve_reflection_settings()
+    manifest = settings.manifest
+    try:
+        model = build_analysis_model(
+            settings,
+            emit_tokens=emit_tokens,
+            window=window,
+            window_step=window_step,
+            pcts=pcts,
+            incremental=args.incremental,
+            checkpoint=args.checkpoint,
+            baseline=args.baseline,
+            regression_z=args.regression_z,
+            flaky_half_life=args.flaky_half_life,
+            use_index=args.log_index,
+            jobs=args.jobs,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+        return 2  # pragma: no cover - argparse.error raises SystemExit
 
+    tasks: list[Callable[[], None]] = []
     for emit in emit_tokens:
         if emit == "report":
-            generate_report(manifest=manifest, focuses=focus_tokens)
+            tasks.append(
+                functools.partial(
+                    generate_report,
+                    manifest=manifest,
+                    focuses=focus_tokens,
+                    runs=model.runs,
+                    stats=model.stats,
+                    window=window,
+                    window_step=window_step,
+                    regressions=model.regressions,
+                    target_stats=model.target_stats,
+                    windows=model.windows,
+                    settings=settings,
+                    flaky=model.flaky,
+                )
+            )
         elif emit == "samples":
-            emit_samples(
-                manifest=manifest,
-                focuses=focus_tokens,
-                window=window,
-                fail_on=fail_on_tokens,
+            tasks.append(
+                functools.partial(
+                    emit_samples,
+                    manifest=manifest,
+                    focuses=focus_tokens,
+                    window=window,
+                    fail_on=fail_on_tokens,
+                    runs=model.runs,
+                    window_step=window_step,
+                    regressions=model.regressions,
+                    windows=model.windows,
+                )
             )
         elif emit == "ping":
-            emit_ping(manifest=manifest, focuses=focus_tokens, fail_on=fail_on_tokens)
+            tasks.append(
+                functools.partial(
+                    emit_ping,
+                    manifest=manifest,
+                    focuses=focus_tokens,
+                    fail_on=fail_on_tokens,
+                    stats=model.stats,
+                    target_stats=model.target_stats,
+                    flaky=model.flaky,
+                )
+            )
         else:
             logger.warning("Unknown emit target: %s", emit)
 
+    run_emitters(tasks, jobs=args.jobs)
     return 0
 
 
@@ -0,0 +1,147 @@
+"""Benchmark analyze.py as emit targets are added to one invocation.
+
+The log is loaded and analysed once per run, so adding targets only adds their
+own serialization: ``report/samples/ping`` should cost about as much as its
+slowest target alone, not the sum of separate invocations.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Final, Sequence
+
+import analyze
+
+DEFAULT_ENTRIES: Final[int] = 50_000
+DEFAULT_TESTS: Final[int] = 500
+DEFAULT_REPEATS: Final[int] = 3
+EMIT_SETS: Final[tuple[str, ...]] = ("report", "report/samples", "report/samples/ping")
+BASE_TIMESTAMP: Final[datetime.datetime] = datetime.datetime(
+    2025, 1, 1, tzinfo=datetime.timezone.utc
+)
+
+
+def write_synthetic_log(path: Path, *, entries: int, tests: int, seed: int = 8) -> None:
+    """Write ``entries`` timestamped results spread over ``tests`` test names."""
+    rng = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(entries):
+            name = f"tests/test_bench.py::test_{index % tests}"
+            status = "fail" if rng.random() < 0.05 else "pass"
+            record = {
+                "name": name,
+                "status": status,
+                "duration_ms": int(rng.lognormvariate(3.0, 0.6)),
+                "ts": (BASE_TIMESTAMP + datetime.timedelta(seconds=index)).isoformat(),
+            }
+            handle.write(json.dumps(record) + "\n")
+
+
+def _best_seconds(root: Path, emit: str, *, repeats: int, window: str | None) -> float:
+    argv = ["--root", str(root), "--emit", emit]
+    if window:
+        argv += ["--window", window]
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        exit_code = analyze.main(argv)
+        durations.append(time.perf_counter() - started)
+        if exit_code != 0:
+            raise RuntimeError(f"analyze.main exited with {exit_code} for --emit {emit}")
+    return min(durations)
+
+
+def bench_emit_sets(
+    root: Path,
+    *,
+    emit_sets: Sequence[str] = EMIT_SETS,
+    repeats: int = DEFAULT_REPEATS,
+    window: str | None = "1h",
+) -> list[dict[str, Any]]:
+    """Time each emit set against running its targets as separate invocations."""
+    singles: dict[str, float] = {}
+    results: list[dict[str, Any]] = []
+    for emit in emit_sets:
+        targets = emit.split("/")
+        for target in targets:
+            if target not in singles:
+                singles[target] = _best_seconds(root, target, repeats=repeats, window=window)
+        best = _best_seconds(root, emit, repeats=repeats, window=window)
+        separate = sum(singles[target] for target in targets)
+        results.append(
+            {
+                "emit": emit,
+                "targets": len(targets),
+                "best_seconds": round(best, 6),
+                "separate_runs_seconds": round(separate, 6),
+                "speedup_vs_separate": round(separate / best, 3) if best > 0 else 0.0,
+            }
+        )
+    baseline = results[0]["best_seconds"] if results else 0.0
+    for result in results:
+        result["ratio_to_first"] = (
+            round(result["best_seconds"] / baseline, 3) if baseline > 0 else 0.0
+        )
+    return results
+
+
+def run_benchmark(
+    *,
+    entries: int = DEFAULT_ENTRIES,
+    tests: int = DEFAULT_TESTS,
+    repeats: int = DEFAULT_REPEATS,
+    window: str | None = "1h",
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="day8-bench-analyze-") as tmp:
+        root = Path(tmp)
+        write_synthetic_log(root / "logs" / "test.jsonl", entries=entries, tests=tests)
+        results = bench_emit_sets(root, repeats=repeats, window=window)
+    return {
+        "config": {
+            "entries": entries,
+            "tests": tests,
+            "repeats": repeats,
+            "window": window,
+        },
+        "emit_sets": results,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark analyze.py emit fan-out")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="Synthetic log lines")
+    parser.add_argument("--tests", type=int, default=DEFAULT_TESTS, help="Distinct test names")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per emit set")
+    parser.add_argument("--window", default="1h", help="Window passed to analyze.py ('' disables)")
+    parser.add_argument("--output", type=Path, help="Optional path to write the JSON report")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.repeats < 1 or args.entries < 1 or args.tests < 1:
+        print("--entries, --tests and --repeats must be positive", file=sys.stderr)
+        return 1
+    report = run_benchmark(
+        entries=args.entries,
+        tests=args.tests,
+        repeats=args.repeats,
+        window=args.window or None,
+    )
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
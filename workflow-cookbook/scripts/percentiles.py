@@ -0,0 +1,218 @@
+"""Percentile engine for reflection log durations.
+
+Exact percentiles use nearest-rank selection (``ceil(q * (n - 1))``) computed
+with quickselect, so a handful of percentiles cost O(n) on average instead of a
+full sort. :class:`DurationSketch` is a mergeable log-bucketed sketch for large
+or incrementally maintained logs.
+"""
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Final, Iterable, Mapping, Sequence
+
+DEFAULT_PERCENTILES: Final[tuple[float, ...]] = (50.0, 90.0, 99.0)
+DEFAULT_EXACT_LIMIT: Final[int] = 200_000
+SKETCH_RELATIVE_ACCURACY: Final[float] = 0.01
+
+_pivot_random = random.Random(0x5EED)
+
+
+def rank_index(count: int, pct: float) -> int:
+    """Return the nearest-rank index of ``pct`` (0-100) in ``count`` sorted values."""
+    if count <= 0:
+        raise ValueError("rank_index requires at least one value")
+    if not 0 <= pct <= 100:
+        raise ValueError("percentile must be between 0 and 100")
+    return min(math.ceil(pct / 100 * (count - 1)), count - 1)
+
+
+def _partition(items: list[Any], lo: int, hi: int, pivot_index: int) -> tuple[int, int]:
+    """Three-way partition ``items[lo:hi + 1]``; return the bounds of the pivot run."""
+    pivot = items[pivot_index]
+    lt, index, gt = lo, lo, hi
+    while index <= gt:
+        value = items[index]
+        if value < pivot:
+            items[lt], items[index] = value, items[lt]
+            lt += 1
+            index += 1
+        elif value > pivot:
+            items[gt], items[index] = value, items[gt]
+            gt -= 1
+        else:
+            index += 1
+    return lt, gt
+
+
+def _select_in_place(items: list[Any], k: int, lo: int, hi: int) -> Any:
+    while True:
+        if lo == hi:
+            return items[lo]
+        lt, gt = _partition(items, lo, hi, _pivot_random.randint(lo, hi))
+        if k < lt:
+            hi = lt - 1
+        elif k > gt:
+            lo = gt + 1
+        else:
+            return items[k]
+
+
+def select(values: Sequence[Any], k: int) -> Any:
+    """Return the ``k``-th smallest value (0-based) without sorting ``values``."""
+    if not 0 <= k < len(values):
+        raise IndexError("selection rank out of range")
+    items = list(values)
+    return _select_in_place(items, k, 0, len(items) - 1)
+
+
+def percentiles(values: Sequence[Any], pcts: Iterable[float]) -> dict[float, Any]:
+    """Return exact nearest-rank percentiles of ``values`` keyed by percentile.
+
+    Ranks are selected in increasing order and each selection only searches the
+    slice right of the previous rank, which quickselect left partitioned.
+    """
+    requested = sorted(set(pcts))
+    if not values:
+        return {pct: 0 for pct in requested}
+    items = list(values)
+    lo = 0
+    hi = len(items) - 1
+    results: dict[float, Any] = {}
+    for pct in requested:
+        k = rank_index(len(items), pct)
+        results[pct] = _select_in_place(items, k, lo, hi)
+        lo = k
+    return results
+
+
+def percentile(values: Sequence[Any], pct: float) -> Any:
+    """Return the exact nearest-rank ``pct`` percentile, or 0 for no values."""
+    if not values:
+        return 0
+    return select(values, rank_index(len(values), pct))
+
+
+def percentile_label(pct: float) -> str:
+    return f"p{pct:g}"
+
+
+def parse_percentiles(spec: str | None) -> tuple[float, ...]:
+    """Parse ``"50/90/p99"`` style specs into sorted unique percentiles."""
+    if spec is None or not spec.strip():
+        return DEFAULT_PERCENTILES
+    parsed: set[float] = set()
+    for token in spec.replace(",", "/").split("/"):
+        stripped = token.strip().lower().removeprefix("p")
+        if not stripped:
+            continue
+        try:
+            value = float(stripped)
+        except ValueError as exc:
+            raise ValueError(f"invalid percentile: {token.strip()}") from exc
+        if not 0 <= value <= 100:
+            raise ValueError(f"percentile out of range: {token.strip()}")
+        parsed.add(value)
+    if not parsed:
+        return DEFAULT_PERCENTILES
+    return tuple(sorted(parsed))
+
+
+class DurationSketch:
+    """Mergeable log-bucketed quantile sketch (DDSketch style).
+
+    Quantiles are accurate to ``relative_accuracy`` of the true value, memory
+    grows with the logarithm of the duration range, and two sketches with the
+    same accuracy merge by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + count
+        else:
+            # Durations are non-negative; anything at or below zero shares one bucket.
+            self.zero_count += count
+        self.count += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "DurationSketch") -> None:
+        if not math.isclose(self.relative_accuracy, other.relative_accuracy):
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        for bound in (other.min, other.max):
+            if bound is None:
+                continue
+            self.min = bound if self.min is None else min(self.min, bound)
+            self.max = bound if self.max is None else max(self.max, bound)
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0 or self.min is None or self.max is None:
+            return 0.0
+        rank = math.ceil(q * (self.count - 1))
+        if rank < self.zero_count:
+            return float(self.min) if self.min <= 0 else 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                estimate = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(estimate, float(self.min)), float(self.max))
+        return float(self.max)
+
+    def percentiles(self, pcts: Iterable[float]) -> dict[float, float]:
+        return {pct: self.quantile(pct / 100) for pct in sorted(set(pcts))}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in sorted(self.bins.items())},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DurationSketch":
+        sketch = cls(float(data["relative_accuracy"]))
+        sketch.bins = {int(key): int(count) for key, count in data["bins"].items()}
+        sketch.zero_count = int(data["zero_count"])
+        sketch.count = int(data["count"])
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
+
+
+def summarize(
+    values: Sequence[float],
+    pcts: Iterable[float] = DEFAULT_PERCENTILES,
+    *,
+    exact_limit: int = DEFAULT_EXACT_LIMIT,
+) -> dict[float, float]:
+    """Exact percentiles up to ``exact_limit`` values, sketch estimates beyond."""
+    if len(values) <= exact_limit:
+        return percentiles(values, pcts)
+    sketch = DurationSketch()
+    sketch.extend(values)
+    return sketch.percentiles(pcts)
@@ -7,6 +7,8 @@ import os
 import subprocess
 import sys
 import time
+import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +17,7 @@ REPO_ROOT = WORKFLOW_ROOT.parent
 LOG_DIR = WORKFLOW_ROOT / "logs"
 LOG_FILE = LOG_DIR / "test.jsonl"
 OPTIONAL_REQUIREMENTS = {"requirements-eval.txt"}
+_LOCAL_RUN_ID = f"local-{uuid.uuid4().hex[:12]}"
 
 
 def write_output(had_failures: bool) -> None:
@@ -25,8 +28,35 @@ def write_output(had_failures: bool) -> None:
         handle.write(f"had_failures={'true' if had_failures else 'false'}\n")
 
 
+def current_run_id() -> str:
+    """Identify the CI job run; re-run attempts of a workflow share one run id.
+
+    ``GITHUB_RUN_ID`` is shared by every job and matrix leg of a workflow run,
+    so the job id and the optional ``DAY8_MATRIX_ID`` (set by the workflow,
+    e.g. from ``strategy.job-index``) are appended to keep legs apart.
+    """
+    explicit = os.environ.get("DAY8_RUN_ID", "").strip()
+    if explicit:
+        return explicit
+    github_run = os.environ.get("GITHUB_RUN_ID", "").strip()
+    if github_run:
+        parts = [
+            f"gh-{github_run}",
+            os.environ.get("GITHUB_JOB", "").strip(),
+            os.environ.get("DAY8_MATRIX_ID", "").strip(),
+        ]
+        return "-".join(part for part in parts if part)
+    return _LOCAL_RUN_ID
+
+
 def log_entry(name: str, status: str, duration_ms: int) -> None:
-    entry = {"name": name, "status": status, "duration_ms": duration_ms}
+    entry = {
+        "name": name,
+        "status": status,
+        "duration_ms": duration_ms,
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "run_id": current_run_id(),
+    }
     with LOG_FILE.open("a", encoding="utf-8") as handle:
         handle.write(json.dumps(entry, separators=(",", ":")))
         handle.write("\n")
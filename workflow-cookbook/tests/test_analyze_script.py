@@ -3,7 +3,6 @@ from __future__ import annotations
 import importlib.util
 import json
 import py_compile
-import statistics
 import subprocess
 import sys
 from importlib.abc import Loader
@@ -17,6 +16,10 @@ WORKFLOW_ROOT = Path(__file__).resolve().parents[1]
 
 
 def load_analyze_module() -> ModuleType:
+    scripts_dir = str(WORKFLOW_ROOT / "scripts")
+    # Mirror ``python scripts/analyze.py`` so sibling modules resolve.
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
     module_path = WORKFLOW_ROOT / "scripts" / "analyze.py"
     spec = importlib.util.spec_from_file_location("analyze", module_path)
     if spec is None or spec.loader is None:
@@ -51,26 +54,19 @@ def test_analyze_paths_use_workflow_root() -> None:
     assert analyze.ISSUE_OUT == WORKFLOW_ROOT / "reports" / "issue_suggestions.md"
 
 
-def test_p95_fallback_returns_max_when_quantiles_fail(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_p95_returns_max_for_two_values() -> None:
     analyze = load_analyze_module()
 
-    def _raise_statistics_error(*_args: object, **_kwargs: object) -> list[float]:
-        raise statistics.StatisticsError("forced failure")
-
-    monkeypatch.setattr(analyze.statistics, "quantiles", _raise_statistics_error)
-
     assert analyze.p95([10, 20]) == 20
 
 
-def test_p95_fallback_uses_ceiling(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_p95_uses_ceiling_rank() -> None:
     analyze = load_analyze_module()
 
-    def _raise_statistics_error(*_args: object, **_kwargs: object) -> list[float]:
-        raise statistics.StatisticsError("forced failure")
-
-    monkeypatch.setattr(analyze.statistics, "quantiles", _raise_statistics_error)
-
     assert analyze.p95([100, 200]) == 200
+    assert analyze.p95([5, 1, 4, 2, 3]) == 5
+    assert analyze.p95(list(range(1, 101))) == 96
+    assert analyze.p95([]) == 0
 
 
 def test_load_results_sanitizes_non_numeric_durations(
@@ -1035,3 +1031,949 @@ def test_main_generates_report_when_yaml_unavailable(
 
     report_path = tmp_path / "reports" / "#1.md"
     assert report_path.exists()
+
+
+def _write_log(path: Path, entries: list[dict[str, object]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        "".join(json.dumps(entry) + "\n" for entry in entries), encoding="utf-8"
+    )
+
+
+def test_test_run_store_interns_names_and_matches_load_results(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": 10},
+            {"name": "test_a", "status": "fail", "duration_ms": 12},
+            {"name": "test_b", "duration_ms": "slow"},
+            {"status": "fail", "duration_ms": 3.9},
+        ],
+    )
+
+    store = analyze.build_test_run_store(log_path)
+
+    assert len(store) == 4
+    assert store.names == ["test_a", "test_b", "unknown"]
+    assert list(store.name_ids) == [0, 0, 1, 2]
+    tests, durs, fails, statuses = store.as_results()
+    assert tests == ["test_a", "test_a", "test_b", "unknown"]
+    assert durs == [10, 12, 0, 3]
+    assert fails == ["test_a", "unknown"]
+    assert statuses == {"test_a": {"pass", "fail"}, "test_b": set(), "unknown": {"fail"}}
+
+
+def test_log_index_is_reused_and_extended_when_log_grows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(log_path, [{"name": "test_a", "status": "pass", "duration_ms": 5}])
+    index_path = log_path.with_name("test.jsonl.idx")
+
+    first = analyze.build_test_run_store(log_path, use_index=True)
+    assert index_path.exists()
+    assert len(first) == 1
+
+    parsed: list[str] = []
+    real_loads = analyze.json.loads
+
+    def _counting_loads(raw, *args, **kwargs):
+        parsed.append(raw)
+        return real_loads(raw, *args, **kwargs)
+
+    monkeypatch.setattr(analyze.json, "loads", _counting_loads)
+
+    again = analyze.build_test_run_store(log_path, use_index=True)
+    assert len(again) == 1
+    assert not any(isinstance(raw, bytes) and b"test_a" in raw for raw in parsed)
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"name": "test_b", "status": "fail", "duration_ms": 9}) + "\n")
+    parsed.clear()
+
+    grown = analyze.build_test_run_store(log_path, use_index=True)
+
+    assert grown.tests() == ["test_a", "test_b"]
+    assert grown.durations.tolist() == [5, 9]
+    record_lines = [raw for raw in parsed if isinstance(raw, bytes) and raw.startswith(b"{")]
+    assert len(record_lines) == 1
+    assert analyze.build_test_run_store(log_path).as_results() == grown.as_results()
+
+
+def test_log_index_is_rebuilt_when_log_is_rewritten(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": 5},
+            {"name": "test_b", "status": "pass", "duration_ms": 6},
+        ],
+    )
+    analyze.build_test_run_store(log_path, use_index=True)
+
+    _write_log(
+        log_path,
+        [
+            {"name": "test_z", "status": "fail", "duration_ms": 1},
+            {"name": "test_y", "status": "pass", "duration_ms": 2},
+            {"name": "test_x", "status": "pass", "duration_ms": 3},
+        ],
+    )
+
+    rebuilt = analyze.build_test_run_store(log_path, use_index=True)
+
+    assert rebuilt.tests() == ["test_z", "test_y", "test_x"]
+    assert rebuilt.failures() == ["test_z"]
+
+
+def test_log_index_is_rebuilt_when_log_is_rewritten_past_the_head(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    # Enough rows that the rewrite only differs well past the first few kilobytes.
+    entries = [{"name": f"test_{index:03d}", "status": "pass", "duration_ms": 5} for index in range(200)]
+    _write_log(log_path, entries)
+    analyze.build_test_run_store(log_path, use_index=True)
+
+    entries[-1] = {"name": "test_199", "status": "fail", "duration_ms": 7}
+    _write_log(log_path, entries)
+
+    rebuilt = analyze.build_test_run_store(log_path, use_index=True)
+
+    assert rebuilt.failures() == ["test_199"]
+    assert rebuilt.durations.tolist()[-1] == 7
+    assert not list(log_path.parent.glob("*.tmp"))
+
+
+def test_log_index_skips_partial_trailing_line(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(log_path, [{"name": "test_a", "status": "pass", "duration_ms": 5}])
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"name": "test_b", "status": "pass", "duration_ms": 7}')
+
+    store = analyze.build_test_run_store(log_path, use_index=True)
+    assert store.tests() == ["test_a", "test_b"]
+    assert not log_path.with_name("test.jsonl.idx").exists()
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write("\n")
+    analyze.build_test_run_store(log_path, use_index=True)
+
+    reloaded = analyze.build_test_run_store(log_path, use_index=True)
+    assert reloaded.tests() == ["test_a", "test_b"]
+
+
+def test_main_parses_log_once_for_all_emit_targets(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": 5},
+            {"name": "test_a", "status": "fail", "duration_ms": 8},
+        ],
+    )
+    calls: list[Path] = []
+    real_build = analyze.build_test_run_store
+
+    def _tracking_build(path: Path, *, use_index: bool = False):
+        calls.append(path)
+        return real_build(path, use_index=use_index)
+
+    monkeypatch.setattr(analyze, "build_test_run_store", _tracking_build)
+
+    assert analyze.main(["--root", str(tmp_path), "--emit", "report/samples/ping"]) == 0
+
+    assert calls == [log_path]
+    samples = json.loads((tmp_path / "reports" / "samples_general.json").read_text(encoding="utf-8"))
+    assert [entry["failed"] for entry in samples["entries"]] == [True, True]
+    assert samples["entries"][0]["statuses"] == ["fail", "pass"]
+    ping = json.loads((tmp_path / "reports" / "ping.json").read_text(encoding="utf-8"))
+    assert ping["flaky_tests"] == ["test_a"]
+
+
+def test_duration_sketch_quantiles_are_relative_accurate_and_mergeable() -> None:
+    analyze = load_analyze_module()
+    values = list(range(1, 2001))
+    left = analyze.DurationSketch()
+    right = analyze.DurationSketch()
+    for value in values[:700]:
+        left.add(value)
+    for value in values[700:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == len(values)
+    exact = analyze.p95(values)
+    assert left.quantile(0.95) == pytest.approx(exact, rel=0.02)
+    assert left.quantile(0.0) == 1
+    assert left.quantile(1.0) == pytest.approx(2000, rel=0.02)
+
+    restored = analyze.DurationSketch.from_dict(json.loads(json.dumps(left.to_dict())))
+    assert restored.quantile(0.5) == left.quantile(0.5)
+
+    with pytest.raises(ValueError):
+        left.merge(analyze.DurationSketch(relative_accuracy=0.05))
+
+
+def test_update_aggregates_reads_only_appended_lines(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": 10},
+            {"name": "test_b", "status": "fail", "duration_ms": 30},
+        ],
+    )
+    checkpoint = tmp_path / "state" / "reflection.json"
+
+    first = analyze.update_aggregates(log_path, checkpoint)
+    assert checkpoint.exists()
+    assert first.total == 2
+
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"name": "test_a", "status": "fail", "duration_ms": 20}) + "\n")
+
+    parsed: list[object] = []
+    real_loads = analyze.json.loads
+
+    def _counting_loads(raw, *args, **kwargs):
+        if isinstance(raw, bytes):
+            parsed.append(raw)
+        return real_loads(raw, *args, **kwargs)
+
+    monkeypatch.setattr(analyze.json, "loads", _counting_loads)
+
+    stats = analyze.update_aggregates(log_path, checkpoint).stats()
+
+    assert len(parsed) == 1
+    assert stats.total == 3
+    assert stats.fail_counts == {"test_b": 1, "test_a": 1}
+    assert stats.statuses == {"test_a": {"pass", "fail"}, "test_b": {"fail"}}
+    full = analyze._stats_from_runs(analyze.build_test_run_store(log_path))
+    assert (stats.total, stats.fail_counts, stats.statuses) == (
+        full.total,
+        full.fail_counts,
+        full.statuses,
+    )
+
+
+def test_update_aggregates_recounts_when_log_is_rewritten(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(log_path, [{"name": "test_a", "status": "fail", "duration_ms": 10}] * 3)
+    analyze.update_aggregates(log_path)
+
+    _write_log(log_path, [{"name": "test_z", "status": "pass", "duration_ms": 4}] * 4)
+
+    stats = analyze.update_aggregates(log_path).stats()
+
+    assert stats.total == 4
+    assert stats.fail_counts == {}
+    assert list(stats.statuses) == ["test_z"]
+
+
+def test_update_aggregates_recounts_when_log_is_rewritten_past_the_head(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    entries = [{"name": "test_a", "status": "pass", "duration_ms": 10}] * 200
+    _write_log(log_path, entries)
+    analyze.update_aggregates(log_path)
+
+    _write_log(log_path, entries[:-1] + [{"name": "test_a", "status": "fail", "duration_ms": 10}])
+
+    stats = analyze.update_aggregates(log_path).stats()
+
+    assert stats.total == 200
+    assert stats.fail_counts == {"test_a": 1}
+
+
+def test_main_incremental_report_matches_full_report(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": 10},
+            {"name": "test_a", "status": "fail", "duration_ms": 12},
+            {"name": "test_b", "status": "pass", "duration_ms": 8},
+            {"name": "test_c", "status": "fail", "duration_ms": 7},
+        ],
+    )
+    report_path = tmp_path / "reports" / "today.md"
+
+    def _body() -> list[str]:
+        # The incremental p95 comes from the quantile sketch and is approximate,
+        # and regression detection and flaky ranking need per-run rows, so
+        # they are skipped.
+        lines: list[str] = []
+        in_regressions = False
+        for line in report_path.read_text(encoding="utf-8").splitlines()[1:]:
+            if line.startswith("## "):
+                in_regressions = line.startswith(("## Slowest tests", "## Top flaky"))
+            if in_regressions or line.startswith("- Duration p95:") or not line:
+                continue
+            lines.append(line)
+        return lines
+
+    assert analyze.main(["--root", str(tmp_path), "--emit", "report/ping"]) == 0
+    full_report = _body()
+    full_ping = json.loads((tmp_path / "reports" / "ping.json").read_text(encoding="utf-8"))
+    assert full_ping.pop("top_flaky") == []
+
+    for _ in range(2):
+        assert analyze.main(["--root", str(tmp_path), "--emit", "report/ping", "--incremental"]) == 0
+        assert _body() == full_report
+        ping = json.loads((tmp_path / "reports" / "ping.json").read_text(encoding="utf-8"))
+        assert ping == full_ping
+    assert (tmp_path / "logs" / "test.jsonl.checkpoint.json").exists()
+
+
+def _timed_entry(name: str, status: str, duration: int, minute: int) -> dict[str, object]:
+    return {
+        "name": name,
+        "status": status,
+        "duration_ms": duration,
+        "ts": f"2025-01-01T00:{minute:02d}:00.000+00:00",
+    }
+
+
+def test_window_series_uses_time_ordered_windows(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            _timed_entry("test_a", "pass", 10, 1),
+            _timed_entry("test_a", "fail", 12, 5),
+            _timed_entry("test_b", "pass", 8, 14),
+            {"name": "legacy", "status": "fail", "duration_ms": 1},
+            _timed_entry("test_b", "pass", 300, 47),
+            _timed_entry("test_c", "pass", 20, 16),
+        ],
+    )
+    runs = analyze.build_test_run_store(log_path)
+
+    series = analyze.window_series(runs, analyze.datetime.timedelta(minutes=15))
+
+    assert [entry["start"] for entry in series] == [
+        "2025-01-01T00:00:00+00:00",
+        "2025-01-01T00:15:00+00:00",
+        "2025-01-01T00:45:00+00:00",
+    ]
+    first, second, third = series
+    assert (first["total"], first["failures"]) == (3, 1)
+    assert first["flaky_rate"] == pytest.approx(0.5)
+    assert first["pass_rate"] == pytest.approx(2 / 3)
+    assert (second["total"], second["flaky_rate"]) == (1, 0.0)
+    assert third["duration_p95"] == 300
+
+    sliding = analyze.window_series(
+        runs,
+        analyze.datetime.timedelta(minutes=15),
+        step=analyze.datetime.timedelta(minutes=5),
+    )
+    assert sliding[0]["start"] == "2024-12-31T23:50:00+00:00"
+    assert all(entry["total"] > 0 for entry in sliding)
+    assert [entry["total"] for entry in sliding[:4]] == [1, 2, 3, 3]
+
+
+def test_main_window_emits_series_in_samples_and_report(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    _write_log(
+        tmp_path / "logs" / "test.jsonl",
+        [
+            _timed_entry("test_a", "pass", 10, 1),
+            _timed_entry("test_a", "pass", 90, 31),
+        ],
+    )
+
+    exit_code = analyze.main(
+        ["--root", str(tmp_path), "--emit", "report/samples", "--window", "30m"]
+    )
+
+    assert exit_code == 0
+    samples = json.loads((tmp_path / "reports" / "samples_general.json").read_text(encoding="utf-8"))
+    assert samples["window_seconds"] == 1800
+    assert [entry["duration_p95"] for entry in samples["windows"]] == [10, 90]
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "## Window trend (1800s)" in report
+    assert "- 2025-01-01T00:30:00+00:00: total 1, pass 100.00%, flaky 0.00%, p95 90 ms" in report
+
+
+def test_main_rejects_zero_window(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+
+    with pytest.raises(SystemExit):
+        analyze.main(["--root", str(tmp_path), "--window", "0"])
+
+
+def test_main_reports_configured_and_per_test_percentiles(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    entries = [
+        {"name": "test_fast", "status": "pass", "duration_ms": value} for value in (1, 2, 3, 4)
+    ] + [
+        {"name": "test_slow", "status": "pass", "duration_ms": value} for value in (100, 200, 300)
+    ]
+    _write_log(tmp_path / "logs" / "test.jsonl", entries)
+
+    assert analyze.main(["--root", str(tmp_path), "--percentiles", "50/p99"]) == 0
+
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "- Duration p95: 300 ms" in report
+    assert "- Duration percentiles: p50 4 ms, p99 300 ms" in report
+    assert "## Per-test durations (top 2 by p99, ms)" in report
+    table = report.split("## Per-test durations", 1)[1].splitlines()
+    assert table[1:5] == [
+        "| Test | Runs | p50 | p99 |",
+        "|---|---:|---:|---:|",
+        "| test_slow | 3 | 200 | 300 |",
+        "| test_fast | 4 | 3 | 4 |",
+    ]
+
+
+def test_main_rejects_invalid_percentiles(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+
+    with pytest.raises(SystemExit):
+        analyze.main(["--root", str(tmp_path), "--percentiles", "101"])
+
+
+def test_incremental_stats_keep_per_test_sketches(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [{"name": "test_a", "status": "pass", "duration_ms": value} for value in range(1, 101)],
+    )
+    analyze.update_aggregates(log_path)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps({"name": "test_b", "status": "pass", "duration_ms": 40}) + "\n")
+
+    stats = analyze.update_aggregates(log_path).stats((50, 90))
+
+    assert stats.per_test_runs == {"test_a": 100, "test_b": 1}
+    assert stats.per_test_percentiles["test_a"][90] == pytest.approx(91, rel=0.02)
+    assert stats.per_test_percentiles["test_b"] == {50: 40, 90: 40}
+
+
+def _duration_entries(name: str, durations: list[int]) -> list[dict[str, object]]:
+    return [{"name": name, "status": "pass", "duration_ms": value} for value in durations]
+
+
+def test_detect_duration_regressions_flags_latest_outlier_and_shift(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        _duration_entries("test_spike", [100, 102, 98, 101, 99, 100, 400])
+        + _duration_entries("test_stable", [50, 52, 48, 51, 49, 50, 51])
+        + _duration_entries("test_shift", [10, 11, 10, 12, 11, 80, 82, 81, 79]),
+    )
+    runs = analyze.build_test_run_store(log_path)
+
+    result, states = analyze.detect_duration_regressions(runs)
+
+    regressed = [record["name"] for record in result["regressions"]]
+    assert regressed == ["test_spike"]
+    spike = result["regressions"][0]
+    assert spike["duration_ms"] == 400
+    assert spike["baseline_runs"] == 6
+    assert spike["baseline_mean_ms"] == 100.0
+    assert spike["z_score"] > 3
+    assert [point["name"] for point in result["change_points"]] == ["test_shift"]
+    assert result["change_points"][0]["index"] == 5
+    assert result["slowest"][0] == {"name": "test_spike", "duration_ms": 400}
+    assert states["test_stable"].count == 7
+
+
+def test_main_baseline_rerun_on_unchanged_log_keeps_regressions(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    baseline_path = tmp_path / "state" / "baseline.json"
+    _write_log(log_path, _duration_entries("test_a", [100, 101, 99, 100, 102, 98, 400]))
+    samples_path = tmp_path / "reports" / "samples_general.json"
+    argv = ["--root", str(tmp_path), "--emit", "report/samples", "--baseline", str(baseline_path)]
+
+    assert analyze.main(argv) == 0
+    first = json.loads(samples_path.read_text(encoding="utf-8"))["regressions"]
+    assert [record["name"] for record in first["regressions"]] == ["test_a"]
+
+    assert analyze.main(argv) == 0
+
+    assert json.loads(samples_path.read_text(encoding="utf-8"))["regressions"] == first
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "- regression: test_a 400 ms vs baseline 100.0 ms over 6 runs" in report
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["tests"][0][1] == 7
+
+    # Appended rows are scored against everything before them and folded in once.
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(_duration_entries("test_a", [100])[0]) + "\n")
+    assert analyze.main(argv) == 0
+    assert json.loads(samples_path.read_text(encoding="utf-8"))["regressions"]["regressions"] == []
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["tests"][0][1] == 8
+
+
+def test_main_incremental_report_honours_baseline(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    baseline_path = tmp_path / "state" / "baseline.json"
+    _write_log(tmp_path / "logs" / "test.jsonl", _duration_entries("test_a", [100, 101, 99, 100, 102, 98, 400]))
+
+    argv = ["--root", str(tmp_path), "--emit", "report", "--incremental", "--baseline", str(baseline_path)]
+    assert analyze.main(argv) == 0
+
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "- regression: test_a 400 ms vs baseline 100.0 ms over 6 runs" in report
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["tests"][0][1] == 7
+
+
+def test_main_persists_baseline_and_compares_next_log(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    baseline_path = tmp_path / "state" / "baseline.json"
+    _write_log(log_path, _duration_entries("test_a", [100, 101, 99, 100, 102, 98]))
+
+    argv = ["--root", str(tmp_path), "--emit", "report/samples", "--baseline", str(baseline_path)]
+    assert analyze.main(argv) == 0
+    first = json.loads(baseline_path.read_text(encoding="utf-8"))
+    assert first["sources"] == [
+        {
+            "log": str(log_path),
+            "rows": 6,
+            "offset": log_path.stat().st_size,
+            "prefix_digest": first["sources"][0]["prefix_digest"],
+        }
+    ]
+    assert first["tests"][0][:2] == ["test_a", 6]
+
+    # Re-running on the same log must not fold the same rows in twice.
+    assert analyze.main(argv) == 0
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["tests"][0][1] == 6
+
+    # A reset log is compared against the stored baseline from previous runs.
+    _write_log(log_path, _duration_entries("test_a", [300]))
+    assert analyze.main(argv) == 0
+
+    samples = json.loads((tmp_path / "reports" / "samples_general.json").read_text(encoding="utf-8"))
+    regressions = samples["regressions"]["regressions"]
+    assert [record["name"] for record in regressions] == ["test_a"]
+    assert regressions[0]["baseline_runs"] == 6
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "## Slowest tests / biggest regressions" in report
+    assert "- regression: test_a 300 ms vs baseline 100.0 ms over 6 runs" in report
+    assert json.loads(baseline_path.read_text(encoding="utf-8"))["tests"][0][1] == 7
+
+
+def test_report_states_when_no_regressions(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    _write_log(tmp_path / "logs" / "test.jsonl", _duration_entries("test_a", [5, 6]))
+
+    assert analyze.main(["--root", str(tmp_path)]) == 0
+
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "- slow: test_a (6 ms latest)" in report
+    assert "- No duration regressions detected" in report
+
+
+_MULTI_TARGET_MANIFEST = """targets:
+  - name: unit
+    logs: ["logs/unit.jsonl"]
+  - name: integration
+    logs:
+      - logs/integration-a.jsonl  # shard a
+      - "logs/integration-b.jsonl"
+  - name: e2e
+    logs: [logs/e2e.jsonl, logs/missing.jsonl]
+report:
+  output: "reports/today.md"
+"""
+
+
+def _prepare_multi_target_root(tmp_path: Path) -> None:
+    (tmp_path / "reflection.yaml").write_text(_MULTI_TARGET_MANIFEST, encoding="utf-8")
+    _write_log(
+        tmp_path / "logs" / "unit.jsonl",
+        _duration_entries("unit::a", [5, 6]) + [{"name": "unit::b", "status": "fail", "duration_ms": 7}],
+    )
+    _write_log(tmp_path / "logs" / "integration-a.jsonl", _duration_entries("int::a", [50]))
+    _write_log(
+        tmp_path / "logs" / "integration-b.jsonl",
+        [{"name": "int::a", "status": "fail", "duration_ms": 70}],
+    )
+    _write_log(tmp_path / "logs" / "e2e.jsonl", _duration_entries("e2e::login", [900, 950]))
+
+
+@pytest.mark.parametrize("yaml_available", [True, False])
+def test_main_analyzes_every_target_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, yaml_available: bool
+) -> None:
+    analyze = load_analyze_module()
+    _prepare_multi_target_root(tmp_path)
+    if not yaml_available:
+        import builtins
+
+        original_import = builtins.__import__
+
+        def _missing_yaml_import(name: str, *args: object, **kwargs: object):
+            if name == "yaml":
+                raise ModuleNotFoundError("forced missing yaml")
+            return original_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", _missing_yaml_import)
+
+    assert analyze.main(["--root", str(tmp_path), "--emit", "report/ping", "--jobs", "4"]) == 0
+
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "- Total tests: 7\n" in report
+    assert "- Failures: 2\n" in report
+    sections = report.split("## Target: ")[1:]
+    assert [section.splitlines()[0] for section in sections] == ["unit", "integration", "e2e"]
+    integration = sections[1]
+    assert "- Total tests: 2\n" in integration
+    assert "- Flaky rate: 100.00%\n" in integration
+    assert "- Duration p95: 950 ms\n" in sections[2]
+    ping = json.loads((tmp_path / "reports" / "ping.json").read_text(encoding="utf-8"))
+    assert ping["targets"]["unit"] == {
+        "status": "degraded",
+        "total_tests": 3,
+        "failures": ["unit::b"],
+    }
+    assert ping["targets"]["e2e"]["status"] == "ok"
+
+
+def test_detect_duration_regressions_orders_combined_logs_by_timestamp(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    # The slow run is the oldest one, but its log comes last in file order.
+    recent = tmp_path / "recent.jsonl"
+    older = tmp_path / "older.jsonl"
+    _write_log(
+        recent,
+        [
+            {"name": "test_a", "status": "pass", "duration_ms": value, "ts": 100 + index}
+            for index, value in enumerate([100, 101, 99, 100, 102, 98])
+        ],
+    )
+    _write_log(older, [{"name": "test_a", "status": "pass", "duration_ms": 400, "ts": 10}])
+    runs = analyze.TestRunStore.combine(
+        analyze.build_test_run_store(path) for path in (recent, older)
+    )
+
+    result, _ = analyze.detect_duration_regressions(runs)
+
+    assert result["regressions"] == []
+    assert result["slowest"] == [{"name": "test_a", "duration_ms": 98}]
+
+
+def test_load_log_stores_reads_logs_in_thread_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"log-{index}.jsonl"
+        _write_log(path, _duration_entries(f"test_{index}", [index + 1]))
+        paths.append(path)
+    workers: list[int] = []
+    real_executor = analyze.ThreadPoolExecutor
+
+    def _recording_executor(max_workers: int):
+        workers.append(max_workers)
+        return real_executor(max_workers=max_workers)
+
+    monkeypatch.setattr(analyze, "ThreadPoolExecutor", _recording_executor)
+
+    stores = analyze.load_log_stores(paths, jobs=8)
+
+    assert workers == [3]
+    assert [stores[path].tests() for path in paths] == [["test_0"], ["test_1"], ["test_2"]]
+    combined = analyze.TestRunStore.combine(stores.values())
+    assert combined.tests() == ["test_0", "test_1", "test_2"]
+    assert combined.durations.tolist() == [1, 2, 3]
+
+
+def test_main_incremental_merges_target_checkpoints(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    _prepare_multi_target_root(tmp_path)
+    argv = ["--root", str(tmp_path), "--emit", "report"]
+
+    assert analyze.main(argv) == 0
+    full = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert analyze.main([*argv, "--incremental"]) == 0
+    incremental = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+
+    def _target_counts(report: str) -> list[list[str]]:
+        # Name, total, pass rate and flaky rate; p95 is a sketch estimate incrementally.
+        return [section.splitlines()[:4] for section in report.split("## Target: ")[1:]]
+
+    assert _target_counts(incremental) == _target_counts(full)
+    assert len(_target_counts(full)) == 3
+    assert (tmp_path / "logs" / "unit.jsonl.checkpoint.json").exists()
+    assert (tmp_path / "logs" / "e2e.jsonl.checkpoint.json").exists()
+
+    with pytest.raises(SystemExit):
+        analyze.main([*argv, "--incremental", "--checkpoint", str(tmp_path / "one.json")])
+
+
+def test_main_shares_one_model_across_emitters(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    _write_log(
+        tmp_path / "logs" / "test.jsonl",
+        [
+            _timed_entry("test_a", "pass", 10, 1),
+            _timed_entry("test_a", "fail", 90, 31),
+        ],
+    )
+    window_calls: list[object] = []
+    real_window_series = analyze.window_series
+
+    def _tracking_window_series(runs, window, *, step=None):
+        window_calls.append(window)
+        return real_window_series(runs, window, step=step)
+
+    emitter_batches: list[int] = []
+    real_run_emitters = analyze.run_emitters
+
+    def _tracking_run_emitters(tasks, *, jobs):
+        emitter_batches.append(len(tasks))
+        real_run_emitters(tasks, jobs=jobs)
+
+    monkeypatch.setattr(analyze, "window_series", _tracking_window_series)
+    monkeypatch.setattr(analyze, "run_emitters", _tracking_run_emitters)
+
+    argv = ["--root", str(tmp_path), "--emit", "report/samples/ping", "--window", "30m"]
+    assert analyze.main(argv) == 0
+
+    assert len(window_calls) == 1
+    assert emitter_batches == [3]
+    for name in ("today.md", "samples_general.json", "ping.json"):
+        assert (tmp_path / "reports" / name).exists()
+
+
+def test_run_emitters_runs_tasks_concurrently_and_propagates_errors() -> None:
+    analyze = load_analyze_module()
+    import threading
+
+    barrier = threading.Barrier(3, timeout=5)
+    analyze.run_emitters([barrier.wait, barrier.wait, barrier.wait], jobs=3)
+
+    def _boom() -> None:
+        raise RuntimeError("emit failed")
+
+    with pytest.raises(RuntimeError, match="emit failed"):
+        analyze.run_emitters([lambda: None, _boom], jobs=2)
+
+
+def test_emit_samples_shared_entries_match_plain_json(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        [
+            {"name": "tést_ä", "status": "pass", "duration_ms": 5},
+            {"name": "test_b", "status": "fail", "duration_ms": 8},
+        ],
+    )
+    analyze.configure_paths(tmp_path)
+    runs = analyze.build_test_run_store(log_path)
+
+    analyze.emit_samples(manifest={}, focuses=["ops", "dev"], runs=runs, regressions={})
+
+    for focus in ("ops", "dev"):
+        raw = (tmp_path / "reports" / f"samples_{focus}.json").read_text(encoding="utf-8")
+        assert raw == json.dumps(json.loads(raw), ensure_ascii=False, indent=2)
+        assert json.loads(raw)["focus"] == focus
+
+
+def test_main_parses_manifest_once_per_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    analyze = load_analyze_module()
+    _write_log(
+        tmp_path / "logs" / "unit.jsonl",
+        [{"name": "test_a", "status": "fail", "duration_ms": 5}],
+    )
+    (tmp_path / "reflection.yaml").write_text(
+        "targets:\n  - name: unit\n    logs: [\"logs/unit.jsonl\"]\n"
+        "report:\n  output: reports/custom.md\n  include_why_why: false\n"
+        "actions:\n  suggest_issues: false\n",
+        encoding="utf-8",
+    )
+    parses: list[str] = []
+    real_parse = analyze._parse_reflection_manifest
+
+    def _counting_parse(text: str, **kwargs: bool):
+        parses.append(text)
+        return real_parse(text, **kwargs)
+
+    monkeypatch.setattr(analyze, "_parse_reflection_manifest", _counting_parse)
+
+    argv = ["--root", str(tmp_path), "--emit", "report/samples/ping"]
+    assert analyze.main(argv) == 0
+    assert len(parses) == 1
+    report = (tmp_path / "reports" / "custom.md").read_text(encoding="utf-8")
+    assert "Why-Why" not in report
+    assert not (tmp_path / "reports" / "issue_suggestions.md").exists()
+
+    assert analyze.main(argv) == 0
+    assert len(parses) == 1
+
+
+def test_manifest_cache_reparses_changed_file_and_returns_copies(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    reflection_path = tmp_path / "reflection.yaml"
+    reflection_path.write_text("report:\n  output: reports/a.md\n", encoding="utf-8")
+
+    first = analyze.load_reflection_manifest(reflection_path)
+    first["report"]["output"] = "mutated.md"
+    assert analyze.load_reflection_manifest(reflection_path)["report"]["output"] == "reports/a.md"
+
+    reflection_path.write_text("report:\n  output: reports/bb.md\n", encoding="utf-8")
+    assert analyze.load_reflection_manifest(reflection_path)["report"]["output"] == "reports/bb.md"
+    reflection_path.unlink()
+    assert analyze.load_reflection_manifest(reflection_path) == {}
+
+
+def test_resolve_reflection_settings_resolves_every_setting(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    analyze.configure_paths(tmp_path)
+    _write_log(tmp_path / "logs" / "unit.jsonl", [{"name": "test_a", "status": "pass"}])
+    manifest = {
+        "targets": [{"name": "unit", "logs": ["logs/unit.jsonl"]}],
+        "report": {"output": "reports/out.md", "include_why_why": "false"},
+        "actions": {"suggest_issues": False},
+    }
+
+    settings = analyze.resolve_reflection_settings(manifest)
+
+    assert settings.manifest is manifest
+    assert settings.report_path == (tmp_path / "reports" / "out.md").resolve()
+    assert settings.include_why is False
+    assert settings.suggest_issues is False
+    assert settings.targets == [analyze.TargetLogs("unit", [tmp_path.resolve() / "logs" / "unit.jsonl"])]
+    assert settings.log_path == tmp_path.resolve() / "logs" / "unit.jsonl"
+
+
+def _run_entries(name: str, run_statuses: list[list[str]]) -> list[dict[str, object]]:
+    return [
+        {"name": name, "status": status, "duration_ms": 1, "run_id": f"run-{index}"}
+        for index, statuses in enumerate(run_statuses)
+        for status in statuses
+    ]
+
+
+def test_flakiness_engine_separates_retries_from_cross_run_flips(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    log_path = tmp_path / "logs" / "test.jsonl"
+    _write_log(
+        log_path,
+        _run_entries("test_retry", [["pass"], ["fail", "pass"], ["pass"], ["pass"]])
+        + _run_entries("test_flip", [["pass"], ["fail"], ["pass"], ["fail"]])
+        + _run_entries("test_stable", [["pass"], ["pass"], ["pass"], ["pass"]])
+        + _run_entries("test_once", [["fail", "pass"]]),
+    )
+
+    ranked = analyze.score_flakiness([log_path], half_life_runs=1000)
+
+    by_name = {record["name"]: record for record in ranked}
+    assert [record["name"] for record in ranked] == ["test_flip", "test_retry"]
+    assert by_name["test_flip"]["flips"] == 3
+    assert by_name["test_flip"]["retry_runs"] == 0
+    assert by_name["test_flip"]["score"] == pytest.approx(0.75, abs=1e-3)
+    assert by_name["test_retry"]["retry_runs"] == 1
+    assert by_name["test_retry"]["flips"] == 0
+    assert by_name["test_retry"]["runs"] == 4
+
+
+def test_flakiness_engine_decays_old_flips() -> None:
+    analyze = load_analyze_module()
+    engine = analyze.FlakinessEngine(half_life_runs=2)
+    statuses = {
+        "test_old": ["pass", "fail"] + ["fail"] * 10,
+        "test_new": ["pass"] * 10 + ["pass", "fail"],
+    }
+    for run in range(12):
+        for name, outcomes in statuses.items():
+            engine.observe(name, outcomes[run], f"run-{run}")
+    engine.finish()
+
+    ranked = engine.ranked()
+
+    assert [record["name"] for record in ranked] == ["test_new", "test_old"]
+    assert ranked[0]["flips"] == ranked[1]["flips"] == 1
+    assert ranked[0]["score"] > 10 * ranked[1]["score"]
+    assert len(engine.run_index) == 12
+
+
+def test_flakiness_engine_merges_interleaved_runs() -> None:
+    analyze = load_analyze_module()
+    engine = analyze.FlakinessEngine(half_life_runs=2)
+    # Two matrix jobs appending to the same log: records of r1 and r2 interleave.
+    for status, run in [("pass", "r1"), ("fail", "r2"), ("pass", "r1"), ("fail", "r2")] * 3:
+        engine.observe("test_a", status, run)
+    engine.finish()
+
+    (record,) = engine.ranked(min_runs=1)
+
+    assert record["runs"] == 2
+    assert record["flips"] == 1
+    assert record["retry_runs"] == 0
+    assert 0 < record["score"] <= 1
+
+
+def test_flakiness_engine_keeps_only_open_runs_pending() -> None:
+    analyze = load_analyze_module()
+    engine = analyze.FlakinessEngine(half_life_runs=2, lookback_runs=3)
+    peak = 0
+    for run in range(500):
+        for job in range(2):
+            engine.observe("test_a", "pass" if (run + job) % 2 else "fail", f"run-{run}")
+            engine.observe(f"test_{job}", "pass", f"run-{run}")
+            peak = max(peak, max(len(state.pending) for state in engine.tests.values()))
+    # A record arriving after its run was scored is ignored.
+    engine.observe("test_a", "pass", "run-0")
+    engine.finish()
+
+    by_name = {record["name"]: record for record in engine.ranked(min_runs=1)}
+
+    assert peak <= 4
+    assert all(not state.pending for state in engine.tests.values())
+    assert by_name["test_a"]["runs"] == 500
+    assert by_name["test_a"]["retry_runs"] == 500
+
+
+def test_flakiness_engine_groups_legacy_records_by_day() -> None:
+    analyze = load_analyze_module()
+
+    key = analyze.FlakinessEngine.run_key
+    assert key({"run_id": "gh-1", "ts": "2025-01-01T00:00:00Z"}) == "gh-1"
+    assert key({"ts": "2025-01-02T10:00:00Z"}) == "legacy:2025-01-02"
+    assert key({}) == "legacy"
+
+
+def test_main_reports_top_flaky_tests(tmp_path: Path) -> None:
+    analyze = load_analyze_module()
+    _write_log(
+        tmp_path / "logs" / "test.jsonl",
+        _run_entries("test_flip", [["pass"], ["fail"], ["pass"]]),
+    )
+
+    assert analyze.main(["--root", str(tmp_path), "--emit", "report/ping"]) == 0
+
+    report = (tmp_path / "reports" / "today.md").read_text(encoding="utf-8")
+    assert "## Top flaky tests (decayed flip rate per CI run)" in report
+    assert "- test_flip: score" in report
+    ping = json.loads((tmp_path / "reports" / "ping.json").read_text(encoding="utf-8"))
+    assert [record["name"] for record in ping["top_flaky"]] == ["test_flip"]
+    with pytest.raises(SystemExit):
+        analyze.main(["--root", str(tmp_path), "--flaky-half-life", "0"])
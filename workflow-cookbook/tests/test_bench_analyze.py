@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+WORKFLOW_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def bench_analyze(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(WORKFLOW_ROOT / "scripts"))
+    for name in ("bench_analyze", "analyze"):
+        sys.modules.pop(name, None)
+    import bench_analyze
+
+    yield bench_analyze
+    for name in ("bench_analyze", "analyze"):
+        sys.modules.pop(name, None)
+
+
+def test_write_synthetic_log_is_deterministic(bench_analyze, tmp_path: Path) -> None:
+    first = tmp_path / "a.jsonl"
+    second = tmp_path / "b.jsonl"
+    bench_analyze.write_synthetic_log(first, entries=20, tests=4)
+    bench_analyze.write_synthetic_log(second, entries=20, tests=4)
+
+    lines = first.read_text(encoding="utf-8").splitlines()
+    assert lines == second.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len({record["name"] for record in records}) == 4
+    assert all({"name", "status", "duration_ms", "ts"} <= set(record) for record in records)
+
+
+def test_run_benchmark_reports_each_emit_set(bench_analyze) -> None:
+    report = bench_analyze.run_benchmark(entries=40, tests=5, repeats=1)
+
+    sets = report["emit_sets"]
+    assert [entry["emit"] for entry in sets] == list(bench_analyze.EMIT_SETS)
+    assert [entry["targets"] for entry in sets] == [1, 2, 3]
+    assert sets[0]["ratio_to_first"] == 1.0
+    for entry in sets:
+        assert entry["best_seconds"] > 0
+        assert entry["separate_runs_seconds"] > 0
+
+
+def test_main_rejects_non_positive_sizes(bench_analyze, capsys: pytest.CaptureFixture[str]) -> None:
+    assert bench_analyze.main(["--entries", "0"]) == 1
+    assert "must be positive" in capsys.readouterr().err
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+CONTEXT_DIR = Path(__file__).resolve().parents[1] / "tools" / "context"
+
+
+@pytest.fixture()
+def bench_pack(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(CONTEXT_DIR))
+    for name in ("bench_pack", "bench_selection", "pack"):
+        sys.modules.pop(name, None)
+    import bench_pack
+
+    yield bench_pack
+    for name in ("bench_pack", "bench_selection", "pack"):
+        sys.modules.pop(name, None)
+
+
+def test_synthetic_graph_is_deterministic(bench_pack) -> None:
+    first = bench_pack.synthetic_graph(50)
+    second = bench_pack.synthetic_graph(50)
+
+    assert first == second
+    assert len(first["nodes"]) == 50
+    assert len(first["edges"]) == 150
+    assert len({node["id"] for node in first["nodes"]}) == 50
+
+
+def test_run_benchmark_reports_each_size(bench_pack) -> None:
+    report = bench_pack.run_benchmark([40, 80], repeats=1, budget="1k")
+
+    sizes = report["sizes"]
+    assert [entry["nodes"] for entry in sizes] == [40, 80]
+    assert sizes[0]["per_node_ratio"] == 1.0
+    for entry in sizes:
+        assert entry["warm_seconds"] > 0
+        assert entry["sections"] > 0
+        assert "selection" in entry["stages_ms"]
+
+
+def test_main_rejects_bad_sizes(bench_pack, capsys: pytest.CaptureFixture[str]) -> None:
+    assert bench_pack.main(["--sizes", "10/x"]) == 1
+    assert bench_pack.main(["--sizes", "0"]) == 1
+    assert "--sizes" in capsys.readouterr().err
+
+
+def test_selection_benchmark_compares_engines_on_one_objective(bench_pack) -> None:
+    import bench_selection
+
+    report = bench_selection.run_benchmark([300], repeats=1, budget=2_000)
+
+    engines = report["sizes"][0]["engines"]
+    assert set(engines) == {"greedy", "lazy"}
+    assert engines["greedy"]["objective_ratio"] == 1.0
+    assert engines["lazy"]["objective"] >= engines["greedy"]["objective"]
+    for entry in engines.values():
+        assert entry["token_in"] <= 2_000
+    assert bench_selection.main(["--budget", "0"]) == 1
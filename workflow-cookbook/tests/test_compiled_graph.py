@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+CONTEXT_DIR = Path(__file__).resolve().parents[1] / "tools" / "context"
+
+
+@pytest.fixture()
+def compiled_graph(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(CONTEXT_DIR))
+    sys.modules.pop("compiled_graph", None)
+    import compiled_graph
+
+    return compiled_graph
+
+
+def _graph() -> dict[str, object]:
+    return {
+        "nodes": [
+            {"id": "a", "path": "docs/a.md", "heading": "Build Pipeline", "tok": 10},
+            {"id": "b", "path": "docs/b.md", "heading": "Ops", "tokens": 20.5},
+            {"id": "c", "path": "docs/c.md", "heading": ""},
+        ],
+        "edges": [
+            {"src": "a", "dst": "b"},
+            {"src": "a", "dst": "b"},
+            {"src": "b", "dst": "c"},
+            {"src": "c", "dst": "missing"},
+            {"src": "missing", "dst": "a"},
+        ],
+    }
+
+
+def test_compile_graph_builds_csr_and_token_caches(compiled_graph) -> None:
+    graph = compiled_graph.compile_graph(_graph(), "digest")
+
+    assert graph.ids == ["a", "b", "c"]
+    assert graph.index == {"a": 0, "b": 1, "c": 2}
+    assert list(graph.indptr) == [0, 2, 3, 3]
+    assert list(graph.out_edges(0)) == [1, 1]
+    assert list(graph.out_degree) == [2, 1, 0]
+    assert list(graph.hub_degree) == [2, 1, 1]
+    assert list(graph.neighbours(1)) == [0, 2]
+    assert list(graph.neighbours(2)) == [1]
+    assert list(graph.tokens) == [10, 20, 0]
+    assert graph.node_tokens[0] == frozenset({"build", "pipeline", "docs", "a", "md"})
+    assert list(graph.token_sizes) == [5, 4, 3]
+    assert list(graph.postings("docs")) == [0, 1, 2]
+    assert list(graph.postings("pipeline")) == [0]
+    assert list(graph.postings("absent")) == []
+
+
+def test_load_compiled_graph_reuses_artifact_until_graph_changes(
+    compiled_graph, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    graph_path = tmp_path / "graph.json"
+    graph_path.write_text(json.dumps(_graph()), encoding="utf-8")
+    compiles: list[str] = []
+    real_compile = compiled_graph.compile_graph
+
+    def _counting_compile(graph, graph_hash=""):
+        compiles.append(graph_hash)
+        return real_compile(graph, graph_hash)
+
+    monkeypatch.setattr(compiled_graph, "compile_graph", _counting_compile)
+
+    first = compiled_graph.load_compiled_graph(graph_path)
+    second = compiled_graph.load_compiled_graph(graph_path)
+
+    assert compiled_graph.artifact_path_for(graph_path).exists()
+    assert len(compiles) == 1
+    assert second.ids == first.ids
+    assert list(second.indices) == list(first.indices)
+
+    changed = _graph()
+    changed["nodes"].append({"id": "d"})  # type: ignore[attr-defined]
+    graph_path.write_text(json.dumps(changed), encoding="utf-8")
+    third = compiled_graph.load_compiled_graph(graph_path)
+
+    assert len(compiles) == 2
+    assert third.ids == ["a", "b", "c", "d"]
+
+
+def test_load_compiled_graph_ignores_corrupt_artifact(compiled_graph, tmp_path: Path) -> None:
+    graph_path = tmp_path / "graph.json"
+    graph_path.write_text(json.dumps(_graph()), encoding="utf-8")
+    compiled_graph.artifact_path_for(graph_path).write_bytes(b"not an artifact")
+
+    graph = compiled_graph.load_compiled_graph(graph_path)
+
+    assert graph.ids == ["a", "b", "c"]
+    reloaded = compiled_graph.load_compiled_graph(graph_path)
+    assert reloaded.graph_hash == graph.graph_hash
+
+
+def test_artifact_round_trips_without_pickle(compiled_graph, tmp_path: Path) -> None:
+    graph = compiled_graph.compile_graph(_graph(), "digest")
+    path = tmp_path / "graph.json.compiled"
+    compiled_graph.write_payload(path, graph.to_payload())
+
+    restored = compiled_graph.CompiledGraph.from_payload(compiled_graph.read_payload(path))
+
+    assert restored == graph
+    assert restored.indptr.typecode == "l"
+    assert restored.tokens.typecode == "q"
+    assert list(restored.postings("docs")) == [0, 1, 2]
+
+
+def test_read_payload_rejects_pickles_and_tampered_data(compiled_graph, tmp_path: Path) -> None:
+    import pickle
+
+    path = tmp_path / "state.bin"
+    path.write_bytes(pickle.dumps({"version": compiled_graph.ARTIFACT_VERSION}))
+    assert compiled_graph.read_payload(path) is None
+
+    compiled_graph.write_payload(path, {"ranks": [0.5, 0.5], "updates": 1})
+    data = bytearray(path.read_bytes())
+    assert compiled_graph.read_payload(path) == {"ranks": [0.5, 0.5], "updates": 1}
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert compiled_graph.read_payload(path) is None
@@ -7,23 +7,43 @@ import sys
 from pathlib import Path
 from types import ModuleType
 
+import pytest
+
 
 def _write_json(path: Path, payload: dict[str, object]) -> None:
     path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
 
+def _graph_nodes(headings: dict[str, str]) -> list[dict[str, object]]:
+    return [
+        {"id": node_id, "path": f"docs/{node_id}.md", "heading": heading, "tok": 10}
+        for node_id, heading in headings.items()
+    ]
+
+
+def _write_graph(path: Path, nodes: list[dict[str, object]], edges: list[tuple[str, str]]) -> Path:
+    _write_json(path, {"nodes": nodes, "edges": [{"src": src, "dst": dst} for src, dst in edges]})
+    return path
+
+
+def _generate_pack(
+    pack: ModuleType, graph_path: Path, *extra: str, intent: str = "build", budget: str = "100"
+) -> dict[str, object]:
+    """Run ``pack.py --ppr`` on ``graph_path`` with the default config plus ``extra`` flags."""
+    argv = ["--graph", str(graph_path), "--output", str(graph_path.with_name("pack.json"))]
+    argv += ["--intent", intent, "--budget", budget, "--ppr", *extra]
+    return pack.generate_pack(pack._build_parser().parse_args(argv))
+
+
 def _load_pack_module() -> ModuleType:
     root = Path(__file__).resolve().parents[1]
+    context_dir = str(root / "tools" / "context")
+    # Mirror ``python tools/context/pack.py`` so sibling modules resolve.
+    if context_dir not in sys.path:
+        sys.path.insert(0, context_dir)
     spec = importlib.util.spec_from_file_location("workflow_context_pack", root / "tools" / "context" / "pack.py")
     if spec is None or spec.loader is None:
         raise RuntimeError("Failed to load context pack module")
-    if "ppr" not in sys.modules:
-        stub = ModuleType("ppr")
-        def _personalize_scores(*args, **kwargs):
-            return {}
-
-        stub.personalize_scores = _personalize_scores  # type: ignore[attr-defined]
-        sys.modules["ppr"] = stub
     module = importlib.util.module_from_spec(spec)
     sys.modules[spec.name] = module
     spec.loader.exec_module(module)
@@ -32,7 +52,7 @@ def _load_pack_module() -> ModuleType:
 
 def test_base_signals_role_scores() -> None:
     pack = _load_pack_module()
-    cfg = pack._load_config(Path(__file__).resolve().parents[1] / "tools" / "context" / "config.yaml")
+    cfg = pack.load_config(Path(__file__).resolve().parents[1] / "tools" / "context" / "config.yaml")
     profile = {"keywords": set(), "role": "impl"}
 
     node_common = {
@@ -54,6 +74,28 @@ def test_base_signals_role_scores() -> None:
     assert missing_signals["role"] == 0.4
 
 
+def test_intent_scores_match_full_scan() -> None:
+    pack = _load_pack_module()
+    import compiled_graph
+
+    graph = compiled_graph.compile_graph(
+        {
+            "nodes": [
+                {"id": "a", "path": "docs/build.md", "heading": "Build Pipeline"},
+                {"id": "b", "path": "docs/ops.md", "heading": "Operations"},
+                {"id": "c", "path": "src/build.py", "heading": "Build"},
+            ]
+        }
+    )
+    keywords = pack._intent_profile("implement build pipeline")["keywords"]
+
+    sparse = pack._intent_scores(graph, keywords)
+
+    assert set(sparse) == {0, 2}
+    for idx, node in enumerate(graph.nodes):
+        assert sparse.get(idx, 0.0) == pack._intent_match(keywords, node)
+
+
 def test_pack_generates_ppr_scores(tmp_path: Path) -> None:
     graph = {
         "nodes": [
@@ -126,3 +168,127 @@ def test_pack_generates_ppr_scores(tmp_path: Path) -> None:
     assert "ppr" in first["why"], "why block should include ppr score"
     assert payload["metrics"]["token_in"] <= 400
     assert payload["metrics"]["token_in"] > 0
+
+
+def test_generate_pack_reuses_compiled_graph(tmp_path: Path) -> None:
+    pack = _load_pack_module()
+    graph_path = _write_graph(tmp_path / "graph.json", _graph_nodes({"a": "Build", "b": "Ops"}), [("a", "b")])
+
+    uncached = _generate_pack(pack, graph_path, "--no-graph-cache")
+    artifact = tmp_path / "graph.json.compiled"
+    assert not artifact.exists()
+    first = _generate_pack(pack, graph_path)
+    assert artifact.exists()
+    second = _generate_pack(pack, graph_path)
+
+    assert sorted(section["id"] for section in first["sections"]) == ["a", "b"]
+    assert first["sections"] == second["sections"] == uncached["sections"]
+
+
+def test_generate_pack_warm_starts_from_ppr_state(tmp_path: Path) -> None:
+    pack = _load_pack_module()
+    graph_path = _write_graph(
+        tmp_path / "graph.json",
+        _graph_nodes({"a": "Build", "b": "Ops", "c": "Spec"}),
+        [("a", "b"), ("b", "c"), ("c", "a")],
+    )
+    state = tmp_path / "state" / "ppr.bin"
+
+    cold = _generate_pack(pack, graph_path)
+    lazy = _generate_pack(pack, graph_path, "--selection", "lazy")
+    assert lazy["metrics"]["objective"] >= cold["metrics"]["objective"] > 0
+    _generate_pack(pack, graph_path, "--ppr-state", str(state), intent="ops")
+    assert state.exists()
+    warm = _generate_pack(pack, graph_path, "--ppr-state", str(state))
+    pushed = _generate_pack(pack, graph_path, "--ppr-method", "push")
+
+    for section in (warm, pushed):
+        assert [s["id"] for s in section["sections"]] == [s["id"] for s in cold["sections"]]
+    for left, right in zip(cold["sections"], warm["sections"]):
+        assert abs(left["why"]["ppr"] - right["why"]["ppr"]) < 1e-3
+
+
+def test_push_computes_uniform_ranks_once_and_reuses_ppr_state(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pack = _load_pack_module()
+    graph_path = _write_graph(
+        tmp_path / "graph.json",
+        _graph_nodes({"a": "Build", "b": "Ops", "c": "Dangling"}),
+        [("a", "b"), ("b", "c")],
+    )
+    state = tmp_path / "ppr.state"
+    calls: list[int] = []
+    real_uniform_ranks = pack.uniform_ranks
+
+    def _counting_uniform_ranks(graph, cfg, transition=None):
+        calls.append(graph.size)
+        return real_uniform_ranks(graph, cfg, transition)
+
+    monkeypatch.setattr(pack, "uniform_ranks", _counting_uniform_ranks)
+
+    plain = _generate_pack(pack, graph_path, "--ppr-method", "push")
+    assert calls == [3]
+    first = _generate_pack(pack, graph_path, "--ppr-method", "push", "--ppr-state", str(state))
+    second = _generate_pack(pack, graph_path, "--ppr-method", "push", "--ppr-state", str(state))
+
+    assert calls == [3, 3]
+    assert "ppr_global" in second["metrics"]["cost"]["stages_ms"]
+    assert not state.read_bytes().startswith(b"\x80")
+    for section in (first, second):
+        assert [s["id"] for s in section["sections"]] == [s["id"] for s in plain["sections"]]
+
+
+def test_ppr_state_is_repaired_incrementally_after_edge_changes(tmp_path: Path) -> None:
+    pack = _load_pack_module()
+    import compiled_graph
+
+    nodes = [
+        {"id": f"n{idx}", "path": f"docs/f{idx % 4}.md", "heading": f"Build step {idx}", "tok": 10}
+        for idx in range(12)
+    ]
+    edges = [(f"n{idx}", f"n{(idx * 5 + 1) % 12}") for idx in range(12)]
+    graph_path = _write_graph(tmp_path / "graph.json", nodes, edges)
+    state = tmp_path / "ppr.state"
+
+    _generate_pack(pack, graph_path, "--ppr-state", str(state), budget="1k")
+    cold = compiled_graph.read_payload(state)
+    assert cold["updates"] == 0
+    # Cold power packs leave the uniform vector to the first repair.
+    assert cold["global_ranks"] is None
+
+    _write_graph(graph_path, nodes, edges[1:] + [("n0", "n7")])
+    repaired = _generate_pack(pack, graph_path, "--ppr-state", str(state), budget="1k")
+    fresh = _generate_pack(pack, graph_path, budget="1k")
+
+    repaired_state = compiled_graph.read_payload(state)
+    assert repaired_state["updates"] == 1
+    assert len(repaired_state["global_ranks"]) == 12
+    expected = {section["id"]: section["why"]["ppr"] for section in fresh["sections"]}
+    for section in repaired["sections"]:
+        assert abs(section["why"]["ppr"] - expected[section["id"]]) < 1e-3
+
+
+def test_pack_metrics_report_stage_costs_and_profile(tmp_path: Path) -> None:
+    pack = _load_pack_module()
+    graph_path = _write_graph(
+        tmp_path / "graph.json", _graph_nodes({"a": "Build", "b": "Ops"}), [("a", "b"), ("b", "a")]
+    )
+    profile_path = tmp_path / "profile" / "pack.txt"
+
+    payload = _generate_pack(pack, graph_path, "--profile", str(profile_path))
+
+    cost = payload["metrics"]["cost"]
+    stages = cost["stages_ms"]
+    assert {"graph_load", "signals", "ppr", "neighbourhood", "selection", "total"} <= set(stages)
+    assert stages["total"] >= stages["ppr"] >= 0
+    assert cost["ppr"]["method"] == "power"
+    # Either converged below limits.tol or stopped at limits.iters.
+    assert 1 <= cost["ppr"]["iterations"] <= 50
+    assert cost["ppr"]["residual"] < 1e-6 or cost["ppr"]["iterations"] == 50
+    assert cost["candidates"] == 2
+    assert cost["python_peak_mb"] > 0
+    assert "process_peak_rss_mb" in cost
+    assert "cumulative" in profile_path.read_text(encoding="utf-8")
+    written = json.loads((tmp_path / "pack.json").read_text(encoding="utf-8"))
+    assert written["metrics"]["cost"]["python_peak_mb"] == cost["python_peak_mb"]
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import http.client
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+CONTEXT_DIR = Path(__file__).resolve().parents[1] / "tools" / "context"
+CONFIG_PATH = CONTEXT_DIR / "config.yaml"
+
+
+@pytest.fixture()
+def pack_server(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(CONTEXT_DIR))
+    for name in ("pack_server", "pack"):
+        sys.modules.pop(name, None)
+    import pack_server
+
+    yield pack_server
+    for name in ("pack_server", "pack"):
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture()
+def graph_path(tmp_path: Path) -> Path:
+    graph = {
+        "nodes": [
+            {"id": "build", "path": "docs/runbook.md", "heading": "Build Pipeline", "tok": 100, "role": "impl"},
+            {"id": "ops", "path": "docs/runbook.md", "heading": "Operations Guide", "tok": 120, "role": "ops"},
+            {"id": "spec", "path": "docs/spec.md", "heading": "Pipeline Spec", "tok": 150, "role": "spec"},
+            {"id": "misc", "path": "docs/misc.md", "heading": "Misc", "tok": 90},
+        ],
+        "edges": [
+            {"src": "build", "dst": "ops"},
+            {"src": "ops", "dst": "spec"},
+            {"src": "spec", "dst": "build"},
+            {"src": "misc", "dst": "spec"},
+        ],
+    }
+    path = tmp_path / "graph.json"
+    path.write_text(json.dumps(graph), encoding="utf-8")
+    return path
+
+
+def test_service_matches_pack_cli(pack_server, graph_path: Path, tmp_path: Path) -> None:
+    import pack
+
+    service = pack_server.PackService(graph_path, CONFIG_PATH)
+    args = pack._build_parser().parse_args(
+        ["--graph", str(graph_path), "--output", str(tmp_path / "pack.json"), "--intent", "build pipeline"]
+        + ["--budget", "300", "--diff", "docs/spec.md"]
+    )
+    expected = pack.generate_pack(args)
+
+    actual = service.handle({"intent": "build pipeline", "budget": "300", "diff": ["docs/spec.md"]})
+
+    assert actual["sections"] == expected["sections"]
+    # Cost figures are timings of this particular run.
+    actual["metrics"].pop("cost")
+    expected["metrics"].pop("cost")
+    assert actual["metrics"] == expected["metrics"]
+
+
+def test_service_warm_starts_ppr_from_similar_intents(pack_server, graph_path: Path) -> None:
+    service = pack_server.PackService(graph_path, CONFIG_PATH, ppr=True)
+
+    first = service.handle({"intent": "implement build pipeline", "budget": "1k"})
+    again = service.handle({"intent": "implement build pipeline", "budget": "1k"})
+    similar = service.handle({"intent": "implement build pipeline docs", "budget": "1k"})
+    unrelated = service.handle({"intent": "operations", "budget": "1k"})
+
+    assert [s["id"] for s in again["sections"]] == [s["id"] for s in first["sections"]]
+    # The warm start keeps iterating from where the capped cold run stopped.
+    for left, right in zip(first["sections"], again["sections"]):
+        assert right["why"]["ppr"] == pytest.approx(left["why"]["ppr"], abs=1e-3)
+    assert similar["sections"] and unrelated["sections"]
+    assert service.vectors.stats() == {"entries": 3, "hits": 1, "warm_starts": 1, "misses": 2}
+
+
+def test_service_serves_forward_push_requests(pack_server, graph_path: Path) -> None:
+    service = pack_server.PackService(graph_path, CONFIG_PATH, ppr=True, ppr_method="push")
+
+    pushed = service.handle({"intent": "implement build pipeline", "budget": "1k"})
+    power = service.handle({"intent": "implement build pipeline", "budget": "1k", "ppr_method": "power"})
+
+    assert [s["id"] for s in pushed["sections"]] == [s["id"] for s in power["sections"]]
+    with pytest.raises(pack_server.PackRequestError):
+        service.handle({"intent": "build", "budget": "1k", "ppr_method": "magic"})
+
+
+def test_service_parses_ppr_flag_strings(pack_server, graph_path: Path) -> None:
+    service = pack_server.PackService(graph_path, CONFIG_PATH)
+    base = {"intent": "build pipeline", "budget": "300"}
+
+    def _sections(request: dict[str, object]) -> list[str]:
+        return [section["id"] for section in service.handle(request)["sections"]]
+
+    assert _sections({**base, "ppr": "false"}) == _sections(base)
+    assert _sections({**base, "ppr": "true"}) == _sections({**base, "ppr": True})
+    with pytest.raises(pack_server.PackRequestError, match="ppr"):
+        service.handle({**base, "ppr": "maybe"})
+
+
+def test_batch_mode_keeps_order_and_reports_errors(pack_server, graph_path: Path, tmp_path: Path) -> None:
+    requests = tmp_path / "requests.jsonl"
+    lines = [
+        {"id": 1, "intent": "build pipeline", "budget": "300"},
+        {"id": 2, "intent": "", "budget": "300"},
+        {"id": 3, "intent": "operations", "budget": "1k", "ppr": True},
+    ]
+    requests.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+    output = tmp_path / "out" / "responses.jsonl"
+
+    code = pack_server.main(
+        ["--graph", str(graph_path), "--batch", str(requests), "--output", str(output), "--jobs", "3"]
+    )
+
+    responses = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert code == 1
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    assert "intent" in responses[1]["error"]
+    assert responses[0]["sections"] and responses[2]["sections"]
+
+
+def test_http_server_answers_pack_requests(pack_server, graph_path: Path) -> None:
+    service = pack_server.PackService(graph_path, CONFIG_PATH)
+    server = pack_server.build_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def _post(path: str, payload: object) -> tuple[int, object]:
+        request = urllib.request.Request(
+            base + path, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    try:
+        status, pack = _post("/pack", {"intent": "build pipeline", "budget": "300"})
+        assert status == 200
+        assert pack["sections"]
+        status, batch = _post("/batch", [{"intent": "build", "budget": "1k"}, {"budget": "1k"}])
+        assert status == 200
+        assert "sections" in batch[0] and "error" in batch[1]
+        status, error = _post("/pack", {"intent": "build", "budget": "lots"})
+        assert status == 400
+        assert "budget" in error["error"]
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        try:
+            connection.putrequest("POST", "/pack")
+            connection.putheader("Content-Length", "many")
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == 400
+            assert "Content-Length" in json.loads(response.read())["error"]
+        finally:
+            connection.close()
+        with urllib.request.urlopen(base + "/healthz", timeout=5) as response:
+            assert json.loads(response.read()) == {"status": "ok", "nodes": 4}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def test_http_batches_use_configured_jobs(pack_server, graph_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = pack_server.PackService(graph_path, CONFIG_PATH)
+    seen: list[int] = []
+    handle_many = service.handle_many
+
+    def _recording_handle_many(requests, *, jobs=pack_server.DEFAULT_JOBS):
+        seen.append(jobs)
+        return handle_many(requests, jobs=jobs)
+
+    monkeypatch.setattr(service, "handle_many", _recording_handle_many)
+    server = pack_server.build_server(service, port=0, jobs=3)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}/batch",
+            data=json.dumps([{"intent": "build", "budget": "1k"}] * 2).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert len(json.loads(response.read())) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+    assert seen == [3]
+
+    built: list[int] = []
+
+    class _StoppedServer:
+        server_address = ("127.0.0.1", 0)
+
+        def serve_forever(self) -> None:
+            raise KeyboardInterrupt
+
+        def server_close(self) -> None:
+            pass
+
+    def _build_server(service, host, port, *, jobs):
+        built.append(jobs)
+        return _StoppedServer()
+
+    monkeypatch.setattr(pack_server, "build_server", _build_server)
+    assert pack_server.main(["--graph", str(graph_path), "--jobs", "5"]) == 0
+    assert built == [5]
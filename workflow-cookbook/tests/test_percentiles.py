@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+import random
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+
+def _load_percentiles_module() -> ModuleType:
+    module_path = Path(__file__).resolve().parents[1] / "scripts" / "percentiles.py"
+    spec = importlib.util.spec_from_file_location("workflow_percentiles", module_path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError("Failed to load percentiles module")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+percentiles = _load_percentiles_module()
+
+
+def _nearest_rank(values: list[int], pct: float) -> int:
+    ordered = sorted(values)
+    return ordered[min(math.ceil(pct / 100 * (len(ordered) - 1)), len(ordered) - 1)]
+
+
+def test_select_matches_sorted_order_with_duplicates() -> None:
+    rng = random.Random(7)
+    values = [rng.randint(0, 50) for _ in range(500)]
+    ordered = sorted(values)
+
+    for k in (0, 1, 249, 250, 498, 499):
+        assert percentiles.select(values, k) == ordered[k]
+    assert len(values) == 500 and values != ordered  # input left untouched
+
+    with pytest.raises(IndexError):
+        percentiles.select(values, 500)
+
+
+def test_percentiles_match_nearest_rank() -> None:
+    rng = random.Random(11)
+    values = [rng.randint(0, 10_000) for _ in range(1_001)]
+    pcts = (99, 50, 90, 0, 100, 95)
+
+    result = percentiles.percentiles(values, pcts)
+
+    assert list(result) == [0, 50, 90, 95, 99, 100]
+    for pct in pcts:
+        assert result[pct] == _nearest_rank(values, pct)
+    assert percentiles.percentiles([], (50,)) == {50: 0}
+    assert percentiles.percentile([3], 99) == 3
+
+
+def test_parse_percentiles_accepts_labels_and_rejects_out_of_range() -> None:
+    assert percentiles.parse_percentiles(None) == (50.0, 90.0, 99.0)
+    assert percentiles.parse_percentiles("p99/50/90,99.9") == (50.0, 90.0, 99.0, 99.9)
+    assert percentiles.percentile_label(99.9) == "p99.9"
+
+    with pytest.raises(ValueError):
+        percentiles.parse_percentiles("150")
+    with pytest.raises(ValueError):
+        percentiles.parse_percentiles("fast")
+
+
+def test_summarize_uses_sketch_beyond_exact_limit() -> None:
+    values = list(range(1, 5_001))
+
+    exact = percentiles.summarize(values, (50, 99))
+    approximate = percentiles.summarize(values, (50, 99), exact_limit=1_000)
+
+    assert exact == {50: 2501, 99: 4951}
+    for pct, value in exact.items():
+        assert approximate[pct] == pytest.approx(value, rel=0.02)
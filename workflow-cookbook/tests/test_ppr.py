@@ -2,6 +2,8 @@ import importlib.util
 from pathlib import Path
 import math
 
+import pytest
+
 
 _DEF_PPR_PATH = Path(__file__).resolve().parents[1] / "tools" / "context" / "ppr.py"
 
@@ -28,3 +30,146 @@ def test_personalize_scores_uniform_seed_when_no_base_scores():
     assert math.isclose(ranks["a"], 0.5, rel_tol=1e-9)
     assert math.isclose(ranks["b"], 0.5, rel_tol=1e-9)
     assert math.isclose(sum(ranks.values()), 1.0, rel_tol=1e-9)
+
+
+def _random_graph(size: int, edge_count: int, seed: int = 7):
+    import random
+
+    rng = random.Random(seed)
+    nodes = [{"id": f"n{idx}"} for idx in range(size)]
+    edges = [
+        {"src": f"n{rng.randrange(size)}", "dst": f"n{rng.randrange(size)}"}
+        for _ in range(edge_count)
+    ]
+    # Unknown endpoints are ignored; nodes past size // 2 often stay dangling.
+    edges.append({"src": "n0", "dst": "missing"})
+    base_scores = {f"n{idx}": rng.random() for idx in range(0, size, 3)}
+    return nodes, edges, base_scores
+
+
+def test_personalize_scores_rejects_unknown_backend():
+    module = _load_ppr_module()
+
+    try:
+        module.personalize_scores([{"id": "a"}], [], {}, backend="gpu")
+    except ValueError as exc:
+        assert "gpu" in str(exc)
+    else:  # pragma: no cover - defensive
+        raise AssertionError("unknown backend should raise")
+
+
+def test_python_backend_follows_edges_and_spreads_dangling_mass():
+    module = _load_ppr_module()
+    nodes = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    edges = [{"src": "a", "dst": "b"}, {"src": "b", "dst": "a"}]
+
+    ranks = module.personalize_scores(
+        nodes, edges, {"a": 1.0}, lam=0.85, iters=200, tol=1e-12, backend="python"
+    )
+
+    assert ranks["a"] > ranks["b"] > ranks["c"] > 0
+    assert math.isclose(sum(ranks.values()), 1.0, rel_tol=1e-9)
+
+
+def test_numpy_backend_matches_python_scores():
+    pytest.importorskip("numpy")
+    module = _load_ppr_module()
+    nodes, edges, base_scores = _random_graph(300, 900)
+
+    expected = module.personalize_scores(nodes, edges, base_scores, backend="python", tol=1e-12, iters=200)
+    actual = module.personalize_scores(nodes, edges, base_scores, backend="numpy", tol=1e-12, iters=200)
+
+    assert actual.keys() == expected.keys()
+    for node_id, value in expected.items():
+        assert math.isclose(actual[node_id], value, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_numpy_backend_without_scipy_matches_python_scores(monkeypatch):
+    pytest.importorskip("numpy")
+    module = _load_ppr_module()
+    monkeypatch.setattr(module, "sparse", None)
+    nodes, edges, base_scores = _random_graph(120, 200, seed=11)
+
+    expected = module.personalize_scores(nodes, edges, base_scores, backend="python", iters=5)
+    actual = module.personalize_scores(nodes, edges, base_scores, backend="numpy", iters=5)
+
+    for node_id, value in expected.items():
+        assert math.isclose(actual[node_id], value, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_personalize_vector_warm_start_reaches_same_fixed_point():
+    module = _load_ppr_module()
+    nodes, edges, base_scores = _random_graph(150, 400, seed=5)
+    ids, src_index, dst_index = module._index_graph(nodes, edges)
+    indptr, indices = module.build_csr(len(ids), src_index, dst_index)
+    seed = module.normalise_seed([base_scores.get(node_id, 0.0) for node_id in ids])
+
+    cold = module.personalize_vector(indptr, indices, seed, iters=500, tol=1e-12, backend="python")
+    # Starting from the fixed point, a single iteration must not move it.
+    warm = module.personalize_vector(indptr, indices, seed, iters=1, initial=cold, backend="python")
+
+    for expected, actual in zip(cold, warm):
+        assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-12)
+    with pytest.raises(ValueError):
+        module.personalize_vector(indptr, indices, seed, initial=cold[:-1], backend="python")
+
+
+def test_forward_push_approximates_power_iteration():
+    module = _load_ppr_module()
+    nodes, edges, _base_scores = _random_graph(400, 900, seed=13)
+    ids, src_index, dst_index = module._index_graph(nodes, edges)
+    indptr, indices = module.build_csr(len(ids), src_index, dst_index)
+    seed = {3: 0.75, 40: 0.25}
+    dense_seed = [seed.get(idx, 0.0) for idx in range(len(ids))]
+
+    exact = module.personalize_vector(indptr, indices, dense_seed, iters=500, tol=1e-13, backend="python")
+    coarse = module.forward_push(indptr, indices, seed, eps=1e-4)
+    fine = module.forward_push(indptr, indices, seed, eps=1e-9)
+
+    assert coarse.touched < len(ids)
+    assert coarse.pushes < fine.pushes
+    assert fine.residual < coarse.residual
+    assert math.isclose(sum(fine.ranks), 1.0, rel_tol=1e-9)
+    assert sum(abs(a - b) for a, b in zip(exact, fine.ranks)) < 1e-5
+    assert sum(abs(a - b) for a, b in zip(exact, coarse.ranks)) < 0.05
+
+
+def test_update_vector_repairs_ranks_after_edge_delta():
+    module = _load_ppr_module()
+    nodes, edges, base_scores = _random_graph(300, 700, seed=21)
+    ids, src_index, dst_index = module._index_graph(nodes, edges)
+    size = len(ids)
+    seed = module.normalise_seed([base_scores.get(node_id, 0.0) for node_id in ids])
+    uniform = [1.0 / size] * size
+    old_indptr, old_indices = module.build_csr(size, src_index, dst_index)
+    old = module.personalize_vector(old_indptr, old_indices, seed, iters=1000, tol=1e-14, backend="python")
+    old_global = module.personalize_vector(old_indptr, old_indices, uniform, iters=1000, tol=1e-14, backend="python")
+
+    # Drop every out-edge of one node (it turns dangling), revive a dangling
+    # node and rewire a couple of edges elsewhere.
+    dropped = src_index[0]
+    dangling = next(idx for idx in range(size) if old_indptr[idx] == old_indptr[idx + 1])
+    pairs = [(src, dst) for src, dst in zip(src_index, dst_index) if src != dropped][2:]
+    pairs += [(dangling, 5), (dangling, 9), (11, 12)]
+    indptr, indices = module.build_csr(size, [src for src, _ in pairs], [dst for _, dst in pairs])
+    added, removed = module.edge_delta(old_indptr, old_indices, indptr, indices)
+    assert (dangling, 5) in added and (11, 12) in added
+    assert all((src, dst) in removed for src, dst in zip(src_index, dst_index) if src == dropped)
+
+    expected = module.personalize_vector(indptr, indices, seed, iters=1000, tol=1e-14, backend="python")
+    expected_global = module.personalize_vector(indptr, indices, uniform, iters=1000, tol=1e-14, backend="python")
+    global_update = module.update_global_ranks(indptr, indices, old_global, added, removed, eps=1e-12)
+    update = module.update_vector(
+        indptr, indices, old, added, removed, eps=1e-12, global_ranks=global_update.ranks
+    )
+
+    def _l1(left, right):
+        return sum(abs(a - b) for a, b in zip(left, right))
+
+    assert _l1(expected_global, global_update.ranks) < 1e-8
+    assert _l1(expected, update.ranks) < 1e-8
+    assert _l1(expected, old) > 1e-3
+    # Corrections stay local to the change at a coarse threshold.
+    assert module.update_vector(indptr, indices, old, added, removed, eps=1e-4, global_ranks=expected_global).touched < size
+    with pytest.raises(ValueError):
+        module.update_vector(indptr, indices, old, [(0, size - 1)] * 50, [], global_ranks=expected_global)
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import importlib.machinery
 import importlib.util
+import json
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -73,3 +75,49 @@ def test_main_returns_exit_code_based_on_failures(
     assert type(exit_code) is int  # noqa: E721
     assert exit_code == expected_exit
     assert recorded["had_failures"] is had_failures
+
+
+def test_log_entry_records_utc_timestamp(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    log_file = tmp_path / "test.jsonl"
+    monkeypatch.setattr(run_ci_tests, "LOG_FILE", log_file)
+
+    run_ci_tests.log_entry("python::tests", "pass", 42)
+
+    entry = json.loads(log_file.read_text(encoding="utf-8"))
+    assert entry["name"] == "python::tests"
+    assert entry["duration_ms"] == 42
+    stamp = datetime.fromisoformat(entry["ts"])
+    assert stamp.utcoffset() == timedelta(0)
+
+
+def test_log_entry_records_run_id(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    log_file = tmp_path / "test.jsonl"
+    monkeypatch.setattr(run_ci_tests, "LOG_FILE", log_file)
+    monkeypatch.delenv("DAY8_RUN_ID", raising=False)
+    monkeypatch.delenv("GITHUB_JOB", raising=False)
+    monkeypatch.delenv("DAY8_MATRIX_ID", raising=False)
+    monkeypatch.setenv("GITHUB_RUN_ID", "987")
+
+    run_ci_tests.log_entry("python::tests", "pass", 1)
+    monkeypatch.delenv("GITHUB_RUN_ID")
+    run_ci_tests.log_entry("python::tests", "pass", 1)
+    run_ci_tests.log_entry("node::root", "fail", 1)
+
+    entries = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+    assert entries[0]["run_id"] == "gh-987"
+    assert entries[1]["run_id"].startswith("local-")
+    assert entries[1]["run_id"] == entries[2]["run_id"]
+
+
+def test_run_id_separates_jobs_and_matrix_legs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("DAY8_RUN_ID", raising=False)
+    monkeypatch.setenv("GITHUB_RUN_ID", "987")
+    monkeypatch.setenv("GITHUB_JOB", "tests")
+    monkeypatch.setenv("DAY8_MATRIX_ID", "py3.11")
+    first = run_ci_tests.current_run_id()
+    monkeypatch.setenv("DAY8_MATRIX_ID", "py3.12")
+
+    assert first == "gh-987-tests-py3.11"
+    assert run_ci_tests.current_run_id() == "gh-987-tests-py3.12"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+CONTEXT_DIR = Path(__file__).resolve().parents[1] / "tools" / "context"
+
+
+@pytest.fixture()
+def modules(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.syspath_prepend(str(CONTEXT_DIR))
+    for name in ("compiled_graph", "selection"):
+        sys.modules.pop(name, None)
+    import compiled_graph
+    import selection
+
+    return compiled_graph, selection
+
+
+def _graph(compiled_graph, nodes):
+    return compiled_graph.compile_graph({"nodes": nodes, "edges": []})
+
+
+def test_rank_candidates_orders_by_score_then_graph_order(modules) -> None:
+    _compiled_graph, selection = modules
+    scores = [0.1, 0.5, 0.5, 0.9]
+
+    assert selection.rank_candidates({0, 1, 2, 3}, scores, 3) == [3, 1, 2]
+    assert selection.rank_candidates(range(4), scores, 10) == [3, 1, 2, 0]
+
+
+def test_greedy_select_respects_budget_and_diversity(modules) -> None:
+    compiled_graph, selection = modules
+    graph = _graph(
+        compiled_graph,
+        [
+            {"id": "a", "path": "docs/a.md", "role": "impl", "tok": 50},
+            {"id": "b", "path": "docs/a.md", "role": "impl", "tok": 50},
+            {"id": "c", "path": "docs/c.md", "role": "ops", "tok": 80},
+            {"id": "d", "path": "docs/d.md", "tok": 30},
+        ],
+    )
+    scores = [1.0, 0.9, 0.8, 0.2]
+
+    result = selection.greedy_select(graph, [0, 1, 2, 3], scores, 130, mu_file=0.15, mu_role=0.1)
+
+    assert result.selected == [0, 1, 3]
+    assert result.token_in == 130
+    # "b" shares file and role with "a": penalty 0.9 * (0.15 / 2 + 0.1 / 2).
+    assert result.diversity_penalty == pytest.approx(0.9 * 0.125)
+    assert result.dup_rate == pytest.approx(1 - 2 / 3)
+    # Set objective: "a" and "b" each see one other same-file, same-role section.
+    assert result.objective == pytest.approx(1.0 + 0.9 + 0.2 - (0.15 + 0.1) * (1.0 + 0.9) / 3)
+
+
+def test_pack_objective_is_order_independent(modules) -> None:
+    compiled_graph, selection = modules
+    graph = _graph(
+        compiled_graph,
+        [
+            {"id": "a", "path": "x.md", "role": "impl"},
+            {"id": "b", "path": "x.md", "role": "ops"},
+            {"id": "c", "path": "y.md", "role": "impl"},
+        ],
+    )
+    scores = [0.5, 0.3, 0.2]
+
+    forward = selection.pack_objective(graph, [0, 1, 2], scores, mu_file=0.2, mu_role=0.1)
+    backward = selection.pack_objective(graph, [2, 1, 0], scores, mu_file=0.2, mu_role=0.1)
+
+    assert forward == pytest.approx(backward)
+    assert forward == pytest.approx(1.0 - (0.2 * (0.5 + 0.3) + 0.1 * (0.5 + 0.2)) / 3)
+    assert selection.pack_objective(graph, [], scores, mu_file=0.2, mu_role=0.1) == 0.0
+
+
+def test_lazy_greedy_beats_greedy_when_a_large_section_crowds_out_small_ones(modules) -> None:
+    compiled_graph, selection = modules
+    graph = _graph(
+        compiled_graph,
+        [
+            {"id": "big", "path": "big.md", "tok": 100},
+            {"id": "s1", "path": "s1.md", "tok": 40},
+            {"id": "s2", "path": "s2.md", "tok": 40},
+            {"id": "s3", "path": "s3.md", "tok": 20},
+        ],
+    )
+    scores = [1.0, 0.8, 0.7, 0.3]
+    ranked = selection.rank_candidates(range(4), scores, 4)
+
+    greedy = selection.greedy_select(graph, ranked, scores, 100, mu_file=0.15, mu_role=0.1)
+    lazy = selection.lazy_greedy_select(graph, ranked, scores, 100, mu_file=0.15, mu_role=0.1)
+
+    assert greedy.selected == [0]
+    assert lazy.selected == [1, 2, 3]
+    assert lazy.token_in == 100
+    assert lazy.objective > greedy.objective
+    assert lazy.objective == pytest.approx(
+        selection.pack_objective(graph, lazy.selected, scores, mu_file=0.15, mu_role=0.1)
+    )
+    assert lazy.stats["evaluations"] > 0
@@ -0,0 +1,151 @@
+"""Benchmark context packing on synthetic graphs of increasing size.
+
+Each size is packed once cold (compiling ``graph.json``) and then warm from the
+compiled artifact. Warm time per node should stay roughly flat as the graph
+grows, i.e. packing scales linearly.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Final, Sequence
+
+import pack
+
+DEFAULT_SIZES: Final[tuple[int, ...]] = (6_250, 12_500, 25_000, 50_000)
+DEFAULT_REPEATS: Final[int] = 3
+DEFAULT_BUDGET: Final[str] = "8k"
+ROLES: Final[tuple[str | None, ...]] = ("impl", "ops", "spec", "risk", None)
+WORDS: Final[tuple[str, ...]] = (
+    "build", "deploy", "pipeline", "runbook", "guide", "spec", "api", "cache",
+    "index", "release", "metrics", "review", "schema", "budget", "context",
+)
+
+
+def synthetic_graph(size: int, *, edges_per_node: int = 3, files: int | None = None, seed: int = 8) -> dict[str, Any]:
+    """Return a codemap-like graph with ``size`` heading nodes."""
+    rng = random.Random(seed)
+    file_count = files or max(size // 20, 1)
+    nodes: list[dict[str, Any]] = []
+    for idx in range(size):
+        path = f"docs/area{idx % 17}/file{idx % file_count}.md"
+        node: dict[str, Any] = {
+            "id": f"{path}#h{idx}",
+            "path": path,
+            "heading": " ".join(rng.sample(WORDS, 3)),
+            "depth": 1 + idx % 3,
+            "mtime": f"2025-{1 + idx % 12:02d}-01T00:00:00Z",
+            "tok": rng.randint(20, 400),
+        }
+        role = ROLES[idx % len(ROLES)]
+        if role:
+            node["role"] = role
+        nodes.append(node)
+    edges = [
+        {"src": nodes[rng.randrange(size)]["id"], "dst": nodes[rng.randrange(size)]["id"], "type": "link"}
+        for _ in range(size * edges_per_node)
+    ]
+    return {"nodes": nodes, "edges": edges, "meta": {"version": "1"}}
+
+
+def _pack_args(graph_path: Path, output_path: Path, *, intent: str, budget: str, ppr: bool) -> argparse.Namespace:
+    argv = ["--graph", str(graph_path), "--output", str(output_path), "--intent", intent, "--budget", budget]
+    if ppr:
+        argv.append("--ppr")
+    return pack._build_parser().parse_args(argv)
+
+
+def bench_size(
+    size: int,
+    root: Path,
+    *,
+    repeats: int = DEFAULT_REPEATS,
+    budget: str = DEFAULT_BUDGET,
+    intent: str = "implement build pipeline",
+    ppr: bool = True,
+) -> dict[str, Any]:
+    graph_path = root / f"graph-{size}.json"
+    graph_path.write_text(json.dumps(synthetic_graph(size)), encoding="utf-8")
+    output_path = root / f"pack-{size}.json"
+
+    started = time.perf_counter()
+    pack.generate_pack(_pack_args(graph_path, output_path, intent=intent, budget=budget, ppr=ppr))
+    cold = time.perf_counter() - started
+
+    warm: list[float] = []
+    result: dict[str, Any] = {}
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = pack.generate_pack(_pack_args(graph_path, output_path, intent=intent, budget=budget, ppr=ppr))
+        warm.append(time.perf_counter() - started)
+    best = min(warm)
+    return {
+        "nodes": size,
+        "cold_seconds": round(cold, 6),
+        "warm_seconds": round(best, 6),
+        "warm_us_per_node": round(best / size * 1e6, 3),
+        "sections": len(result.get("sections", [])),
+        "stages_ms": result.get("metrics", {}).get("cost", {}).get("stages_ms", {}),
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    repeats: int = DEFAULT_REPEATS,
+    budget: str = DEFAULT_BUDGET,
+    ppr: bool = True,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="day8-bench-pack-") as tmp:
+        root = Path(tmp)
+        results = [bench_size(size, root, repeats=repeats, budget=budget, ppr=ppr) for size in sizes]
+    smallest = results[0]["warm_us_per_node"] if results else 0.0
+    for result in results:
+        # 1.0 means perfectly linear relative to the smallest graph.
+        result["per_node_ratio"] = round(result["warm_us_per_node"] / smallest, 3) if smallest else 0.0
+    return {
+        "config": {"sizes": list(sizes), "repeats": repeats, "budget": budget, "ppr": ppr},
+        "sizes": results,
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark context pack scaling")
+    parser.add_argument(
+        "--sizes",
+        default="/".join(str(size) for size in DEFAULT_SIZES),
+        help="Slash-separated node counts",
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Warm runs per size")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="Pack token budget")
+    parser.add_argument("--no-ppr", dest="ppr", action="store_false", help="Skip PPR scoring")
+    parser.add_argument("--output", type=Path, help="Optional path to write the JSON report")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        sizes = [int(token) for token in args.sizes.split("/") if token.strip()]
+    except ValueError:
+        print("--sizes must be slash-separated integers", file=sys.stderr)
+        return 1
+    if not sizes or min(sizes) < 1 or args.repeats < 1:
+        print("--sizes and --repeats must be positive", file=sys.stderr)
+        return 1
+    report = run_benchmark(sizes, repeats=args.repeats, budget=args.budget, ppr=args.ppr)
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
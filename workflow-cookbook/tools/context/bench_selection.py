@@ -0,0 +1,115 @@
+"""Compare pack selection engines on large synthetic candidate sets.
+
+Every engine is scored with the same :func:`selection.pack_objective`, so the
+``objective_ratio`` column reads as quality relative to ``greedy``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Final, Sequence
+
+from bench_pack import synthetic_graph
+from compiled_graph import compile_graph
+from selection import ENGINES, rank_candidates
+
+DEFAULT_SIZES: Final[tuple[int, ...]] = (2_000, 10_000, 50_000)
+DEFAULT_REPEATS: Final[int] = 3
+DEFAULT_BUDGET: Final[int] = 8_000
+DEFAULT_MU_FILE: Final[float] = 0.15
+DEFAULT_MU_ROLE: Final[float] = 0.1
+
+
+def _scores(size: int, seed: int = 8) -> list[float]:
+    rng = random.Random(seed)
+    # Heavy-tailed like blended pack scores: a few strong hits, a long tail.
+    return [rng.random() ** 3 for _ in range(size)]
+
+
+def bench_size(
+    size: int,
+    *,
+    repeats: int = DEFAULT_REPEATS,
+    budget: int = DEFAULT_BUDGET,
+    mu_file: float = DEFAULT_MU_FILE,
+    mu_role: float = DEFAULT_MU_ROLE,
+) -> dict[str, Any]:
+    graph = compile_graph(synthetic_graph(size, files=max(size // 50, 1)))
+    scores = _scores(size)
+    ranked = rank_candidates(range(graph.size), scores, size)
+    engines: dict[str, dict[str, Any]] = {}
+    for name, engine in sorted(ENGINES.items()):
+        timings: list[float] = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = engine(graph, ranked, scores, budget, mu_file=mu_file, mu_role=mu_role)
+            timings.append(time.perf_counter() - started)
+        engines[name] = {
+            "best_seconds": round(min(timings), 6),
+            "objective": round(result.objective, 6),
+            "sections": len(result.selected),
+            "token_in": result.token_in,
+            "dup_rate": round(result.dup_rate, 4),
+        }
+    baseline = engines["greedy"]["objective"]
+    for entry in engines.values():
+        entry["objective_ratio"] = round(entry["objective"] / baseline, 4) if baseline else 0.0
+    return {"candidates": size, "engines": engines}
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    repeats: int = DEFAULT_REPEATS,
+    budget: int = DEFAULT_BUDGET,
+) -> dict[str, Any]:
+    return {
+        "config": {
+            "sizes": list(sizes),
+            "repeats": repeats,
+            "budget": budget,
+            "mu_file": DEFAULT_MU_FILE,
+            "mu_role": DEFAULT_MU_ROLE,
+        },
+        "sizes": [bench_size(size, repeats=repeats, budget=budget) for size in sizes],
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark pack selection engines")
+    parser.add_argument(
+        "--sizes",
+        default="/".join(str(size) for size in DEFAULT_SIZES),
+        help="Slash-separated candidate counts",
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Runs per engine and size")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Token budget")
+    parser.add_argument("--output", type=Path, help="Optional path to write the JSON report")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        sizes = [int(token) for token in args.sizes.split("/") if token.strip()]
+    except ValueError:
+        print("--sizes must be slash-separated integers", file=sys.stderr)
+        return 1
+    if not sizes or min(sizes) < 1 or args.repeats < 1 or args.budget < 1:
+        print("--sizes, --repeats and --budget must be positive", file=sys.stderr)
+        return 1
+    report = run_benchmark(sizes, repeats=args.repeats, budget=args.budget)
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+"""Compiled graph artifact for context packing.
+
+``graph.json`` is compiled once into integer node ids, CSR adjacency, degree
+and token-count arrays and an inverted index from heading/path tokens to
+nodes. The artifact is stored next to the graph and reused until the graph's
+SHA-256 changes.
+
+Artifacts are a JSON header followed by raw ``array`` sections, guarded by a
+SHA-256 of everything after it; nothing in them can execute code on load.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+ARTIFACT_VERSION = 3
+ARTIFACT_SUFFIX = ".compiled"
+PAYLOAD_MAGIC = b"D8PAYLD1"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_EMPTY_POSTINGS: array[int] = array("l")
+_ARRAY_TYPECODES = frozenset("bBhHiIlLqQfd")
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def tokenize(text: str) -> set[str]:
+    return {part for part in _TOKEN_PATTERN.findall(text.lower()) if part}
+
+
+def token_count(node: Mapping[str, object]) -> int:
+    for key in ("tok", "tokens", "token_count"):
+        value = node.get(key)
+        if isinstance(value, (int, float)):
+            return int(value)
+    return 0
+
+
+def node_text_tokens(node: Mapping[str, object]) -> frozenset[str]:
+    return frozenset(tokenize(str(node.get("heading", "")) + " " + str(node.get("path", ""))))
+
+
+def graph_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def artifact_path_for(graph_path: Path) -> Path:
+    return graph_path.with_name(graph_path.name + ARTIFACT_SUFFIX)
+
+
+def _csr(size: int, pairs: Sequence[tuple[int, int]]) -> tuple[array[int], array[int]]:
+    indptr = array("l", [0]) * (size + 1)
+    for src, _dst in pairs:
+        indptr[src + 1] += 1
+    for idx in range(size):
+        indptr[idx + 1] += indptr[idx]
+    cursor = array("l", indptr[:-1])
+    indices = array("l", [0]) * len(pairs)
+    for src, dst in pairs:
+        indices[cursor[src]] = dst
+        cursor[src] += 1
+    return indptr, indices
+
+
+def _token_index(node_tokens: Sequence[frozenset[str]]) -> dict[str, array[int]]:
+    index: dict[str, array[int]] = {}
+    for idx, tokens in enumerate(node_tokens):
+        for token in tokens:
+            postings = index.get(token)
+            if postings is None:
+                postings = index[token] = array("l")
+            postings.append(idx)
+    return index
+
+
+@dataclass(frozen=True)
+class CompiledGraph:
+    graph_hash: str
+    ids: list[str]
+    nodes: list[dict[str, Any]]
+    index: dict[str, int]
+    indptr: array[int]
+    indices: array[int]
+    out_degree: array[int]
+    hub_degree: array[int]
+    neighbour_indptr: array[int]
+    neighbour_indices: array[int]
+    tokens: array[int]
+    node_tokens: list[frozenset[str]]
+    token_sizes: array[int]
+    token_index: dict[str, array[int]]
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def out_edges(self, node: int) -> array[int]:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def neighbours(self, node: int) -> array[int]:
+        return self.neighbour_indices[self.neighbour_indptr[node] : self.neighbour_indptr[node + 1]]
+
+    def postings(self, token: str) -> array[int]:
+        """Node ids whose heading/path tokens contain ``token``, in graph order."""
+        return self.token_index.get(token, _EMPTY_POSTINGS)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__dataclass_fields__}
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "CompiledGraph":
+        return cls(**{field: payload[field] for field in cls.__dataclass_fields__})
+
+
+def compile_graph(graph: Mapping[str, Any], graph_hash: str = "") -> CompiledGraph:
+    nodes = [dict(node) for node in graph.get("nodes", [])]
+    ids = [str(node.get("id", "")) for node in nodes]
+    # Later duplicates win, matching the id lookup PPR has always used.
+    index = {node_id: idx for idx, node_id in enumerate(ids)}
+    size = len(ids)
+
+    hub_degree = array("l", [0]) * size
+    directed: list[tuple[int, int]] = []
+    undirected: set[tuple[int, int]] = set()
+    for edge in graph.get("edges", []):
+        src = index.get(str(edge.get("src", "")))
+        if src is None:
+            continue
+        # Hub scores have always counted every out-edge of a known source.
+        hub_degree[src] += 1
+        dst = index.get(str(edge.get("dst", "")))
+        if dst is None:
+            continue
+        directed.append((src, dst))
+        undirected.add((src, dst))
+        undirected.add((dst, src))
+
+    indptr, indices = _csr(size, directed)
+    neighbour_indptr, neighbour_indices = _csr(size, sorted(undirected))
+    out_degree = array("l", (indptr[idx + 1] - indptr[idx] for idx in range(size)))
+    node_tokens = [node_text_tokens(node) for node in nodes]
+    return CompiledGraph(
+        graph_hash=graph_hash,
+        ids=ids,
+        nodes=nodes,
+        index=index,
+        indptr=indptr,
+        indices=indices,
+        out_degree=out_degree,
+        hub_degree=hub_degree,
+        neighbour_indptr=neighbour_indptr,
+        neighbour_indices=neighbour_indices,
+        tokens=array("q", (token_count(node) for node in nodes)),
+        node_tokens=node_tokens,
+        token_sizes=array("l", (len(tokens) for tokens in node_tokens)),
+        token_index=_token_index(node_tokens),
+    )
+
+
+def _encode_field(value: Any, sections: list[bytes], offset: int) -> tuple[dict[str, Any], int]:
+    spec: dict[str, Any]
+    if isinstance(value, array):
+        data = value.tobytes()
+        sections.append(data)
+        spec = {"kind": "array", "typecode": value.typecode, "offset": offset, "size": len(data)}
+        return spec, offset + len(data)
+    if isinstance(value, list) and value and all(isinstance(item, frozenset) for item in value):
+        return {"kind": "sets", "value": [sorted(item) for item in value]}, offset
+    if (
+        isinstance(value, dict)
+        and value
+        and all(isinstance(item, array) and item.typecode == "l" for item in value.values())
+    ):
+        # One concatenated postings section plus offsets keeps token indexes compact.
+        keys = list(value)
+        bounds = array("l", [0])
+        flat: array[int] = array("l")
+        for key in keys:
+            flat.extend(value[key])
+            bounds.append(len(flat))
+        spec = {"kind": "array_map", "keys": keys}
+        spec["bounds"], offset = _encode_field(bounds, sections, offset)
+        spec["values"], offset = _encode_field(flat, sections, offset)
+        return spec, offset
+    return {"kind": "json", "value": value}, offset
+
+
+def _decode_field(spec: Mapping[str, Any], body: bytes) -> Any:
+    kind = spec["kind"]
+    if kind == "array":
+        typecode, offset, size = spec["typecode"], int(spec["offset"]), int(spec["size"])
+        if typecode not in _ARRAY_TYPECODES or offset < 0 or offset + size > len(body):
+            raise ValueError("invalid array section")
+        decoded = array(typecode)
+        decoded.frombytes(body[offset : offset + size])
+        return decoded
+    if kind == "sets":
+        return [frozenset(item) for item in spec["value"]]
+    if kind == "array_map":
+        bounds = _decode_field(spec["bounds"], body)
+        flat = _decode_field(spec["values"], body)
+        keys = spec["keys"]
+        if len(bounds) != len(keys) + 1:
+            raise ValueError("invalid array map")
+        return {key: flat[bounds[idx] : bounds[idx + 1]] for idx, key in enumerate(keys)}
+    if kind == "json":
+        return spec["value"]
+    raise ValueError(f"unknown payload field kind {kind!r}")
+
+
+def encode_payload(payload: Mapping[str, Any]) -> bytes:
+    """Serialise a flat dict of JSON values, arrays, frozenset lists and token indexes."""
+    sections: list[bytes] = []
+    offset = 0
+    fields: dict[str, Any] = {}
+    for key, value in payload.items():
+        fields[key], offset = _encode_field(value, sections, offset)
+    header = json.dumps(
+        {"byteorder": sys.byteorder, "itemsizes": _itemsizes(), "fields": fields},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    content = len(header).to_bytes(4, "little") + header + b"".join(sections)
+    return PAYLOAD_MAGIC + hashlib.sha256(content).digest() + content
+
+
+def decode_payload(data: bytes) -> dict[str, Any] | None:
+    """Inverse of :func:`encode_payload`; ``None`` for foreign, corrupt or non-native data.
+
+    The digest is verified before any of the header is parsed.
+    """
+    prefix = len(PAYLOAD_MAGIC) + _DIGEST_SIZE
+    if len(data) < prefix + 4 or not data.startswith(PAYLOAD_MAGIC):
+        return None
+    content = data[prefix:]
+    if hashlib.sha256(content).digest() != data[len(PAYLOAD_MAGIC) : prefix]:
+        return None
+    header_length = int.from_bytes(content[:4], "little")
+    try:
+        header = json.loads(content[4 : 4 + header_length].decode("utf-8"))
+        if header.get("byteorder") != sys.byteorder or header.get("itemsizes") != _itemsizes():
+            return None
+        body = content[4 + header_length :]
+        return {key: _decode_field(spec, body) for key, spec in header["fields"].items()}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _itemsizes() -> dict[str, int]:
+    return {typecode: array(typecode).itemsize for typecode in sorted(_ARRAY_TYPECODES)}
+
+
+def read_payload(path: Path) -> dict[str, Any] | None:
+    """Load a payload written by :func:`write_payload`; ``None`` if unusable."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    return decode_payload(data)
+
+
+def write_payload(path: Path, payload: Mapping[str, Any]) -> None:
+    """Atomically write ``payload`` to ``path``; failures only lose the cache."""
+    data = encode_payload(payload)
+    try:
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, path)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+def _read_artifact(path: Path, graph_hash: str) -> CompiledGraph | None:
+    payload = read_payload(path)
+    if payload is None:
+        return None
+    if payload.get("version") != ARTIFACT_VERSION or payload.get("graph_hash") != graph_hash:
+        return None
+    try:
+        return CompiledGraph.from_payload(payload)
+    except (KeyError, TypeError):
+        return None
+
+
+def _write_artifact(path: Path, compiled: CompiledGraph) -> None:
+    payload = compiled.to_payload()
+    payload["version"] = ARTIFACT_VERSION
+    write_payload(path, payload)
+
+
+def load_compiled_graph(graph_path: Path, *, use_cache: bool = True) -> CompiledGraph:
+    """Return the compiled form of ``graph_path``, rebuilding it only when the graph changed."""
+    data = graph_path.read_bytes()
+    digest = graph_digest(data)
+    artifact = artifact_path_for(graph_path)
+    if use_cache:
+        cached = _read_artifact(artifact, digest)
+        if cached is not None:
+            return cached
+    compiled = compile_graph(json.loads(data), digest)
+    if use_cache:
+        _write_artifact(artifact, compiled)
+    return compiled
@@ -1,17 +1,44 @@
 from __future__ import annotations
 
 import argparse
+import cProfile
+import io
 import json
 import math
-import re
+import pstats
 import sys
+import time
+import tracemalloc
 from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Mapping
-
-from ppr import personalize_scores
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
+
+try:  # Peak RSS is only available on POSIX.
+    import resource
+except ModuleNotFoundError:  # pragma: no cover - depends on the platform
+    resource = None  # type: ignore[assignment]
+
+from compiled_graph import (
+    CompiledGraph,
+    load_compiled_graph,
+    read_payload,
+    tokenize,
+    write_payload,
+)
+from ppr import (
+    METHODS,
+    TransitionMatrix,
+    edge_delta,
+    forward_push,
+    normalise_seed,
+    personalize_vector,
+    update_global_ranks,
+    update_vector,
+)
+from selection import ENGINES, rank_candidates
 
 
 @dataclass(frozen=True)
@@ -25,6 +52,7 @@ class Config:
     limit_candidates: int
     iters: int
     tol: float
+    push_eps: float = 1e-7
 
 
 def _parse_scalar(value: str) -> float | int:
@@ -38,7 +66,7 @@ def _parse_scalar(value: str) -> float | int:
         return float(value) if value else 0.0
 
 
-def _load_config(path: Path) -> Config:
+def load_config(path: Path) -> Config:
     text = path.read_text(encoding="utf-8")
     payload: dict[str, dict[str, float]] = {}
     stack: list[tuple[int, dict[str, object]]] = []
@@ -80,15 +108,12 @@ def _load_config(path: Path) -> Config:
         limit_candidates=int(limits.get("ncand", 2000)),
         iters=int(limits.get("iters", 50)),
         tol=float(limits.get("tol", 1e-6)),
+        push_eps=float(limits.get("push_eps", 1e-7)),
     )
 
 
-def _tokenize(text: str) -> set[str]:
-    return {part for part in re.findall(r"[a-z0-9]+", text.lower()) if part}
-
-
 def _intent_profile(intent: str) -> dict[str, object]:
-    tokens = _tokenize(intent)
+    tokens = tokenize(intent)
     role = None
     for candidate in ("impl", "ops", "spec", "risk"):
         if candidate in tokens:
@@ -97,8 +122,13 @@ def _intent_profile(intent: str) -> dict[str, object]:
     return {"raw": intent, "keywords": tokens, "role": role}
 
 
-def _intent_match(tokens: set[str], node: Mapping[str, object]) -> float:
-    node_tokens = _tokenize(str(node.get("heading", "")) + " " + str(node.get("path", "")))
+def _intent_match(
+    tokens: set[str],
+    node: Mapping[str, object],
+    node_tokens: frozenset[str] | set[str] | None = None,
+) -> float:
+    if node_tokens is None:
+        node_tokens = tokenize(str(node.get("heading", "")) + " " + str(node.get("path", "")))
     if not tokens and not node_tokens:
         return 0.0
     if not tokens:
@@ -110,6 +140,24 @@ def _intent_match(tokens: set[str], node: Mapping[str, object]) -> float:
     return intersection / union
 
 
+def _intent_scores(graph: CompiledGraph, tokens: set[str]) -> dict[int, float]:
+    """Jaccard intent overlap for the nodes sharing a token with ``tokens``.
+
+    Walks the inverted index instead of every node; nodes missing from the
+    result score 0.0, exactly as :func:`_intent_match` would give them.
+    """
+    overlaps: dict[int, int] = {}
+    for token in tokens:
+        for idx in graph.postings(token):
+            overlaps[idx] = overlaps.get(idx, 0) + 1
+    intent_size = len(tokens)
+    sizes = graph.token_sizes
+    return {
+        idx: intersection / (intent_size + sizes[idx] - intersection)
+        for idx, intersection in overlaps.items()
+    }
+
+
 def _diff_score(path: str, node_role: str | None, intent_role: str | None, diff_paths: set[str]) -> float:
     if not path:
         return 0.0
@@ -135,15 +183,13 @@ def _recency_score(timestamp: str, halflife: int) -> float:
     return math.exp(-max(age, 0.0) / max(halflife, 1))
 
 
-def _hub_scores(nodes: list[Mapping[str, object]], edges: Iterable[Mapping[str, object]]) -> dict[str, float]:
-    outdeg: dict[str, int] = {str(node["id"]): 0 for node in nodes}
-    for edge in edges:
-        src = str(edge.get("src", ""))
-        if src in outdeg:
-            outdeg[src] += 1
-    max_deg = max(outdeg.values(), default=0)
+def _hub_scores(graph: CompiledGraph) -> dict[str, float]:
+    max_deg = max(graph.hub_degree, default=0)
     denom = math.log1p(max_deg) if max_deg else 1.0
-    return {node_id: (math.log1p(deg) / denom if denom else 0.0) for node_id, deg in outdeg.items()}
+    return {
+        node_id: (math.log1p(deg) / denom if denom else 0.0)
+        for node_id, deg in zip(graph.ids, graph.hub_degree)
+    }
 
 
 def _base_signals(
@@ -152,10 +198,13 @@ def _base_signals(
     diff_paths: set[str],
     hub_scores: Mapping[str, float],
     cfg: Config,
+    node_tokens: frozenset[str] | None = None,
+    intent_hit: float | None = None,
 ) -> dict[str, float]:
     node_role = str(node.get("role") or "") or None
     intent_role = profile.get("role") if isinstance(profile.get("role"), str) else None
-    intent_hit = _intent_match(profile.get("keywords", set()), node)
+    if intent_hit is None:
+        intent_hit = _intent_match(profile.get("keywords", set()), node, node_tokens)
     diff_hit = _diff_score(str(node.get("path", "")), node_role, intent_role, diff_paths)
     recency = _recency_score(str(node.get("mtime", "")), cfg.halflife)
     hub = hub_scores.get(str(node.get("id", "")), 0.0)
@@ -178,26 +227,14 @@ def _combine_score(signals: Mapping[str, float], weights: Mapping[str, float]) -
     return sum(float(signals.get(key, 0.0)) * float(weights.get(key, 0.0)) for key in weights)
 
 
-def _candidate_neighbourhood(
-    nodes: list[Mapping[str, object]],
-    edges: Iterable[Mapping[str, object]],
-    seeds: set[str],
-    hops: int = 2,
-) -> set[str]:
-    adjacency: dict[str, set[str]] = {str(node["id"]): set() for node in nodes}
-    for edge in edges:
-        src = str(edge.get("src", ""))
-        dst = str(edge.get("dst", ""))
-        if src in adjacency and dst in adjacency:
-            adjacency[src].add(dst)
-            adjacency[dst].add(src)
+def _candidate_neighbourhood(graph: CompiledGraph, seeds: set[int], hops: int = 2) -> set[int]:
     visited = set(seeds)
     queue = deque((seed, 0) for seed in seeds)
     while queue:
         current, depth = queue.popleft()
         if depth >= hops:
             continue
-        for neighbour in adjacency.get(current, set()):
+        for neighbour in graph.neighbours(current):
             if neighbour in visited:
                 continue
             visited.add(neighbour)
@@ -205,111 +242,160 @@ def _candidate_neighbourhood(
     return visited
 
 
-def _parse_budget(raw: str) -> int:
+def parse_budget(raw: str) -> int:
     cleaned = raw.strip().lower()
     if cleaned.endswith("k"):
         return int(float(cleaned[:-1]) * 1000)
     return int(cleaned)
 
 
-def _load_graph(path: Path) -> dict[str, object]:
-    return json.loads(path.read_text(encoding="utf-8"))
+class StageTimer:
+    """Wall-clock milliseconds per pack stage, accumulated by name."""
 
+    def __init__(self) -> None:
+        self.stages_ms: dict[str, float] = {}
 
-def _token_count(node: Mapping[str, object]) -> int:
-    for key in ("tok", "tokens", "token_count"):
-        value = node.get(key)
-        if isinstance(value, (int, float)):
-            return int(value)
-    return 0
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stages_ms[name] = self.stages_ms.get(name, 0.0) + elapsed
 
+    def rounded(self) -> dict[str, float]:
+        stages = {name: round(value, 3) for name, value in self.stages_ms.items()}
+        stages["total"] = round(sum(self.stages_ms.values()), 3)
+        return stages
 
-def generate_pack(args: argparse.Namespace) -> dict[str, object]:
-    graph_path = Path(args.graph)
-    output_path = Path(args.output)
-    config_path = Path(args.config)
-    if isinstance(args.budget, str):
-        args.budget = _parse_budget(args.budget)
-    cfg = _load_config(config_path)
-    graph = _load_graph(graph_path)
-    nodes = list(graph.get("nodes", []))
-    edges = list(graph.get("edges", []))
-    profile = _intent_profile(args.intent)
-    diff_paths = {str(item) for item in getattr(args, "diff", [])}
-    hub_scores = _hub_scores(nodes, edges)
-
-    signals: dict[str, dict[str, float]] = {}
-    base_scores: dict[str, float] = {}
-    for node in nodes:
-        node_id = str(node.get("id", ""))
-        node_signals = _base_signals(node, profile, diff_paths, hub_scores, cfg)
-        signals[node_id] = node_signals
-        base_scores[node_id] = _combine_score(node_signals, cfg.weights)
-
-    if args.ppr:
-        ppr_scores = personalize_scores(nodes, edges, base_scores, cfg.lam, cfg.iters, cfg.tol)
-    else:
-        ppr_scores = {node_id: base_scores[node_id] for node_id in base_scores}
-
-    scores: dict[str, float] = {}
-    for node_id, base_value in base_scores.items():
-        ppr_value = ppr_scores.get(node_id, 0.0)
-        scores[node_id] = cfg.theta * ppr_value + (1 - cfg.theta) * base_value
-
-    seeds = {node_id for node_id, sig in signals.items() if sig["intent"] > 0 or sig["diff"] > 0}
-    candidate_ids = (
-        _candidate_neighbourhood(nodes, edges, seeds)
-        if seeds
-        else {str(node.get("id", "")) for node in nodes}
-    )
-    scored_candidates = sorted(candidate_ids, key=lambda node_id: scores.get(node_id, 0.0), reverse=True)
-    scored_candidates = scored_candidates[: cfg.limit_candidates]
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size over the whole process lifetime, or ``None`` where unsupported.
+
+    In a long-running server this is the high-water mark of every request so
+    far, not the cost of the current pack.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / scale, 3)
+
+
+def build_pack(
+    graph: CompiledGraph,
+    cfg: Config,
+    intent: str,
+    budget: int,
+    *,
+    diff: Iterable[str] = (),
+    ppr: bool = False,
+    ppr_method: str = "power",
+    ppr_initial: Sequence[float] | None = None,
+    transition: TransitionMatrix | None = None,
+    global_ranks: Sequence[float] | None = None,
+    selection: str = "greedy",
+    ppr_solver: Callable[[list[float], dict[str, object]], list[float]] | None = None,
+    timer: StageTimer | None = None,
+) -> tuple[dict[str, object], list[float]]:
+    """Score and select sections of an already loaded graph.
+
+    Returns the pack payload and the PPR rank vector aligned with
+    ``graph.ids`` (empty when ``ppr`` is off) so callers can warm-start later
+    queries from it. ``ppr_method="push"`` approximates PPR by forward push
+    with ``cfg.push_eps``; ``ppr_initial`` only applies to the power method.
+    ``selection`` names an engine from :data:`selection.ENGINES`, and
+    ``ppr_solver`` (seed, stats -> ranks) replaces both PPR methods when
+    given. Stage timings go to ``timer`` and land in ``metrics["cost"]``.
+    """
+    if ppr_method not in METHODS:
+        raise ValueError(f"unknown PPR method: {ppr_method}")
+    if selection not in ENGINES:
+        raise ValueError(f"unknown selection engine: {selection}")
+    timer = timer or StageTimer()
+    nodes = graph.nodes
+    with timer.stage("signals"):
+        profile = _intent_profile(intent)
+        diff_paths = {str(item) for item in diff}
+        hub_scores = _hub_scores(graph)
+        intent_scores = _intent_scores(graph, profile["keywords"])
+
+        signals: dict[str, dict[str, float]] = {}
+        base_scores: dict[str, float] = {}
+        for idx, (node_id, node) in enumerate(zip(graph.ids, nodes)):
+            node_signals = _base_signals(
+                node, profile, diff_paths, hub_scores, cfg, intent_hit=intent_scores.get(idx, 0.0)
+            )
+            signals[node_id] = node_signals
+            base_scores[node_id] = _combine_score(node_signals, cfg.weights)
+
+    ranks: list[float] = []
+    ppr_stats: dict[str, object] = {}
+    with timer.stage("ppr"):
+        if ppr:
+            seed = normalise_seed([base_scores[node_id] for node_id in graph.ids]) if graph.ids else []
+            if ppr_solver is not None:
+                ranks = ppr_solver(seed, ppr_stats)
+            elif ppr_method == "push":
+                pushed = forward_push(
+                    graph.indptr, graph.indices, seed, cfg.lam, cfg.push_eps, global_ranks=global_ranks
+                )
+                ranks = pushed.ranks
+                ppr_stats.update(method="push", pushes=pushed.pushes, residual=pushed.residual)
+            else:
+                ppr_stats["method"] = "power"
+                ranks = personalize_vector(
+                    graph.indptr,
+                    graph.indices,
+                    seed,
+                    cfg.lam,
+                    cfg.iters,
+                    cfg.tol,
+                    transition=transition,
+                    initial=ppr_initial,
+                    stats=ppr_stats,
+                )
+                ppr_stats["warm_start"] = ppr_initial is not None
+            ppr_scores = dict(zip(graph.ids, ranks))
+        else:
+            ppr_scores = {node_id: base_scores[node_id] for node_id in base_scores}
+
+        scores = [
+            cfg.theta * ppr_scores.get(node_id, 0.0) + (1 - cfg.theta) * base_scores[node_id]
+            for node_id in graph.ids
+        ]
+
+    with timer.stage("neighbourhood"):
+        seeds = {
+            graph.index[node_id]
+            for node_id, sig in signals.items()
+            if sig["intent"] > 0 or sig["diff"] > 0
+        }
+        candidates = _candidate_neighbourhood(graph, seeds) if seeds else range(graph.size)
+
+    with timer.stage("selection"):
+        ranked = rank_candidates(candidates, scores, cfg.limit_candidates)
+        result = ENGINES[selection](
+            graph, ranked, scores, budget, mu_file=cfg.mu_file, mu_role=cfg.mu_role
+        )
 
     selections: list[dict[str, object]] = []
-    token_in = 0
-    diversity_penalty = 0.0
-    file_counts: dict[str, int] = {}
-    role_counts: dict[str, int] = {}
-    total_tokens = sum(_token_count(node) for node in nodes)
-    for node_id in scored_candidates:
-        node = next((item for item in nodes if str(item.get("id")) == node_id), None)
-        if not node:
-            continue
-        tokens = _token_count(node)
-        prospective = token_in + tokens
-        if prospective > args.budget:
-            continue
-        path = str(node.get("path", ""))
-        role = str(node.get("role", "")) if node.get("role") else ""
-        selected_count = len(selections)
-        file_ratio = file_counts.get(path, 0) / (selected_count + 1 or 1)
-        role_ratio = role_counts.get(role, 0) / (selected_count + 1 or 1)
-        penalty_factor = 1 - (cfg.mu_file * file_ratio + cfg.mu_role * role_ratio)
-        adjusted_score = scores.get(node_id, 0.0) * max(penalty_factor, 0.0)
-        diversity_penalty += max(scores.get(node_id, 0.0) - adjusted_score, 0.0)
-        if adjusted_score <= 0.0:
-            continue
-        token_in = prospective
-        file_counts[path] = file_counts.get(path, 0) + 1
-        role_counts[role] = role_counts.get(role, 0) + 1
+    for idx in result.selected:
+        node_id = graph.ids[idx]
         why = dict(signals[node_id])
         why["ppr"] = ppr_scores.get(node_id, 0.0)
         selections.append(
             {
                 "id": node_id,
-                "tok": tokens,
+                "tok": graph.tokens[idx],
                 "filters": ["lossless", "pointer", "role_extract"],
                 "why": why,
             }
         )
-        if token_in >= args.budget:
-            break
-
-    dup_rate = 0.0
-    if selections:
-        paths = [next((node for node in nodes if str(node.get("id")) == section["id"]), {}).get("path") for section in selections]
-        unique_paths = {path for path in paths if path}
-        dup_rate = 1 - (len(unique_paths) / len(paths)) if paths else 0.0
+    token_in = result.token_in
+    total_tokens = sum(graph.tokens)
 
     entropy = 0.0
     if ppr_scores:
@@ -320,17 +406,233 @@ def generate_pack(args: argparse.Namespace) -> dict[str, object]:
                 entropy -= prob * math.log(prob)
 
     pack = {
-        "intent": args.intent,
-        "budget": str(args.budget),
+        "intent": intent,
+        "budget": str(budget),
         "sections": selections,
         "metrics": {
             "token_in": token_in,
             "token_src": total_tokens,
-            "dup_rate": dup_rate,
+            "dup_rate": result.dup_rate,
             "ppr_entropy": entropy,
-            "diversity_penalty": diversity_penalty,
+            "diversity_penalty": result.diversity_penalty,
+            "objective": result.objective,
+            "cost": {
+                "stages_ms": timer.rounded(),
+                "ppr": ppr_stats,
+                "candidates": len(candidates),
+                "process_peak_rss_mb": peak_rss_mb(),
+            },
         },
     }
+    return pack, ranks
+
+
+def uniform_ranks(graph: CompiledGraph, cfg: Config, transition: TransitionMatrix | None = None) -> list[float]:
+    """PPR of the uniform seed; forward push spreads dangling mass along it."""
+    size = graph.size
+    if not size:
+        return []
+    return personalize_vector(
+        graph.indptr, graph.indices, [1.0 / size] * size, cfg.lam, cfg.iters, cfg.tol, transition=transition
+    )
+
+
+class PPRState:
+    """PPR vector persisted between packs (``--ppr-state``).
+
+    On the same graph revision the stored vector warm-starts the power
+    iteration. When only edges changed (same node ids) the stored vector is
+    repaired with :func:`ppr.update_vector` from the edge and seed deltas,
+    so per-commit refreshes cost about as much as the change. After
+    ``max_updates`` chained repairs, or on any node change, it recomputes.
+    """
+
+    max_updates = 32
+
+    def __init__(self, path: Path, graph: CompiledGraph, cfg: Config) -> None:
+        self.path = path
+        self.graph = graph
+        self.cfg = cfg
+        payload = read_payload(path)
+        self.previous: dict[str, Any] = payload or {}
+        self.mode = "cold"
+        self.global_ranks: list[float] | None = None
+        self.updates = 0
+        self.seed: list[float] = []
+
+    def _stored(self, key: str) -> list[float] | None:
+        value = self.previous.get(key)
+        return value if isinstance(value, list) and len(value) == self.graph.size else None
+
+    def global_vector(self) -> list[float]:
+        """Uniform-seed PPR for forward push, reused from the file on the same graph revision."""
+        if self.global_ranks is None:
+            stored = self._stored("global_ranks")
+            if stored is not None and self.previous.get("graph_hash") == self.graph.graph_hash:
+                self.global_ranks = stored
+            else:
+                self.global_ranks = uniform_ranks(self.graph, self.cfg)
+        return self.global_ranks
+
+    def solve(self, seed: list[float], stats: dict[str, object]) -> list[float]:
+        graph, cfg = self.graph, self.cfg
+        self.seed = seed
+        ranks = self._stored("ranks")
+        if ranks is not None and self.previous.get("graph_hash") == graph.graph_hash:
+            self.mode = "warm"
+            self.global_ranks = self._stored("global_ranks")
+            self.updates = int(self.previous.get("updates", 0))
+            stats.update(method="power", mode=self.mode)
+            return personalize_vector(
+                graph.indptr,
+                graph.indices,
+                seed,
+                cfg.lam,
+                cfg.iters,
+                cfg.tol,
+                initial=ranks,
+                stats=stats,
+            )
+        old_global = self._stored("global_ranks")
+        old_seed = self._stored("seed")
+        updates = int(self.previous.get("updates", 0))
+        if (
+            ranks is not None
+            and old_seed is not None
+            and self.previous.get("ids") == graph.ids
+            and updates < self.max_updates
+        ):
+            added, removed = edge_delta(
+                self.previous["indptr"], self.previous["indices"], graph.indptr, graph.indices
+            )
+            seed_delta = {
+                idx: new - old for idx, (new, old) in enumerate(zip(seed, old_seed)) if new != old
+            }
+            self.mode = "incremental"
+            self.updates = updates + 1
+            if old_global is not None:
+                self.global_ranks = update_global_ranks(
+                    graph.indptr, graph.indices, old_global, added, removed, cfg.lam, cfg.push_eps
+                ).ranks
+            else:
+                # Only the first repair after a cold pack pays for the uniform vector.
+                self.global_ranks = uniform_ranks(graph, cfg)
+            repaired = update_vector(
+                graph.indptr,
+                graph.indices,
+                ranks,
+                added,
+                removed,
+                cfg.lam,
+                cfg.push_eps,
+                seed_delta=seed_delta,
+                global_ranks=self.global_ranks,
+            )
+            stats.update(
+                method="push",
+                mode=self.mode,
+                edges_changed=len(added) + len(removed),
+                pushes=repaired.pushes,
+                residual=repaired.residual,
+            )
+            return repaired.ranks
+        self.mode = "cold"
+        stats.update(method="power", mode=self.mode)
+        return personalize_vector(
+            graph.indptr,
+            graph.indices,
+            seed,
+            cfg.lam,
+            cfg.iters,
+            cfg.tol,
+            stats=stats,
+        )
+
+    def save(self, ranks: list[float]) -> None:
+        graph = self.graph
+        if not ranks:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_payload(
+            self.path,
+            {
+                "graph_hash": graph.graph_hash,
+                "ids": graph.ids,
+                "indptr": graph.indptr,
+                "indices": graph.indices,
+                "seed": self.seed,
+                "ranks": ranks,
+                "global_ranks": self.global_ranks,
+                "updates": self.updates,
+            },
+        )
+
+
+def _run_pack(args: argparse.Namespace) -> dict[str, object]:
+    timer = StageTimer()
+    with timer.stage("graph_load"):
+        cfg = load_config(Path(args.config))
+        graph = load_compiled_graph(Path(args.graph), use_cache=getattr(args, "graph_cache", True))
+    ppr_method = getattr(args, "ppr_method", "power")
+    ppr_state = getattr(args, "ppr_state", None)
+    state = PPRState(Path(ppr_state), graph, cfg) if ppr_state and args.ppr else None
+    global_ranks: list[float] | None = None
+    if args.ppr and ppr_method == "push":
+        # Computed once per pack (or reused from --ppr-state) instead of inside forward push.
+        with timer.stage("ppr_global"):
+            global_ranks = state.global_vector() if state is not None else uniform_ranks(graph, cfg)
+    pack, ranks = build_pack(
+        graph,
+        cfg,
+        args.intent,
+        args.budget,
+        diff=getattr(args, "diff", []),
+        ppr=args.ppr,
+        ppr_method=ppr_method,
+        global_ranks=global_ranks,
+        selection=getattr(args, "selection", "greedy"),
+        ppr_solver=state.solve if state is not None and ppr_method == "power" else None,
+        timer=timer,
+    )
+    if state is not None:
+        with timer.stage("ppr_state"):
+            state.save(ranks)
+    pack["metrics"]["cost"]["stages_ms"] = timer.rounded()  # type: ignore[index]
+    return pack
+
+
+def _write_profile(profiler: cProfile.Profile, path: Path, limit: int = 40) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix in {".prof", ".pstats"}:
+        profiler.dump_stats(str(path))
+        return
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(limit)
+    path.write_text(buffer.getvalue(), encoding="utf-8")
+
+
+def generate_pack(args: argparse.Namespace) -> dict[str, object]:
+    output_path = Path(args.output)
+    if isinstance(args.budget, str):
+        args.budget = parse_budget(args.budget)
+    profile_path = getattr(args, "profile", None)
+    if profile_path:
+        # Python-heap peak and cProfile both slow the run; only when asked.
+        profiler = cProfile.Profile()
+        tracemalloc.start()
+        try:
+            profiler.enable()
+            try:
+                pack = _run_pack(args)
+            finally:
+                profiler.disable()
+            _, python_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        pack["metrics"]["cost"]["python_peak_mb"] = round(python_peak / (1024 * 1024), 3)  # type: ignore[index]
+        _write_profile(profiler, Path(profile_path))
+    else:
+        pack = _run_pack(args)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(pack, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     return pack
@@ -345,14 +647,44 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--intent", required=True)
     parser.add_argument("--budget", required=True)
     parser.add_argument("--ppr", action="store_true")
+    parser.add_argument(
+        "--ppr-method",
+        choices=METHODS,
+        default="power",
+        help="Power iteration, or forward push with limits.push_eps as residual threshold",
+    )
+    parser.add_argument(
+        "--ppr-state",
+        help=(
+            "File holding the last PPR vector: warm-starts the power iteration on the same graph "
+            "and is repaired incrementally when only edges changed; forward push reuses its "
+            "uniform-seed vector"
+        ),
+    )
     parser.add_argument("--diff", nargs="*", default=[])
+    parser.add_argument(
+        "--selection",
+        choices=sorted(ENGINES),
+        default="greedy",
+        help="Section selection engine; lazy runs budgeted lazy greedy on the pack objective",
+    )
+    parser.add_argument(
+        "--no-graph-cache",
+        dest="graph_cache",
+        action="store_false",
+        help="Do not read or write the compiled graph artifact next to --graph",
+    )
+    parser.add_argument(
+        "--profile",
+        help="Write cProfile stats here (binary for .prof/.pstats, text otherwise) and record Python peak memory",
+    )
     return parser
 
 
 def main(argv: Iterable[str] | None = None) -> int:
     parser = _build_parser()
     parsed = parser.parse_args(argv)
-    parsed.budget = _parse_budget(str(parsed.budget))
+    parsed.budget = parse_budget(str(parsed.budget))
     generate_pack(parsed)
     return 0
 
@@ -0,0 +1,377 @@
+"""Long-running context pack service.
+
+The graph and config are loaded once; each request only scores and selects.
+Requests are JSON objects ``{"intent": ..., "budget": ..., "diff": [...],
+"ppr": bool, "ppr_method": "power" | "push", "selection": "greedy" | "lazy"}``
+served over local HTTP (``POST /pack``) or read from a JSONL file in batch
+mode. PPR vectors are kept in a small LRU keyed by intent keywords and diff
+paths, and each PPR query warm-starts its power iteration from the vector of
+the same or the most similar previous intent.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Final, Iterable, Mapping, Sequence
+
+from compiled_graph import load_compiled_graph, tokenize
+from pack import Config, build_pack, load_config, parse_budget, uniform_ranks
+from ppr import METHODS, TransitionMatrix, numpy_available
+from selection import ENGINES
+
+DEFAULT_HOST: Final[str] = "127.0.0.1"
+DEFAULT_PORT: Final[int] = 8765
+DEFAULT_CACHE_SIZE: Final[int] = 64
+DEFAULT_WARM_START_SIMILARITY: Final[float] = 0.5
+DEFAULT_JOBS: Final[int] = 4
+
+_CacheKey = tuple[frozenset[str], frozenset[str]]
+
+
+class PackRequestError(ValueError):
+    """A pack request was malformed."""
+
+
+_TRUE_STRINGS: Final[frozenset[str]] = frozenset({"1", "true", "yes", "on"})
+_FALSE_STRINGS: Final[frozenset[str]] = frozenset({"0", "false", "no", "off", ""})
+
+
+def _parse_flag(name: str, value: object) -> bool:
+    """Read a JSON boolean, also accepting 0/1 and the usual true/false strings."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    raise PackRequestError(f"{name} must be a boolean")
+
+
+def _keyword_similarity(left: frozenset[str], right: frozenset[str]) -> float:
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class PPRVectorCache:
+    """Thread-safe LRU of PPR rank vectors for one graph revision."""
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE, similarity: float = DEFAULT_WARM_START_SIMILARITY) -> None:
+        self.capacity = max(capacity, 0)
+        self.similarity = similarity
+        self._entries: OrderedDict[_CacheKey, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.warm_starts = 0
+        self.misses = 0
+
+    def lookup(self, key: _CacheKey) -> tuple[list[float] | None, bool]:
+        """Return ``(vector, exact)``; ``vector`` is ``None`` when nothing is similar enough."""
+        keywords, diff = key
+        with self._lock:
+            exact = self._entries.get(key)
+            if exact is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return exact, True
+            best: list[float] | None = None
+            best_similarity = self.similarity
+            for (cached_keywords, cached_diff), vector in self._entries.items():
+                if cached_diff != diff:
+                    continue
+                similarity = _keyword_similarity(keywords, cached_keywords)
+                if similarity >= best_similarity:
+                    best, best_similarity = vector, similarity
+            if best is None:
+                self.misses += 1
+            else:
+                self.warm_starts += 1
+            return best, False
+
+    def store(self, key: _CacheKey, vector: list[float]) -> None:
+        if not self.capacity or not vector:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "warm_starts": self.warm_starts,
+                "misses": self.misses,
+            }
+
+
+class PackService:
+    """Answer pack requests against a graph and config loaded once."""
+
+    def __init__(
+        self,
+        graph_path: Path,
+        config_path: Path,
+        *,
+        graph_cache: bool = True,
+        ppr: bool = False,
+        ppr_method: str = "power",
+        selection: str = "greedy",
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        warm_start_similarity: float = DEFAULT_WARM_START_SIMILARITY,
+    ) -> None:
+        self.graph = load_compiled_graph(graph_path, use_cache=graph_cache)
+        self.cfg: Config = load_config(config_path)
+        self.default_ppr = ppr
+        self.default_ppr_method = ppr_method
+        self.default_selection = selection
+        self._global_ranks: list[float] | None = None
+        self._global_lock = threading.Lock()
+        self.vectors = PPRVectorCache(cache_size, warm_start_similarity)
+        # Shared read-only across request threads.
+        self.transition = (
+            TransitionMatrix(self.graph.indptr, self.graph.indices)
+            if numpy_available() and self.graph.size
+            else None
+        )
+
+    def global_ranks(self) -> list[float]:
+        """PPR of the uniform seed, computed once for forward-push dangling mass."""
+        with self._global_lock:
+            if self._global_ranks is None:
+                self._global_ranks = uniform_ranks(self.graph, self.cfg, self.transition)
+            return self._global_ranks
+
+    def handle(self, request: Mapping[str, Any]) -> dict[str, object]:
+        if not isinstance(request, Mapping):
+            raise PackRequestError("request must be a JSON object")
+        intent = request.get("intent")
+        if not isinstance(intent, str) or not intent.strip():
+            raise PackRequestError("intent must be a non-empty string")
+        raw_budget = request.get("budget")
+        if raw_budget is None:
+            raise PackRequestError("budget is required")
+        try:
+            budget = parse_budget(str(raw_budget))
+        except ValueError as exc:
+            raise PackRequestError(f"invalid budget: {raw_budget!r}") from exc
+        diff = request.get("diff") or []
+        if isinstance(diff, str) or not isinstance(diff, list):
+            raise PackRequestError("diff must be a list of paths")
+        ppr = _parse_flag("ppr", request.get("ppr", self.default_ppr))
+        ppr_method = request.get("ppr_method", self.default_ppr_method)
+        if ppr_method not in METHODS:
+            raise PackRequestError(f"ppr_method must be one of {', '.join(METHODS)}")
+        selection = request.get("selection", self.default_selection)
+        if selection not in ENGINES:
+            raise PackRequestError(f"selection must be one of {', '.join(sorted(ENGINES))}")
+
+        if not ppr:
+            pack, _ranks = build_pack(self.graph, self.cfg, intent, budget, diff=diff, selection=selection)
+            return pack
+        if ppr_method == "push":
+            pack, _ranks = build_pack(
+                self.graph,
+                self.cfg,
+                intent,
+                budget,
+                diff=diff,
+                ppr=True,
+                ppr_method="push",
+                global_ranks=self.global_ranks() if self.graph.size else None,
+                selection=selection,
+            )
+            return pack
+        key: _CacheKey = (frozenset(tokenize(intent)), frozenset(str(item) for item in diff))
+        # An exact hit is already the fixed point for this seed, so the warm
+        # start converges on the first iteration; recency drift stays correct.
+        cached, _exact = self.vectors.lookup(key)
+        pack, ranks = build_pack(
+            self.graph,
+            self.cfg,
+            intent,
+            budget,
+            diff=diff,
+            ppr=True,
+            ppr_initial=cached,
+            transition=self.transition,
+            selection=selection,
+        )
+        self.vectors.store(key, ranks)
+        return pack
+
+    def handle_many(self, requests: Sequence[Mapping[str, Any]], *, jobs: int = DEFAULT_JOBS) -> list[dict[str, object]]:
+        """Answer ``requests`` concurrently; results keep the input order."""
+
+        def _answer(request: Mapping[str, Any]) -> dict[str, object]:
+            try:
+                response = self.handle(request)
+            except PackRequestError as exc:
+                response = {"error": str(exc)}
+            if isinstance(request, Mapping) and "id" in request:
+                response = {"id": request["id"], **response}
+            return response
+
+        if jobs <= 1 or len(requests) <= 1:
+            return [_answer(request) for request in requests]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            return list(pool.map(_answer, requests))
+
+
+def read_requests(lines: Iterable[str]) -> list[Mapping[str, Any]]:
+    requests: list[Mapping[str, Any]] = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            requests.append(json.loads(line))
+        except json.JSONDecodeError as exc:
+            raise PackRequestError(f"line {number}: {exc.msg}") from exc
+    return requests
+
+
+def run_batch(service: PackService, source: Path, output: Path | None, *, jobs: int = DEFAULT_JOBS) -> int:
+    with source.open(encoding="utf-8") as handle:
+        requests = read_requests(handle)
+    responses = service.handle_many(requests, jobs=jobs)
+    rendered = "".join(json.dumps(response, ensure_ascii=False) + "\n" for response in responses)
+    if output is None:
+        sys.stdout.write(rendered)
+    else:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(rendered, encoding="utf-8")
+    return sum(1 for response in responses if "error" in response)
+
+
+def build_server(
+    service: PackService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, *, jobs: int = DEFAULT_JOBS
+) -> ThreadingHTTPServer:
+    """Create a server exposing ``POST /pack``, ``POST /batch``, ``GET /stats`` and ``GET /healthz``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, payload: object) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self) -> Any:
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError as exc:
+                raise PackRequestError("Content-Length must be an integer") from exc
+            if length < 0:
+                raise PackRequestError("Content-Length must not be negative")
+            raw = self.rfile.read(length) if length else b""
+            try:
+                return json.loads(raw or b"null")
+            except json.JSONDecodeError as exc:
+                raise PackRequestError(f"invalid JSON body: {exc.msg}") from exc
+
+        def do_GET(self) -> None:
+            if self.path.startswith("/healthz"):
+                self._reply(200, {"status": "ok", "nodes": service.graph.size})
+            elif self.path.startswith("/stats"):
+                self._reply(200, {"graph_hash": service.graph.graph_hash, "ppr_cache": service.vectors.stats()})
+            else:
+                self._reply(404, {"status": "not_found"})
+
+        def do_POST(self) -> None:
+            try:
+                payload = self._read_json()
+                if self.path.startswith("/pack"):
+                    self._reply(200, service.handle(payload))
+                elif self.path.startswith("/batch"):
+                    if not isinstance(payload, list):
+                        raise PackRequestError("batch body must be a JSON array")
+                    self._reply(200, service.handle_many(payload, jobs=jobs))
+                else:
+                    self._reply(404, {"status": "not_found"})
+            except PackRequestError as exc:
+                self._reply(400, {"error": str(exc)})
+
+        def log_message(self, format: str, *args: object) -> None:
+            return None
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve context packs from a graph loaded once")
+    parser.add_argument("--graph", default="reports/context/graph.json")
+    default_config = Path(__file__).with_name("config.yaml")
+    parser.add_argument("--config", default=str(default_config))
+    parser.add_argument("--ppr", action="store_true", help="Use PPR unless a request sets \"ppr\"")
+    parser.add_argument("--ppr-method", choices=METHODS, default="power", help="Default PPR method")
+    parser.add_argument("--selection", choices=sorted(ENGINES), default="greedy", help="Default selection engine")
+    parser.add_argument(
+        "--no-graph-cache",
+        dest="graph_cache",
+        action="store_false",
+        help="Do not read or write the compiled graph artifact next to --graph",
+    )
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="PPR vectors kept for warm starts")
+    parser.add_argument(
+        "--warm-start-similarity",
+        type=float,
+        default=DEFAULT_WARM_START_SIMILARITY,
+        help="Minimum intent keyword Jaccard to warm-start from a cached vector",
+    )
+    parser.add_argument("--batch", type=Path, help="Answer the JSONL requests in this file and exit")
+    parser.add_argument("--output", type=Path, help="Batch output JSONL (default: stdout)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Concurrent batch requests")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Bind address")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Bind port (0 picks a free port)")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    service = PackService(
+        Path(args.graph),
+        Path(args.config),
+        graph_cache=args.graph_cache,
+        ppr=args.ppr,
+        ppr_method=args.ppr_method,
+        selection=args.selection,
+        cache_size=args.cache_size,
+        warm_start_similarity=args.warm_start_similarity,
+    )
+    if args.batch:
+        try:
+            failures = run_batch(service, args.batch, args.output, jobs=args.jobs)
+        except PackRequestError as exc:
+            print(f"{args.batch}: {exc}", file=sys.stderr)
+            return 1
+        return 1 if failures else 0
+    server = build_server(service, args.host, args.port, jobs=args.jobs)
+    address, port = server.server_address[:2]
+    host = address.decode() if isinstance(address, bytes) else str(address)
+    print(f"Serving context packs on http://{host}:{port}/pack", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,40 +1,88 @@
 from __future__ import annotations
 
-from typing import Iterable, Mapping
+from collections import Counter, deque
+from typing import Any, Iterable, Mapping, MutableMapping, NamedTuple, Sequence
 
+try:  # Optional vectorised backend; the pure-Python path needs neither.
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
 
-def personalize_scores(
+try:
+    from scipy import sparse  # type: ignore[import-untyped]
+except ModuleNotFoundError:  # pragma: no cover - depends on the environment
+    sparse = None
+
+BACKENDS = ("auto", "python", "numpy")
+METHODS = ("power", "push")
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _index_graph(
     nodes: Iterable[Mapping[str, object]],
     edges: Iterable[Mapping[str, object]],
-    base_scores: Mapping[str, float],
-    lam: float = 0.85,
-    iters: int = 50,
-    tol: float = 1e-6,
-) -> dict[str, float]:
-    indexed_nodes = list(nodes)
-    size = len(indexed_nodes)
-    if size == 0:
-        return {}
-    id_to_index = {str(node["id"]): idx for idx, node in enumerate(indexed_nodes)}
-    adjacency: list[list[int]] = [[] for _ in range(size)]
-    outdeg = [0] * size
+) -> tuple[list[str], list[int], list[int]]:
+    ids = [str(node["id"]) for node in nodes]
+    id_to_index = {node_id: idx for idx, node_id in enumerate(ids)}
+    src_index: list[int] = []
+    dst_index: list[int] = []
     for edge in edges:
         src = id_to_index.get(str(edge.get("src", "")))
         dst = id_to_index.get(str(edge.get("dst", "")))
         if src is None or dst is None:
             continue
-        adjacency[src].append(dst)
-        outdeg[src] += 1
+        src_index.append(src)
+        dst_index.append(dst)
+    return ids, src_index, dst_index
+
 
-    seed = [max(float(base_scores.get(str(node["id"]), 0.0)), 0.0) for node in indexed_nodes]
+def build_csr(
+    size: int, src_index: Sequence[int], dst_index: Sequence[int]
+) -> tuple[list[int], list[int]]:
+    """Return ``(indptr, indices)`` of the out-edges, keeping edge order per source."""
+    indptr = [0] * (size + 1)
+    for src in src_index:
+        indptr[src + 1] += 1
+    for idx in range(size):
+        indptr[idx + 1] += indptr[idx]
+    cursor = indptr[:-1]
+    indices = [0] * len(src_index)
+    for src, dst in zip(src_index, dst_index):
+        indices[cursor[src]] = dst
+        cursor[src] += 1
+    return indptr, indices
+
+
+def normalise_seed(values: Sequence[float]) -> list[float]:
+    """Clamp negative scores and normalise to a distribution (uniform if empty)."""
+    size = len(values)
+    seed = [max(float(value), 0.0) for value in values]
     total = sum(seed)
     if total <= 0.0:
-        seed = [1.0 / size] * size
-    else:
-        seed = [value / total for value in seed]
+        return [1.0 / size] * size
+    return [value / total for value in seed]
 
-    ranks = [1.0 / size] * size
-    for _ in range(max(iters, 1)):
+
+def _personalize_python(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    seed: Sequence[float],
+    lam: float,
+    iters: int,
+    tol: float,
+    initial: Sequence[float] | None = None,
+) -> tuple[list[float], int, float]:
+    size = len(indptr) - 1
+    outdeg = [indptr[idx + 1] - indptr[idx] for idx in range(size)]
+    adjacency = [indices[indptr[idx] : indptr[idx + 1]] for idx in range(size)]
+
+    ranks = [float(value) for value in initial] if initial is not None else [1.0 / size] * size
+    iteration = 0
+    delta = 0.0
+    for iteration in range(1, max(iters, 1) + 1):
         next_ranks = [(1 - lam) * seed[idx] for idx in range(size)]
         dangling_mass = sum(ranks[idx] for idx, deg in enumerate(outdeg) if deg == 0)
         if dangling_mass:
@@ -51,6 +99,395 @@ def personalize_scores(
         ranks = next_ranks
         if delta < tol:
             break
+    return ranks, iteration, delta
+
+
+class TransitionMatrix:
+    """Sparse column-stochastic transition built once per graph.
+
+    ``propagate(r)`` returns ``P^T r`` where ``P`` is the row-normalised
+    adjacency (parallel edges add weight). Nodes without out-edges are kept in
+    a boolean ``dangling`` mask so their mass can be spread uniformly.
+    Uses SciPy CSR when available and NumPy ``bincount`` otherwise.
+    """
+
+    def __init__(self, indptr: Sequence[int], indices: Sequence[int]) -> None:
+        if np is None:
+            raise RuntimeError("the numpy PPR backend requires numpy")
+        size = len(indptr) - 1
+        self.size = size
+        out_degree = np.diff(np.asarray(indptr, dtype=np.int64)).astype(np.float64)
+        src = np.repeat(np.arange(size, dtype=np.int64), out_degree.astype(np.int64))
+        dst = np.asarray(indices, dtype=np.int64)
+        self.dangling = out_degree == 0
+        weights = 1.0 / out_degree[src] if len(src) else np.zeros(0, dtype=np.float64)
+        self._src = src
+        self._dst = dst
+        self._weights = weights
+        self.matrix: Any = None
+        if sparse is not None:
+            self.matrix = sparse.csr_matrix((weights, (dst, src)), shape=(size, size))
+
+    def propagate(self, ranks: Any) -> Any:
+        if self.matrix is not None:
+            return self.matrix @ ranks
+        return np.bincount(self._dst, weights=ranks[self._src] * self._weights, minlength=self.size)
+
+
+def _personalize_numpy(
+    transition: TransitionMatrix,
+    seed: Sequence[float],
+    lam: float,
+    iters: int,
+    tol: float,
+    initial: Sequence[float] | None = None,
+) -> tuple[Any, int, float]:
+    size = transition.size
+    teleport = (1 - lam) * np.asarray(seed, dtype=np.float64)
+    dangling = transition.dangling
+    has_dangling = bool(dangling.any())
+    if initial is not None:
+        ranks = np.array(initial, dtype=np.float64)
+    else:
+        ranks = np.full(size, 1.0 / size)
+    iteration = 0
+    delta = 0.0
+    for iteration in range(1, max(iters, 1) + 1):
+        next_ranks = lam * transition.propagate(ranks)
+        next_ranks += teleport
+        if has_dangling:
+            next_ranks += lam * float(ranks[dangling].sum()) / size
+        delta = float(np.abs(next_ranks - ranks).sum())
+        ranks = next_ranks
+        if delta < tol:
+            break
+    return ranks, iteration, delta
+
+
+def _resolve_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown PPR backend: {backend}")
+    if backend == "auto":
+        return "numpy" if np is not None else "python"
+    if backend == "numpy" and np is None:
+        raise RuntimeError("the numpy PPR backend requires numpy")
+    return backend
+
+
+def personalize_scores(
+    nodes: Iterable[Mapping[str, object]],
+    edges: Iterable[Mapping[str, object]],
+    base_scores: Mapping[str, float],
+    lam: float = 0.85,
+    iters: int = 50,
+    tol: float = 1e-6,
+    *,
+    backend: str = "auto",
+) -> dict[str, float]:
+    """Personalised PageRank seeded by ``base_scores``.
+
+    ``backend="auto"`` uses the NumPy/SciPy implementation when NumPy is
+    installed and the pure-Python power iteration otherwise.
+    """
+    _resolve_backend(backend)
+    ids, src_index, dst_index = _index_graph(nodes, edges)
+    size = len(ids)
+    if size == 0:
+        return {}
+    indptr, indices = build_csr(size, src_index, dst_index)
+    seed = normalise_seed([base_scores.get(node_id, 0.0) for node_id in ids])
+    ranks = personalize_vector(indptr, indices, seed, lam, iters, tol, backend=backend)
+    return dict(zip(ids, ranks))
+
+
+def personalize_vector(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    seed: Sequence[float],
+    lam: float = 0.85,
+    iters: int = 50,
+    tol: float = 1e-6,
+    *,
+    backend: str = "auto",
+    transition: TransitionMatrix | None = None,
+    initial: Sequence[float] | None = None,
+    stats: MutableMapping[str, object] | None = None,
+) -> list[float]:
+    """Personalised PageRank over a CSR graph; returns a normalised rank list.
+
+    ``seed`` must already be a distribution (see :func:`normalise_seed`).
+    Pass a prebuilt ``transition`` to reuse it across queries on one graph,
+    and a previous rank vector as ``initial`` to warm-start the iteration.
+    A ``stats`` dict receives the iteration count and the last L1 delta.
+    """
+    size = len(indptr) - 1
+    if size <= 0:
+        return []
+    if initial is not None and len(initial) != size:
+        raise ValueError(f"initial PPR vector has {len(initial)} entries for {size} nodes")
+    chosen = _resolve_backend(backend)
+    if chosen == "numpy":
+        if transition is None:
+            transition = TransitionMatrix(indptr, indices)
+        vector, iterations, residual = _personalize_numpy(transition, seed, lam, iters, tol, initial)
+        ranks = vector.tolist()
+    else:
+        ranks, iterations, residual = _personalize_python(indptr, indices, seed, lam, iters, tol, initial)
+    if stats is not None:
+        stats["iterations"] = iterations
+        stats["residual"] = residual
+    normaliser = sum(ranks) or 1.0
+    return [value / normaliser for value in ranks]
+
 
+class PushResult(NamedTuple):
+    ranks: list[float]
+    residual: float
+    pushes: int
+    touched: int
+
+
+def forward_push(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    seed: Sequence[float] | Mapping[int, float],
+    lam: float = 0.85,
+    eps: float = 1e-7,
+    *,
+    global_ranks: Sequence[float] | None = None,
+) -> PushResult:
+    """Approximate personalised PageRank by Andersen-Chung-Lang forward push.
+
+    Residual mass starts on the seed and is pushed along out-edges until
+    every node holds less than ``eps`` per out-edge, so work is bounded by
+    the neighbourhood the seed mass actually reaches rather than the graph.
+    ``seed`` may be a dense list or a sparse ``{node: weight}`` mapping.
+
+    Dangling nodes spread their mass uniformly, like the power iteration;
+    that share is accumulated and expanded once through ``global_ranks``
+    (the PPR of the uniform seed), which callers can precompute per graph.
+    """
+    size = len(indptr) - 1
+    if size <= 0:
+        return PushResult([], 0.0, 0, 0)
+    if isinstance(seed, Mapping):
+        residual = {int(node): float(value) for node, value in seed.items() if value > 0}
+    else:
+        residual = {node: float(value) for node, value in enumerate(seed) if value > 0}
+    estimate: dict[int, float] = {}
+    pushes, uniform_mass = _push(indptr, indices, estimate, residual, lam, eps)
+
+    ranks = [0.0] * size
+    for node, value in estimate.items():
+        ranks[node] = value
+    if uniform_mass:
+        if global_ranks is None:
+            global_ranks = personalize_vector(indptr, indices, [1.0 / size] * size, lam)
+        for node, value in enumerate(global_ranks):
+            ranks[node] += uniform_mass * value
     normaliser = sum(ranks) or 1.0
-    return {str(indexed_nodes[idx]["id"]): ranks[idx] / normaliser for idx in range(size)}
+    return PushResult(
+        ranks=[value / normaliser for value in ranks],
+        residual=sum(abs(value) for value in residual.values()),
+        pushes=pushes,
+        touched=len(residual),
+    )
+
+
+def _push(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    estimate: dict[int, float],
+    residual: dict[int, float],
+    lam: float,
+    eps: float,
+) -> tuple[int, float]:
+    """Push (possibly signed) residual mass until ``|r[u]| <= eps * deg(u)``.
+
+    Keeps ``x = estimate + G(residual)`` invariant, where ``G`` maps a seed to
+    its PPR vector. Mass pushed out of dangling nodes is returned as a scalar
+    that the caller expands through the uniform-seed PPR vector.
+    """
+    uniform_mass = 0.0
+    pushes = 0
+    queue = deque(residual)
+    queued = set(residual)
+    while queue:
+        node = queue.popleft()
+        queued.discard(node)
+        mass = residual.get(node, 0.0)
+        start, end = indptr[node], indptr[node + 1]
+        degree = end - start
+        if abs(mass) <= eps * max(degree, 1):
+            continue
+        pushes += 1
+        residual[node] = 0.0
+        estimate[node] = estimate.get(node, 0.0) + (1 - lam) * mass
+        if degree == 0:
+            uniform_mass += lam * mass
+            continue
+        share = lam * mass / degree
+        for dst in indices[start:end]:
+            updated = residual.get(dst, 0.0) + share
+            residual[dst] = updated
+            if dst not in queued and abs(updated) > eps * max(indptr[dst + 1] - indptr[dst], 1):
+                queued.add(dst)
+                queue.append(dst)
+    return pushes, uniform_mass
+
+
+def edge_delta(
+    old_indptr: Sequence[int],
+    old_indices: Sequence[int],
+    indptr: Sequence[int],
+    indices: Sequence[int],
+) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """Return ``(added, removed)`` ``(src, dst)`` pairs between two CSR graphs on the same nodes."""
+    if len(old_indptr) != len(indptr):
+        raise ValueError("edge_delta needs both graphs to share the same node ids")
+    added: list[tuple[int, int]] = []
+    removed: list[tuple[int, int]] = []
+    for node in range(len(indptr) - 1):
+        before = old_indices[old_indptr[node] : old_indptr[node + 1]]
+        after = indices[indptr[node] : indptr[node + 1]]
+        if before == after:
+            continue
+        counts = Counter(after)
+        counts.subtract(before)
+        for dst, count in counts.items():
+            if count > 0:
+                added.extend([(node, dst)] * count)
+            elif count < 0:
+                removed.extend([(node, dst)] * -count)
+    return added, removed
+
+
+def _delta_residual(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    ranks: Sequence[float],
+    added: Iterable[tuple[int, int]],
+    removed: Iterable[tuple[int, int]],
+    lam: float,
+) -> tuple[dict[int, float], float]:
+    """Residual that the old fixed point leaves on the new graph.
+
+    For ``x = (1 - lam) s + lam A x`` the residual of ``x`` on the new
+    transition ``A'`` is ``lam / (1 - lam) * (A' - A) x``. Only the columns of
+    sources whose out-edges changed contribute; a dangling column is the
+    uniform vector, returned separately as a scalar mass.
+    """
+    changed: dict[int, tuple[Counter[int], Counter[int]]] = {}
+    for src, dst in added:
+        changed.setdefault(src, (Counter(), Counter()))[0][dst] += 1
+    for src, dst in removed:
+        changed.setdefault(src, (Counter(), Counter()))[1][dst] += 1
+    scale = lam / (1 - lam)
+    residual: dict[int, float] = {}
+    uniform = 0.0
+    for src, (gained, lost) in changed.items():
+        new_targets = Counter(indices[indptr[src] : indptr[src + 1]])
+        old_targets = new_targets - gained
+        if sum(gained.values()) > sum(new_targets.values()) - sum(old_targets.values()):
+            raise ValueError(f"edge delta adds out-edges of node {src} that the graph does not have")
+        old_targets.update(lost)
+        mass = scale * ranks[src]
+        for targets, sign in ((new_targets, 1.0), (old_targets, -1.0)):
+            degree = sum(targets.values())
+            if degree == 0:
+                uniform += sign * mass
+                continue
+            share = sign * mass / degree
+            for dst, count in targets.items():
+                residual[dst] = residual.get(dst, 0.0) + share * count
+    return residual, uniform
+
+
+def update_vector(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    ranks: Sequence[float],
+    added: Iterable[tuple[int, int]] = (),
+    removed: Iterable[tuple[int, int]] = (),
+    lam: float = 0.85,
+    eps: float = 1e-7,
+    *,
+    seed_delta: Mapping[int, float] | None = None,
+    global_ranks: Sequence[float] | None = None,
+) -> PushResult:
+    """Repair a PPR vector after an edge delta with localised push corrections.
+
+    ``indptr``/``indices`` describe the graph *after* the change, on the same
+    node ids; ``ranks`` is the previous (normalised) solution. ``seed_delta``
+    carries ``new_seed - old_seed`` for nodes whose seed moved. Work scales
+    with the mass the change displaces, not with the graph size.
+
+    ``global_ranks`` must be the uniform-seed PPR of the new graph (see
+    :func:`update_global_ranks`); it is only read when dangling mass moves.
+    """
+    size = len(indptr) - 1
+    if len(ranks) != size:
+        raise ValueError(f"previous PPR vector has {len(ranks)} entries for {size} nodes")
+    if size <= 0:
+        return PushResult([], 0.0, 0, 0)
+    residual, uniform_mass = _delta_residual(indptr, indices, ranks, added, removed, lam)
+    for node, value in (seed_delta or {}).items():
+        if value:
+            residual[node] = residual.get(node, 0.0) + value
+    estimate: dict[int, float] = {}
+    pushes, pushed_uniform = _push(indptr, indices, estimate, residual, lam, eps)
+    uniform_mass += pushed_uniform
+
+    updated = [float(value) for value in ranks]
+    for node, value in estimate.items():
+        updated[node] += value
+    if uniform_mass:
+        if global_ranks is None:
+            global_ranks = personalize_vector(indptr, indices, [1.0 / size] * size, lam)
+        for node, value in enumerate(global_ranks):
+            updated[node] += uniform_mass * value
+    return _finish_update(updated, residual, pushes)
+
+
+def update_global_ranks(
+    indptr: Sequence[int],
+    indices: Sequence[int],
+    global_ranks: Sequence[float],
+    added: Iterable[tuple[int, int]] = (),
+    removed: Iterable[tuple[int, int]] = (),
+    lam: float = 0.85,
+    eps: float = 1e-7,
+) -> PushResult:
+    """:func:`update_vector` for the uniform-seed PPR vector itself.
+
+    Its dangling mass expands through the vector being solved for, so
+    ``g = p + U * g`` closes as ``g = p / (1 - U)`` without a global pass.
+    """
+    size = len(indptr) - 1
+    if len(global_ranks) != size:
+        raise ValueError(f"previous PPR vector has {len(global_ranks)} entries for {size} nodes")
+    if size <= 0:
+        return PushResult([], 0.0, 0, 0)
+    residual, uniform_mass = _delta_residual(indptr, indices, global_ranks, added, removed, lam)
+    estimate: dict[int, float] = {}
+    pushes, pushed_uniform = _push(indptr, indices, estimate, residual, lam, eps)
+    uniform_mass += pushed_uniform
+
+    updated = [float(value) for value in global_ranks]
+    for node, value in estimate.items():
+        updated[node] += value
+    if uniform_mass < 1.0:
+        updated = [value / (1.0 - uniform_mass) for value in updated]
+    return _finish_update(updated, residual, pushes)
+
+
+def _finish_update(ranks: list[float], residual: Mapping[int, float], pushes: int) -> PushResult:
+    # Signed corrections can undershoot by up to the residual; keep a distribution.
+    clamped = [max(value, 0.0) for value in ranks]
+    normaliser = sum(clamped) or 1.0
+    return PushResult(
+        ranks=[value / normaliser for value in clamped],
+        residual=sum(abs(value) for value in residual.values()),
+        pushes=pushes,
+        touched=len(residual),
+    )